@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+
+from database import db, HealthRecord, RISKS
+
+PERCENTILES = (50, 75, 90, 95, 99)
+
+def risk_distribution(risk, bins=10, resolution=10):
+    """Histogram, percentiles and mean of one risk column over all records.
+
+    One GROUP BY over the column in 1/`resolution` point buckets (at most
+    100 * resolution + 1 rows come back), so the table is scanned in SQL and
+    Python only folds a few hundred rows. Percentiles are the lower edge of
+    the bucket they fall in, i.e. exact to 1/resolution of a point.
+    """
+    column = getattr(HealthRecord, risk)
+    bucket = db.cast(column * resolution, db.Integer)
+    rows = (
+        db.session.query(bucket, db.func.count(), db.func.sum(column))
+        .filter(column.isnot(None))
+        .group_by(bucket)
+        .order_by(bucket)
+        .all()
+    )
+
+    total = sum(count for _, count, _ in rows)
+    width = 100 / bins
+    histogram = [{"from": round(i * width, 1), "to": round((i + 1) * width, 1), "count": 0} for i in range(bins)]
+    for fine, count, _ in rows:
+        # 100% belongs in the last bin, not one past it
+        index = min(max(int(fine / resolution // width), 0), bins - 1)
+        histogram[index]["count"] += count
+
+    percentiles = {}
+    targets = iter(PERCENTILES)
+    target = next(targets)
+    seen = 0
+    for fine, count, _ in rows:
+        seen += count
+        while target is not None and seen >= total * target / 100:
+            percentiles[f"p{target}"] = fine / resolution
+            target = next(targets, None)
+
+    return {
+        "count": total,
+        "mean": round(sum(s for _, _, s in rows) / total, 2) if total else None,
+        "percentiles": percentiles,
+        "histogram": histogram
+    }
+
+def weekly_counts(since, threshold):
+    """Per-week (Monday-start, UTC) records, active users and users over `threshold` since `since`.
+
+    The created_at range is served by ix_health_record_created_at, so only
+    the window's rows are read.
+    """
+    week = db.func.date(HealthRecord.created_at, "weekday 0", "-6 days")
+    high = db.or_(*(getattr(HealthRecord, risk) > threshold for risk in RISKS))
+    columns = [
+        week.label("week"),
+        db.func.count().label("records"),
+        db.func.count(db.distinct(HealthRecord.username)).label("users"),
+        db.func.count(db.distinct(db.case((high, HealthRecord.username)))).label("high_risk_users")
+    ]
+    for risk in RISKS:
+        columns.append(
+            db.func.count(db.distinct(db.case((getattr(HealthRecord, risk) > threshold, HealthRecord.username))))
+            .label(f"{risk}_users")
+        )
+    rows = (
+        db.session.query(*columns)
+        .filter(HealthRecord.created_at >= since)
+        .group_by(week)
+        .order_by(week)
+        .all()
+    )
+    return [row._asdict() for row in rows]
+
+def population_summary(threshold, weeks=26, bins=10):
+    # Everything the analytics page shows, as plain JSON-able data
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    since = today - timedelta(days=today.weekday(), weeks=weeks - 1)
+    return {
+        "generated_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "threshold": threshold,
+        "since": since.date().isoformat(),
+        "risks": {risk: risk_distribution(risk, bins) for risk in RISKS},
+        "weekly": weekly_counts(since, threshold)
+    }
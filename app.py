@@ -1,24 +1,335 @@
-from flask import Flask, render_template, request, redirect, session, jsonify, send_file
+import time
+_import_start = time.perf_counter()
+
+from flask import Flask, render_template, request, redirect, session, jsonify, send_file, send_from_directory, g
 import flask
-from config import Config
-from database import db, User, HealthRecord
-# Import models_loader inside the function or try/except block if models might be missing initially,
-# but for now we assume they exist or will exist before running.
-# To avoid top-level import error during setup, we could delay it, but user code imported it at top.
-# We will ensure models exist before running app.
-from models_loader import diabetes_model, heart_model, kidney_model
-from openai import OpenAI
+from config import get_config
+from database import db, User, HealthRecord, RiskSummary, JobState, ensure_indexes, update_risk_summaries, rebuild_risk_summaries
+# Models, the OpenAI client and the DB schema are loaded lazily (see warm_up()),
+# so importing this module stays cheap for gunicorn workers and tests.
+import models_loader
+import metrics
+from inference import FEATURE_KEYS
+from cache import DiskCache, LRUCache, cache_key
+from jobs import JobQueue, JobStore
+from ingest import IngestProgress, ingest_csv
+from llm_gateway import LLMGateway
+from sms_queue import SmsDispatcher
+import symptom_extractor
+import analytics
+import build_assets
+import compression
+import localization
+from reports import REPORT_TEMPLATE_VERSION, render_report_pdf
+from storage import GroupCommitWriter, configure_sqlite
+from sqlalchemy.exc import OperationalError
+from collections import namedtuple
+from datetime import datetime, timedelta
+import base64
+import click
+import hashlib
+import json
+import math
+import mimetypes
+import numpy as np
 import os
+import tempfile
+import threading
 
 app = Flask(__name__)
-app.config.from_object(Config)
+app.config.from_object(get_config())
+# Hindi/Telugu advice as UTF-8 (3 bytes a character) rather than \uXXXX escapes (6)
+app.json.ensure_ascii = False
 db.init_app(app)
+configure_sqlite(app, db)
+
+# Built on first use by get_client()
+client = None
+
+LLM_MODEL = "gpt-4o-mini"
+
+# Identical (questionnaire, message, language) inputs reuse the last LLM answer
+llm_cache = LRUCache(
+    maxsize=app.config["LLM_CACHE_SIZE"],
+    ttl=app.config["LLM_CACHE_TTL"],
+    path=app.config["LLM_CACHE_PATH"]
+)
+
+# All real OpenAI calls: identical in-flight prompts share one request, and
+# concurrency, queueing and wait time are bounded so spikes fail fast
+llm_gateway = LLMGateway(
+    lambda: get_client(),
+    max_concurrent=app.config["LLM_MAX_CONCURRENT"],
+    max_waiting=app.config["LLM_MAX_WAITING"],
+    timeout=app.config["LLM_TIMEOUT"]
+)
+
+# Background workers for the LLM half of two-phase /predict; results go to the
+# job_state table, since the poll for a job may land on any gunicorn worker
+advice_jobs = JobQueue(
+    max_workers=app.config["ADVICE_WORKERS"],
+    ttl=app.config["ADVICE_JOB_TTL"],
+    store=JobStore(app, db, JobState, "advice")
+)
+
+# Background CSV ingests; each job carries an IngestProgress, saved to job_state
+# after every chunk so /ingest/<job_id> works from any worker
+ingest_jobs = JobQueue(
+    max_workers=app.config["INGEST_WORKERS"],
+    ttl=app.config["INGEST_JOB_TTL"],
+    store=JobStore(app, db, JobState, "ingest")
+)
+
+# Rendered PDFs for stored records, bounded by total size on disk
+report_cache = DiskCache(
+    app.config["REPORT_CACHE_DIR"] or os.path.join(app.instance_path, "report_cache"),
+    max_bytes=app.config["REPORT_CACHE_MAX_BYTES"]
+)
+
+# username -> UserProfile, shared by requests in this process (see get_user())
+user_cache = LRUCache(maxsize=app.config["USER_CACHE_SIZE"], ttl=app.config["USER_CACHE_TTL"])
+
+# Rendered HTML of public /report/<id> pages
+report_page_cache = LRUCache(maxsize=app.config["REPORT_PAGE_CACHE_SIZE"])
+
+# Population analytics, rebuilt once per ANALYTICS_REFRESH seconds. Written through to
+# SQLite so a worker whose copy expired picks up the summary another worker just built
+os.makedirs(app.instance_path, exist_ok=True)
+analytics_cache = LRUCache(
+    maxsize=4,
+    ttl=app.config["ANALYTICS_REFRESH"],
+    path=app.config["ANALYTICS_CACHE_PATH"] or os.path.join(app.instance_path, "analytics_cache.db")
+)
+analytics_lock = threading.Lock()
+
+# Optional single writer that commits concurrent HealthRecord inserts together
+record_writer = None
+if app.config["GROUP_COMMIT"]:
+    record_writer = GroupCommitWriter(
+        app, db, HealthRecord,
+        interval=app.config["GROUP_COMMIT_INTERVAL"],
+        max_batch=app.config["GROUP_COMMIT_MAX_BATCH"],
+        on_flush=lambda records: update_risk_summaries(records, app.config["RISK_EWMA_ALPHA"])
+    )
+
+# ---------------- STARTUP ----------------
+
+# Seconds spent in each startup phase; reported by /readyz
+startup_timings = {"import": None, "models": None, "db": None, "client": None, "assets": None}
+_startup_lock = threading.Lock()
+_db_ready = False
+# Source name -> hashed path under static/, filled by load_assets()
+asset_manifest = None
+_ready = False
+_warming = False
+
+def get_client():
+    global client
+    if client is None:
+        start = time.perf_counter()
+        from openai import OpenAI
+        # Use existing key or empty string to avoid error if env var not set
+        # No client-side retries: llm_gateway enforces the deadline, and a retry would outlive it
+        client = OpenAI(api_key=app.config.get("OPENAI_API_KEY") or "dummy-key", max_retries=0)
+        startup_timings["client"] = time.perf_counter() - start
+    return client
+
+def init_db():
+    global _db_ready
+    if _db_ready:
+        return
+    with _startup_lock:
+        if not _db_ready:
+            start = time.perf_counter()
+            with app.app_context():
+                try:
+                    db.create_all()
+                    ensure_indexes()
+                except OperationalError:
+                    # Another worker created the same table/index a moment earlier; a second pass sees it
+                    db.create_all()
+                    ensure_indexes()
+            startup_timings["db"] = time.perf_counter() - start
+            _db_ready = True
+
+def load_assets():
+    # Fingerprint/precompress static/ (a no-op when dist/ is current) and load the manifest
+    global asset_manifest
+    if asset_manifest is not None:
+        return asset_manifest
+    with _startup_lock:
+        if asset_manifest is None:
+            start = time.perf_counter()
+            try:
+                manifest = build_assets.build(app.static_folder)
+            except OSError as e:
+                # Read-only deploy: use whatever `python build_assets.py` produced at build time
+                print(f"Asset build skipped: {e}")
+                try:
+                    with open(os.path.join(app.static_folder, build_assets.DIST, build_assets.MANIFEST)) as f:
+                        manifest = json.load(f)
+                except OSError:
+                    manifest = {}
+            startup_timings["assets"] = time.perf_counter() - start
+            asset_manifest = manifest
+    return asset_manifest
+
+def warm_up():
+    # Load everything a first request would otherwise pay for; safe to call repeatedly
+    global _ready
+    if _ready:
+        return startup_timings
+    startup_timings["models"] = models_loader.registry.load().load_seconds
+    init_db()
+    get_client()
+    load_assets()
+    if app.config["METRICS_DIR"] and metrics.registry.shared_dir is None:
+        metrics.registry.share(app.config["METRICS_DIR"], app.config["METRICS_SHARE_INTERVAL"])
+    _ready = True
+    print("Startup: " + ", ".join(
+        f"{phase} {seconds * 1000:.0f}ms" for phase, seconds in startup_timings.items() if seconds is not None
+    ))
+    return startup_timings
+
+@app.before_request
+def ensure_db():
+    g.request_start = time.perf_counter()
+    # Probes must answer even while the worker is still warming up
+    if request.endpoint not in ("healthz", "readyz", "metrics_endpoint", "static", "static_asset"):
+        init_db()
+
+@app.after_request
+def record_request_time(response):
+    start = g.get("request_start")
+    if start is not None:
+        metrics.request_seconds.observe(
+            time.perf_counter() - start,
+            endpoint=request.endpoint or "unknown", method=request.method, status=response.status_code
+        )
+    return response
+
+@app.before_request
+def strip_encoded_etags():
+    header = request.environ.get("HTTP_IF_NONE_MATCH")
+    if header:
+        g.if_none_match = header
+        request.environ["HTTP_IF_NONE_MATCH"] = compression.strip_etag_encodings(header)
+
+@app.after_request
+def compress_response(response):
+    if response.status_code == 304:
+        # Hand back the validator the client sent, encoding suffix included
+        etag, weak = response.get_etag()
+        encoding = compression.negotiate(request.accept_encodings)
+        if etag and not weak and encoding:
+            tag = compression.encoded_etag(etag, encoding)
+            if f'"{tag}"' in g.get("if_none_match", ""):
+                response.set_etag(tag)
+                response.vary.add("Accept-Encoding")
+        return response
+    # Streamed bodies (SSE, /history/export) and files (PDFs, /assets/) pass through untouched
+    if (response.direct_passthrough or response.is_streamed or response.status_code != 200
+            or "Content-Encoding" in response.headers or response.mimetype not in compression.COMPRESSIBLE):
+        return response
+    response.vary.add("Accept-Encoding")
+    data = response.get_data()
+    encoding = compression.negotiate(request.accept_encodings)
+    if encoding is None or len(data) < app.config["COMPRESS_MIN_SIZE"]:
+        return response
+
+    start = time.perf_counter()
+    body = compression.compress(
+        data, encoding, app.config["COMPRESS_GZIP_LEVEL"], app.config["COMPRESS_BROTLI_QUALITY"]
+    )
+    metrics.compression_seconds.observe(time.perf_counter() - start, encoding=encoding)
+    metrics.compression_bytes.inc(len(data), encoding=encoding, direction="in")
+    metrics.compression_bytes.inc(len(body), encoding=encoding, direction="out")
+
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+    # Strong ETags stay strong, one per encoding (/report/<id> is served with a strong one)
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(compression.encoded_etag(etag, encoding))
+    return response
+
+@app.route("/healthz")
+def healthz():
+    return jsonify({"status": "ok"})
 
-# Use existing key or empty string to avoid error if env var not set
-client = OpenAI(api_key=app.config.get("OPENAI_API_KEY") or "dummy-key")
+@app.route("/readyz")
+def readyz():
+    global _warming
+    if not _ready:
+        # Kick off warm-up in the background so a cold worker becomes ready without a user request
+        with _startup_lock:
+            if not _warming:
+                _warming = True
+                threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+        return jsonify({"status": "warming", "startup": startup_timings}), 503
+    return jsonify({"status": "ready", "startup": startup_timings})
 
-with app.app_context():
-    db.create_all()
+@app.route("/metrics")
+def metrics_endpoint():
+    return app.response_class(metrics.registry.render(), content_type=metrics.CONTENT_TYPE)
+
+@metrics.registry.collector
+def collect_component_stats():
+    caches = {
+        "llm": llm_cache, "user": user_cache, "report_page": report_page_cache, "report_pdf": report_cache,
+        "analytics": analytics_cache
+    }
+    sms = sms_dispatcher.stats()
+    gateway = llm_gateway.stats()
+    local = metrics.symptom_sources.value(source="local")
+    handled = local + metrics.symptom_sources.value(source="llm")
+    llm_calls = metrics.stage_seconds.count(route="predict", stage="llm")
+    mean_llm = metrics.stage_seconds.total(route="predict", stage="llm") / llm_calls if llm_calls else 0.0
+    return [
+        ("healix_cache_hits_total", "counter", "Cache hits by cache.",
+         [({"cache": name}, cache.hits) for name, cache in caches.items()]),
+        ("healix_cache_misses_total", "counter", "Cache misses by cache.",
+         [({"cache": name}, cache.misses) for name, cache in caches.items()]),
+        ("healix_llm_gateway_total", "counter", "Outbound LLM gateway calls by outcome.",
+         [({"outcome": k}, gateway[k]) for k in ("calls", "deduplicated", "rejected", "timeouts", "errors")]),
+        ("healix_llm_gateway_inflight", "gauge", "LLM calls running or queued upstream.", [({}, gateway["inflight"])]),
+        ("healix_symptom_local_ratio", "gauge", "Share of symptom requests read without the LLM.",
+         [({}, local / handled if handled else 0.0)]),
+        ("healix_symptom_llm_seconds_saved", "gauge",
+         "Estimated LLM wait avoided: local requests x mean predict llm stage time.", [({}, local * mean_llm)]),
+        ("healix_sms_deliveries_total", "counter", "SMS alerts handed to Twilio, by result.",
+         [({"result": "sent"}, sms["sent"]), ({"result": "failed"}, sms["failed"])]),
+        ("healix_sms_retries_total", "counter", "Twilio send attempts that were retried.", [({}, sms["retried"])]),
+        ("healix_sms_queue_depth", "gauge", "SMS alerts waiting for a worker.", [({}, sms["depth"])]),
+        ("healix_sms_delivery_seconds_max", "gauge", "Slowest enqueue-to-sent time so far.", [({}, sms["latency_max"])])
+    ]
+
+# ---------------- STATIC ASSETS ----------------
+
+@app.template_global()
+def asset_url(name):
+    # Hashed, long-cacheable URL for a file in static/; the plain static URL if it wasn't built
+    path = load_assets().get(name)
+    if path is None:
+        return flask.url_for("static", filename=name)
+    return flask.url_for("static_asset", filename=path[len(build_assets.DIST) + 1:])
+
+@app.route("/assets/<path:filename>")
+def static_asset(filename):
+    # Fingerprinted files never change, so browsers keep them for a year without revalidating.
+    # Serve the smallest precompressed copy the client accepts.
+    dist = os.path.join(app.static_folder, build_assets.DIST)
+    mimetype = mimetypes.guess_type(filename)[0]
+    for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+        if request.accept_encodings[encoding] and os.path.isfile(os.path.join(dist, filename + suffix)):
+            response = send_from_directory(dist, filename + suffix, mimetype=mimetype, max_age=app.config["ASSET_MAX_AGE"])
+            response.headers["Content-Encoding"] = encoding
+            break
+    else:
+        response = send_from_directory(dist, filename, mimetype=mimetype, max_age=app.config["ASSET_MAX_AGE"])
+    response.vary.add("Accept-Encoding")
+    response.cache_control.immutable = True
+    return response
 
 @app.route("/")
 def home():
@@ -26,6 +337,32 @@ def home():
 
 # ---------------- AUTH ----------------
 
+# What requests need to know about a user; never includes the password
+UserProfile = namedtuple("UserProfile", ["username", "phone"])
+
+def get_user(username):
+    # Request-scoped copy first, then the process cache, then one query; None if there's no such user
+    if not username:
+        return None
+    users = g.setdefault("users", {})
+    if username in users:
+        return users[username]
+    profile = user_cache.get(username)
+    if profile is None:
+        row = db.session.query(User.username, User.phone).filter_by(username=username).first()
+        profile = UserProfile(row.username, row.phone) if row else None
+        if profile:
+            user_cache.set(username, profile)
+    users[username] = profile
+    return profile
+
+def remember_user(username, phone):
+    # Call after writing a User row so the next lookups see the new values
+    profile = UserProfile(username, phone)
+    user_cache.set(username, profile)
+    g.setdefault("users", {})[username] = profile
+    return profile
+
 @app.route("/register", methods=["GET","POST"])
 def register():
     if request.method == "POST":
@@ -54,10 +391,13 @@ def login():
             session["user"] = username
             
             # Update phone if provided
-            if phone:
+            phone = phone or user.phone
+            if phone != user.phone:
                 user.phone = phone
                 db.session.commit()
-                
+            # Primes the cache so the first /predict alert needs no lookup
+            remember_user(username, phone)
+
             return redirect("/dashboard")
         else:
             return render_template("login.html", error="Invalid credentials")
@@ -66,18 +406,19 @@ def login():
 
 # ---------------- DASHBOARD ----------------
 
+def conditional_page(html):
+    # Per-user page: browsers revalidate on every load and get an empty 304 if it hasn't changed
+    response = app.make_response(html)
+    response.add_etag()
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
 @app.route("/dashboard")
 def dashboard():
     if "user" not in session:
         return redirect("/login")
-    return render_template("dashboard.html", username=session["user"])
-
-@app.route("/history")
-def history():
-    if "user" not in session:
-        return redirect("/login")
-    records = HealthRecord.query.filter_by(username=session["user"]).order_by(HealthRecord.created_at.desc()).all()
-    return render_template("history.html", records=records, username=session["user"])
+    return conditional_page(render_template("dashboard.html", username=session["user"]))
 
 @app.route("/settings", methods=["GET", "POST"])
 def settings():
@@ -85,35 +426,287 @@ def settings():
         return redirect("/login")
     
     message = None
-    user = User.query.filter_by(username=session["user"]).first()
+    user = get_user(session["user"])
 
     if request.method == "POST":
         new_phone = request.form.get("phone")
         new_pass = request.form.get("password")
-        
+
+        changes = {}
+        if new_phone: changes["phone"] = new_phone
+        if new_pass: changes["password"] = new_pass
+
         if user:
-            if new_phone: user.phone = new_phone
-            if new_pass: user.password = new_pass
-            db.session.commit()
+            # One UPDATE, no SELECT of the full row first
+            if changes:
+                User.query.filter_by(username=user.username).update(changes)
+                db.session.commit()
+                user = remember_user(user.username, changes.get("phone", user.phone))
             message = "Profile updated successfully!"
-    
-    return render_template("settings.html", user=user, message=message, username=session["user"])
+
+    return conditional_page(render_template("settings.html", user=user, message=message, username=session["user"]))
 
 @app.route("/report/<int:id>")
 def view_public_report(id):
-    record = HealthRecord.query.get_or_404(id)
-    # Estimate estimates from recorded data if possible or stored?
-    # Our module didn't store estimates json in DB, just specific columns.
-    # For now we'll display what we have.
-    return render_template("report.html", record=record)
+    # SMS links send bursts of hits here; records never change, so keep the rendered page
+    page = report_page_cache.get(id)
+    if page is None:
+        record = HealthRecord.query.get_or_404(id)
+        # Estimate estimates from recorded data if possible or stored?
+        # Our module didn't store estimates json in DB, just specific columns.
+        # For now we'll display what we have.
+        html = render_template("report.html", record=record)
+        page = {"html": html, "etag": hashlib.sha256(html.encode("utf-8")).hexdigest()[:32]}
+        report_page_cache.set(id, page)
 
-# ---------------- AI PREDICTION ----------------
+    response = app.make_response(page["html"])
+    response.set_etag(page["etag"])
+    response.cache_control.public = True
+    response.cache_control.max_age = app.config["REPORT_MAX_AGE"]
+    return response.make_conditional(request)
 
-@app.route("/predict", methods=["POST"])
-def predict():
-    data = request.json
-    message = data.get("message", "")
-    
+# ---------------- HISTORY ----------------
+
+def encode_cursor(created_raw, record_id):
+    return base64.urlsafe_b64encode(f"{created_raw}|{record_id}".encode()).decode().rstrip("=")
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_raw, record_id = raw.rsplit("|", 1)
+        record_id = int(record_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
+    # Forged ids beyond SQLite's 64-bit INTEGER would fail when bound to the query
+    if not 0 <= record_id < 2 ** 63:
+        return None
+    return created_raw, record_id
+
+def history_page(username, cursor=None, limit=None):
+    """One page of a user's records, newest first, plus the cursor for the next page.
+
+    Seeks past the cursor with a (created_at, id) row-value comparison, which
+    SQLite answers straight from the (username, created_at) index, so deep
+    pages cost the same as the first one. created_at is compared as the text
+    SQLite stored: CURRENT_TIMESTAMP values don't round-trip through DateTime binds.
+    """
+    limit = limit or app.config["HISTORY_PAGE_SIZE"]
+    created_raw = db.type_coerce(HealthRecord.created_at, db.String)
+
+    query = db.session.query(HealthRecord, created_raw).filter(HealthRecord.username == username)
+    if cursor:
+        query = query.filter(db.tuple_(created_raw, HealthRecord.id) < db.tuple_(*cursor))
+    rows = query.order_by(HealthRecord.created_at.desc(), HealthRecord.id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last, last_raw = rows[-1]
+        next_cursor = encode_cursor(last_raw, last.id)
+    return [record for record, _ in rows], next_cursor
+
+def page_args():
+    cursor = request.args.get("cursor")
+    if cursor:
+        cursor = decode_cursor(cursor)
+        if cursor is None:
+            flask.abort(400, "Invalid cursor")
+    limit = request.args.get("limit", type=int) or app.config["HISTORY_PAGE_SIZE"]
+    return cursor, max(1, min(limit, app.config["HISTORY_MAX_PAGE_SIZE"]))
+
+def record_to_dict(record):
+    return {
+        "id": record.id,
+        "created_at": record.created_at.isoformat() if record.created_at else None,
+        "symptoms": record.symptoms,
+        "diabetes": record.diabetes,
+        "heart": record.heart,
+        "kidney": record.kidney
+    }
+
+@app.route("/history")
+def history():
+    if "user" not in session:
+        return redirect("/login")
+    cursor, limit = page_args()
+    records, next_cursor = history_page(session["user"], cursor, limit)
+    summary = db.session.get(RiskSummary, session["user"])
+    return conditional_page(render_template("history.html", records=records, next_cursor=next_cursor,
+                                            first_page=cursor is None, summary=summary, username=session["user"]))
+
+@app.route("/history/records")
+def history_records():
+    if "user" not in session:
+        return jsonify({"error": "Login required."}), 401
+    cursor, limit = page_args()
+    records, next_cursor = history_page(session["user"], cursor, limit)
+    return jsonify({
+        "records": [record_to_dict(r) for r in records],
+        "next_cursor": next_cursor
+    })
+
+@app.route("/history/summary")
+def history_summary():
+    if "user" not in session:
+        return jsonify({"error": "Login required."}), 401
+    # Single primary-key lookup, however many records the user has
+    summary = db.session.get(RiskSummary, session["user"])
+    return jsonify(summary.to_dict() if summary else {"username": session["user"], "count": 0})
+
+EXPORT_COLUMNS = ("id", "username", "created_at", "symptoms", "diabetes", "heart", "kidney")
+
+def parse_day(value, name):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        flask.abort(400, f"'{name}' must be YYYY-MM-DD")
+
+def export_rows(usernames, start=None, end=None):
+    """Yield (id, username, created_at, symptoms, diabetes, heart, kidney) tuples, oldest first.
+
+    yield_per streams from the SQLite cursor in EXPORT_CHUNK_SIZE batches
+    instead of loading the result, so memory stays flat and rows go out
+    while the query is still running. `usernames` None means all users.
+    """
+    created_raw = db.type_coerce(HealthRecord.created_at, db.String)
+    query = db.session.query(
+        HealthRecord.id, HealthRecord.username, created_raw, HealthRecord.symptoms,
+        HealthRecord.diabetes, HealthRecord.heart, HealthRecord.kidney
+    )
+    if usernames is not None:
+        query = query.filter(HealthRecord.username.in_(usernames))
+    # Compared as stored text, like history_page(): "YYYY-MM-DD HH:MM:SS" sorts chronologically
+    if start:
+        query = query.filter(created_raw >= start.strftime("%Y-%m-%d"))
+    if end:
+        query = query.filter(created_raw < (end + timedelta(days=1)).strftime("%Y-%m-%d"))
+    query = query.order_by(HealthRecord.created_at, HealthRecord.id)
+    return query.execution_options(yield_per=app.config["EXPORT_CHUNK_SIZE"])
+
+def csv_cell(value):
+    # Spreadsheets run text starting with these as a formula; the quote makes it plain text
+    if isinstance(value, str) and value.startswith(("=", "+", "-", "@")):
+        return "'" + value
+    return value
+
+def csv_chunks(rows, chunk_size):
+    import csv
+    import io
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for i, row in enumerate(rows, 1):
+        writer.writerow([csv_cell(value) for value in row])
+        if i % chunk_size == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+def ndjson_chunks(rows, chunk_size):
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False))
+        if len(lines) == chunk_size:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+def gzip_chunks(chunks):
+    import zlib
+
+    # wbits=31: gzip container, so the download is a regular .gz file
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+@app.route("/history/export")
+def history_export():
+    """Download history as CSV (default) or NDJSON: ?format=csv|ndjson&from=&to=&gzip=1.
+
+    Users export their own records. Clinicians (CLINICIANS) may pass
+    ?user=<name>, or ?user=* for every user in the date range.
+    """
+    if "user" not in session:
+        return jsonify({"error": "Login required."}), 401
+
+    fmt = request.args.get("format", "csv")
+    if fmt not in ("csv", "ndjson"):
+        return jsonify({"error": "format must be csv or ndjson."}), 400
+
+    target = request.args.get("user") or session["user"]
+    if target != session["user"] and session["user"] not in app.config["CLINICIANS"]:
+        return jsonify({"error": "Only clinicians can export other users' records."}), 403
+    usernames = None if target == "*" else [target]
+
+    start = parse_day(request.args["from"], "from") if request.args.get("from") else None
+    end = parse_day(request.args["to"], "to") if request.args.get("to") else None
+
+    chunk_size = app.config["EXPORT_CHUNK_SIZE"]
+    rows = export_rows(usernames, start, end)
+    chunks = csv_chunks(rows, chunk_size) if fmt == "csv" else ndjson_chunks(rows, chunk_size)
+    filename = f"healix_history_{'all' if usernames is None else target}.{fmt}"
+    mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    if request.args.get("gzip") == "1":
+        chunks = gzip_chunks(chunks)
+        filename += ".gz"
+        mimetype = "application/gzip"
+
+    # stream_with_context keeps the request (and its DB session) alive while the generator runs
+    response = app.response_class(flask.stream_with_context(chunks), mimetype=mimetype)
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    # Don't let a reverse proxy buffer the whole file before sending it on
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+@app.cli.command("rebuild-summaries")
+def rebuild_summaries_command():
+    """Backfill per-user risk summaries from existing records."""
+    init_db()
+    rebuild_risk_summaries(app.config["RISK_EWMA_ALPHA"])
+    print(f"Rebuilt {RiskSummary.query.count()} risk summaries.")
+
+# ---------------- ANALYTICS ----------------
+
+def population_analytics():
+    # Served from analytics_cache; on expiry one request per worker rebuilds it while the others wait
+    key = f"population-{app.config['ANALYTICS_WEEKS']}"
+    summary = analytics_cache.get(key)
+    if summary is None:
+        with analytics_lock:
+            summary = analytics_cache.get(key)
+            if summary is None:
+                with metrics.timer("analytics", "aggregate"):
+                    summary = analytics.population_summary(
+                        app.config["RISK_ALERT_THRESHOLD"], weeks=app.config["ANALYTICS_WEEKS"]
+                    )
+                analytics_cache.set(key, summary)
+    return summary
+
+@app.route("/analytics")
+def analytics_page():
+    if "user" not in session:
+        return redirect("/login")
+    if session["user"] not in app.config["CLINICIANS"]:
+        return "Analytics are only available to clinicians.", 403
+    return render_template("analytics.html", summary=population_analytics(), username=session["user"])
+
+@app.route("/analytics/data")
+def analytics_data():
+    if "user" not in session:
+        return jsonify({"error": "Login required."}), 401
+    if session["user"] not in app.config["CLINICIANS"]:
+        return jsonify({"error": "Analytics are only available to clinicians."}), 403
+    return jsonify(population_analytics())
+
+# ---------------- FEATURE HELPERS ----------------
+
+def parse_features(data):
     # Default values (average healthy adult)
     features = {
         "age": 45,
@@ -129,191 +722,236 @@ def predict():
         if key in data and data[key]:
             try:
                 features[key] = float(data[key])
-            except ValueError:
+            except (TypeError, ValueError):
                 pass # Keep default if conversion fails
 
     # If manual values are almost all default/missing, we imply we should use AI-driven estimation
-    has_manual = any(k in data and data[k] for k in ["age", "bmi", "bp", "glucose", "chol", "max_heart_rate"])
+    has_manual = any(k in data and data[k] for k in FEATURE_KEYS)
+    return features, has_manual
+
+def adjust_features(features, symptoms, data):
+    # Nudge the defaults for any vital the user didn't enter, based on 0/1 symptom flags
+    if "glucose" not in data or not data["glucose"]:
+        if symptoms.get("thirst"): features["glucose"] += 20
+        if symptoms.get("urination"): features["glucose"] += 20
+        if symptoms.get("blurred_vision"): features["glucose"] += 20
+        if symptoms.get("slow_healing"): features["glucose"] += 20
     
-    # Extract questionnaire answers
-    q_data = data.get("questionnaire", {})
+    if "bp" not in data or not data["bp"]:
+        if symptoms.get("breath_shortness"): features["bp"] += 10
+        if symptoms.get("swollen_legs"): features["bp"] += 10
+
+    if "max_heart_rate" not in data or not data["max_heart_rate"]:
+        if symptoms.get("chest_pain"): features["max_heart_rate"] += 30
+        if symptoms.get("palpitations"): features["max_heart_rate"] += 30
+        if symptoms.get("breath_shortness"): features["max_heart_rate"] += 20
+
+    if "bmi" not in data or not data["bmi"]:
+        if symptoms.get("obesity"): features["bmi"] += 10
+
+def llm_cache_key(message, q_data, lang_code):
+    # Normalize so whitespace and questionnaire key order don't defeat the cache
+    answers = {k: 1 if v == 1 else 0 for k, v in q_data.items()}
+    return cache_key(LLM_MODEL, " ".join((message or "").split()), answers, lang_code)
+
+# ---------------- AI PREDICTION ----------------
+
+def ask_ai(message, q_data, lang_code):
+    # Symptom flags, advice text and AI risk estimates from GPT (or the mock when no key is set)
+    target_lang = localization.get(lang_code)["name"]
+    q_text = ", ".join([f"{k}: {'Yes' if v == 1 else 'No'}" for k, v in q_data.items()])
+    prompt = f"""
+    You are a health assistant for Indian conditions (urban and rural).
+    Extract 0 or 1 values for the symptoms below.
     
-    # Extract questionnaire and language
-    q_data = data.get("questionnaire", {})
-    lang_code = data.get("language", "en-US")
+    CRITICAL: Provide ALL text-based fields (recommendation, future_risks, precautions, causes, reduction_steps, diet_plan) in {target_lang}.
     
-    # Map language code to human names for GPT
-    lang_map = {
-        "en-US": "English",
-        "hi-IN": "Hindi",
-        "te-IN": "Telugu"
-    }
-    target_lang = lang_map.get(lang_code, "English")
-
-    # If message is present OR questionnaire is present, use NLP to adjust/predict
-    recommendation = "Maintain a healthy lifestyle." 
-    ai_risks = {}
+    Symptoms to extract: thirst, urination, fatigue, chest_pain, dizziness, obesity, blurred_vision, slow_healing, numbness, breath_shortness, swollen_legs, palpitations, foamy_urine, itchy_skin, muscle_cramps.
+    
+    Fields to provide (in {target_lang}):
+    1. 'recommendation': Risk-based advice (max 30 words). 
+       - LOW risk: Focus on maintenance and preventive health.
+       - MODERATE risk: Focus on lifestyle changes and scheduling a checkup.
+       - HIGH risk: Urgent medical consultation.
+    2. 'future_risks': Potential complications (max 20 words).
+    3. 'precautions': Actionable steps (max 3 bullet points).
+    4. 'causes': Medical/lifestyle reasons (max 30 words).
+    5. 'reduction_steps': Steps to lower risk proportional to risk level.
+    6. 'diet_plan': Recommended foods (max 30 words).
+    7. 'diabetes_risk', 'heart_risk', 'kidney_risk': Percentages (0-100).
+    
+    Input Text: {message}
+    Direct Symptoms: {q_text}
+    
+    Return JSON object with all symptoms and advice keys.
+    """
 
-    if (message and len(message.strip()) > 2) or q_data:
-        q_text = ", ".join([f"{k}: {'Yes' if v == 1 else 'No'}" for k, v in q_data.items()])
-        prompt = f"""
-        You are a health assistant for Indian conditions (urban and rural).
-        Extract 0 or 1 values for the symptoms below.
-        
-        CRITICAL: Provide ALL text-based fields (recommendation, future_risks, precautions, causes, reduction_steps, diet_plan) in {target_lang}.
+    if get_client().api_key == "dummy-key":
+        import random
+        metrics.llm_requests.inc(source="mock")
         
-        Symptoms to extract: thirst, urination, fatigue, chest_pain, dizziness, obesity, blurred_vision, slow_healing, numbness, breath_shortness, swollen_legs, palpitations, foamy_urine, itchy_skin, muscle_cramps.
+        # Mock symptoms logic
+        s_thirst = q_data.get("thirst", random.choice([0, 1]))
+        s_chest = q_data.get("chest_pain", random.choice([0, 1]))
         
-        Fields to provide (in {target_lang}):
-        1. 'recommendation': Risk-based advice (max 30 words). 
-           - LOW risk: Focus on maintenance and preventive health.
-           - MODERATE risk: Focus on lifestyle changes and scheduling a checkup.
-           - HIGH risk: Urgent medical consultation.
-        2. 'future_risks': Potential complications (max 20 words).
-        3. 'precautions': Actionable steps (max 3 bullet points).
-        4. 'causes': Medical/lifestyle reasons (max 30 words).
-        5. 'reduction_steps': Steps to lower risk proportional to risk level.
-        6. 'diet_plan': Recommended foods (max 30 words).
-        7. 'diabetes_risk', 'heart_risk', 'kidney_risk': Percentages (0-100).
+        d_risk = random.randint(60, 95) if s_thirst else random.randint(5, 30)
+        h_risk = random.randint(60, 95) if s_chest else random.randint(5, 30)
+        k_risk = random.randint(5, 40)
         
-        Input Text: {message}
-        Direct Symptoms: {q_text}
+        is_high = any(r > 60 for r in [d_risk, h_risk, k_risk])
+        risk_level = "high" if is_high else "low"
         
-        Return JSON object with all symptoms and advice keys.
-        """
+        curr_advice = localization.get(lang_code)["mock_advice"][risk_level]
 
-        try:
-            if client.api_key == "dummy-key":
-                import random
-                
-                # Mock localized advice (Risk-based)
-                mock_advice = {
-                    "en-US": {
-                        "low": {"rec": "Your risk levels are low. Maintain a balanced diet and regular exercise.", "red": "1. Stay active.\n2. Eat greens.\n3. Annual wellness check."},
-                        "high": {"rec": "High risk detected. Consult a doctor immediately for a detailed screening.", "red": "1. Immediate consultation.\n2. Diagnostic tests.\n3. Medication review."}
-                    },
-                    "hi-IN": {
-                        "low": {"rec": "आपका जोखिम स्तर कम है। संतुलित आहार और नियमित व्यायाम बनाए रखें।", "red": "1. सक्रिय रहें।\n2. हरी सब्जियां खाएं।\n3. वार्षिक स्वास्थ्य जांच।"},
-                        "high": {"rec": "उच्च जोखिम का पता चला। विस्तृत जांच के लिए तुरंत डॉक्टर से सलाह लें।", "red": "1. तत्काल परामर्श।\n2. नैदानिक परीक्षण।\n3. दवा की समीक्षा।"}
-                    },
-                    "te-IN": {
-                        "low": {"rec": "మీ ప్రమాద స్థాయిలు తక్కువగా ఉన్నాయి. సమతుల్య ఆహారం మరియు క్రమం తప్పకుండా వ్యాయామం చేయండి.", "red": "1. యాక్టివ్ గా ఉండండి.\n2. ఆకుకూరలు తినండి.\n3. వార్షిక ఆరోగ్య పరీక్ష."},
-                        "high": {"rec": "అధిక ప్రమాదం గుర్తించబడింది. వివరణాత్మక స్క్రీనింగ్ కోసం వెంటనే వైద్యుడిని సంప్రదించండి.", "red": "1. తక్షణ సంప్రదింపు.\n2. రోగనిర్ధారణ పరీక్షలు.\n3. మందుల సమీక్ష."}
-                    }
-                }
-                
-                # Mock symptoms logic
-                s_thirst = q_data.get("thirst", random.choice([0, 1]))
-                s_chest = q_data.get("chest_pain", random.choice([0, 1]))
-                
-                d_risk = random.randint(60, 95) if s_thirst else random.randint(5, 30)
-                h_risk = random.randint(60, 95) if s_chest else random.randint(5, 30)
-                k_risk = random.randint(5, 40)
-                
-                is_high = any(r > 60 for r in [d_risk, h_risk, k_risk])
-                risk_level = "high" if is_high else "low"
-                
-                curr_advice = mock_advice.get(lang_code, mock_advice["en-US"])[risk_level]
-
-                symptoms = {
-                    "thirst": s_thirst,
-                    "urination": q_data.get("urination", random.choice([0, 1])),
-                    "fatigue": q_data.get("fatigue", random.choice([0, 1])),
-                    "chest_pain": s_chest,
-                    "dizziness": q_data.get("dizziness", random.choice([0, 1])),
-                    "obesity": q_data.get("obesity", random.choice([0, 1])),
-                    "blurred_vision": q_data.get("blurred_vision", random.choice([0, 1])),
-                    "slow_healing": q_data.get("slow_healing", random.choice([0, 1])),
-                    "numbness": q_data.get("numbness", random.choice([0, 1])),
-                    "breath_shortness": q_data.get("breath_shortness", random.choice([0, 1])),
-                    "swollen_legs": q_data.get("swollen_legs", random.choice([0, 1])),
-                    "palpitations": q_data.get("palpitations", random.choice([0, 1])),
-                    "foamy_urine": q_data.get("foamy_urine", random.choice([0, 1])),
-                    "itchy_skin": q_data.get("itchy_skin", random.choice([0, 1])),
-                    "muscle_cramps": q_data.get("muscle_cramps", random.choice([0, 1])),
-                    "recommendation": curr_advice["rec"],
-                    "future_risks": "Complications depend on lifestyle choices.",
-                    "precautions": "Monitor vitals regularly.",
-                    "causes": "May include environmental and genetic factors.",
-                    "reduction_steps": curr_advice["red"],
-                    "diet_plan": "Specific diet based on your risk profile.",
-                    "diabetes_risk": d_risk,
-                    "heart_risk": h_risk,
-                    "kidney_risk": k_risk
-                }
-            else:
-                response = client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[{"role":"user","content":prompt}],
-                    response_format={ "type": "json_object" }
-                )
-                import json
-                symptoms = json.loads(response.choices[0].message.content)
-            
-            recommendation = symptoms.get("recommendation", recommendation)
-            future_risks = symptoms.get("future_risks", "Potential health complications if untreated.")
-            precautions = symptoms.get("precautions", "Consult a doctor for specific preventive measures.")
-            causes = symptoms.get("causes", "Lifestyle or biological factors.")
-            reduction_steps = symptoms.get("reduction_steps", "Medical management and lifestyle adjustments.")
-            diet_plan = symptoms.get("diet_plan", "Balanced nutrition based on risk levels.")
-
-            ai_risks = {
-                "diabetes": symptoms.get("diabetes_risk", 0),
-                "heart": symptoms.get("heart_risk", 0),
-                "kidney": symptoms.get("kidney_risk", 0)
-            }
+        return {
+            "thirst": s_thirst,
+            "urination": q_data.get("urination", random.choice([0, 1])),
+            "fatigue": q_data.get("fatigue", random.choice([0, 1])),
+            "chest_pain": s_chest,
+            "dizziness": q_data.get("dizziness", random.choice([0, 1])),
+            "obesity": q_data.get("obesity", random.choice([0, 1])),
+            "blurred_vision": q_data.get("blurred_vision", random.choice([0, 1])),
+            "slow_healing": q_data.get("slow_healing", random.choice([0, 1])),
+            "numbness": q_data.get("numbness", random.choice([0, 1])),
+            "breath_shortness": q_data.get("breath_shortness", random.choice([0, 1])),
+            "swollen_legs": q_data.get("swollen_legs", random.choice([0, 1])),
+            "palpitations": q_data.get("palpitations", random.choice([0, 1])),
+            "foamy_urine": q_data.get("foamy_urine", random.choice([0, 1])),
+            "itchy_skin": q_data.get("itchy_skin", random.choice([0, 1])),
+            "muscle_cramps": q_data.get("muscle_cramps", random.choice([0, 1])),
+            **curr_advice,
+            "diabetes_risk": d_risk,
+            "heart_risk": h_risk,
+            "kidney_risk": k_risk
+        }
 
-            # Adjust values based on symptoms (For traditional models)
-            if "glucose" not in data or not data["glucose"]:
-                if symptoms.get("thirst"): features["glucose"] += 20
-                if symptoms.get("urination"): features["glucose"] += 20
-                if symptoms.get("blurred_vision"): features["glucose"] += 20
-                if symptoms.get("slow_healing"): features["glucose"] += 20
-            
-            if "bp" not in data or not data["bp"]:
-                if symptoms.get("breath_shortness"): features["bp"] += 10
-                if symptoms.get("swollen_legs"): features["bp"] += 10
+    key = llm_cache_key(message, q_data, lang_code)
+    symptoms = llm_cache.get(key)
+    if symptoms is None:
+        metrics.llm_requests.inc(source="openai")
+        # Raises GatewayBusy/GatewayTimeout when over budget; callers fall back to the model-only result
+        content = llm_gateway.complete(
+            key,
+            model=LLM_MODEL,
+            messages=[{"role":"user","content":prompt}],
+            response_format={ "type": "json_object" }
+        )
+        symptoms = json.loads(content)
+        llm_cache.set(key, symptoms)
+    else:
+        metrics.llm_requests.inc(source="cache")
+    return symptoms
 
-            if "max_heart_rate" not in data or not data["max_heart_rate"]:
-                if symptoms.get("chest_pain"): features["max_heart_rate"] += 30
-                if symptoms.get("palpitations"): features["max_heart_rate"] += 30
-                if symptoms.get("breath_shortness"): features["max_heart_rate"] += 20
+def advice_from(symptoms):
+    return {
+        "recommendation": symptoms.get("recommendation", "Maintain a healthy lifestyle."),
+        "future_risks": symptoms.get("future_risks", "Potential health complications if untreated."),
+        "precautions": symptoms.get("precautions", "Consult a doctor for specific preventive measures."),
+        "causes": symptoms.get("causes", "Lifestyle or biological factors."),
+        "reduction_steps": symptoms.get("reduction_steps", "Medical management and lifestyle adjustments."),
+        "diet_plan": symptoms.get("diet_plan", "Balanced nutrition based on risk levels.")
+    }
 
-            if "bmi" not in data or not data["bmi"]:
-                if symptoms.get("obesity"): features["bmi"] += 10
-            
-        except Exception as e:
-            print(f"Error calling AI: {e}")
-    else:
-        defaults = {
-            "en-US": {
-                "risk": "Based on risk levels, untreated conditions may worsen.",
-                "pre": "Maintain a balanced diet and exercise regularly.",
-                "cause": "Further diagnosis required for specific causes.",
-                "red": "Standard health optimization requested.",
-                "diet": "Universal healthy diet recommended."
-            },
-            "hi-IN": {
-                "risk": "जोखिम के स्तरों के आधार पर, अनुपचारित स्थितियां खराब हो सकती हैं।",
-                "pre": "संतुलित आहार बनाए रखें और नियमित व्यायाम करें।",
-                "cause": "विशिष्ट कारणों के लिए और निदान की आवश्यकता है।",
-                "red": "मानक स्वास्थ्य अनुकूलन का अनुरोध किया गया।",
-                "diet": "सार्वभौमिक स्वास्थ्य आहार की सिफारिश की गई।"
-            },
-            "te-IN": {
-                "risk": "ప్రమాద స్థాయిల ఆధారంగా, చికిత్స చేయని పరిస్థితులు అధ్వాన్నంగా మారవచ్చు.",
-                "pre": "సమతుల్య ఆహారం తీసుకోండి మరియు క్రమం తప్పకుండా వ్యాయామం చేయండి.",
-                "cause": "నిర్దిష్ట కారణాల కోసం మరిన్ని పరీక్షలు అవసరం.",
-                "red": "ప్రామాణిక ఆరోగ్య ఆప్టిమైజేషన్ అభ్యర్థించబడింది.",
-                "diet": "సార్వత్రిక ఆరోగ్యకరమైన ఆహారం సిఫార్సు చేయబడింది."
-            }
-        }
-        curr_defaults = defaults.get(lang_code, defaults["en-US"])
-        future_risks = curr_defaults["risk"]
-        precautions = curr_defaults["pre"]
-        causes = curr_defaults["cause"]
-        reduction_steps = curr_defaults["red"]
-        diet_plan = curr_defaults["diet"]
+def default_advice(lang_code):
+    # Plain dict copy: callers merge it into JSON responses
+    return dict(localization.get(lang_code)["default_advice"])
+
+def risk_advice(lang_code, diabetes, heart, kidney):
+    # Catalog advice for the computed risk level, for answers that never reach the LLM
+    level = "high" if max(diabetes, heart, kidney) > app.config["RISK_ALERT_THRESHOLD"] else "low"
+    return dict(localization.get(lang_code)["mock_advice"][level])
+
+def background_advice(message, q_data, lang_code):
+    # Second phase of an async /predict: only the advice text is still outstanding
+    try:
+        with metrics.timer("predict_async", "llm"):
+            return advice_from(ask_ai(message, q_data, lang_code))
+    except Exception as e:
+        metrics.llm_errors.inc(route="predict_async")
+        print(f"Error calling AI: {e}")
+        return default_advice(lang_code)
+
+def use_models():
+    # Active model set for this request; its version is echoed in X-Model-Version
+    model_set = models_loader.current()
+    g.model_version = model_set.version
+    return model_set
+
+@app.after_request
+def add_model_version(response):
+    version = g.get("model_version")
+    if version:
+        response.headers["X-Model-Version"] = version
+    return response
+
+def save_record(fields):
+    # Returns the new HealthRecord id; goes through the group-commit writer when enabled
+    if record_writer is not None:
+        return record_writer.insert(fields)
+    record = HealthRecord(**fields)
+    db.session.add(record)
+    update_risk_summaries([record], app.config["RISK_EWMA_ALPHA"])
+    # Read the id before commit: afterwards it would cost a SELECT to reload the expired row
+    db.session.flush()
+    record_id = record.id
+    db.session.commit()
+    return record_id
+
+@app.route("/predict", methods=["POST"])
+def predict():
+    # Stage timings land in healix_stage_seconds{route="predict"} on /metrics
+    with metrics.timer("predict", "parse"):
+        data = request.json
+        message = data.get("message", "")
+        features, has_manual = parse_features(data)
+
+        # Extract questionnaire and language
+        q_data = data.get("questionnaire", {})
+        lang_code = data.get("language", "en-US")
+
+    # Pin one model version for the whole request, even if a hot reload lands mid-way
+    model_set = use_models()
+
+    advice = default_advice(lang_code)
+    advice_job = None
+    ai_risks = {}
+    local_answer = False
+
+    # If message is present OR questionnaire is present, use NLP to adjust/predict
+    if (message and len(message.strip()) > 2) or q_data:
+        # Questionnaire answers and short keyword messages ("very thirsty and tired")
+        # are read locally; only narrative text needs the LLM
+        with metrics.timer("predict", "extract"):
+            local = symptom_extractor.extract(message, q_data)
+        if app.config["LOCAL_SYMPTOMS"] and local.is_confident(app.config["SYMPTOM_MIN_CONFIDENCE"], app.config["SYMPTOM_MAX_WORDS"]):
+            metrics.symptom_sources.inc(source="local")
+            adjust_features(features, local.flags, data)
+            local_answer = True
+        elif data.get("async"):
+            metrics.symptom_sources.inc(source="llm")
+            # Two-phase mode: score the models now using the flags we can read
+            # locally, and fetch the LLM advice in the background.
+            adjust_features(features, local.flags, data)
+            advice_job = advice_jobs.submit(background_advice, message, q_data, lang_code)
+        else:
+            metrics.symptom_sources.inc(source="llm")
+            try:
+                with metrics.timer("predict", "llm"):
+                    symptoms = ask_ai(message, q_data, lang_code)
+                advice = advice_from(symptoms)
+
+                ai_risks = {
+                    "diabetes": symptoms.get("diabetes_risk", 0),
+                    "heart": symptoms.get("heart_risk", 0),
+                    "kidney": symptoms.get("kidney_risk", 0)
+                }
+
+                # Adjust values based on symptoms (For traditional models)
+                with metrics.timer("predict", "adjust"):
+                    adjust_features(features, symptoms, data)
+            except Exception as e:
+                metrics.llm_errors.inc(route="predict")
+                print(f"Error calling AI: {e}")
 
     # Prediction Logic Selection
     if not has_manual and ai_risks:
@@ -322,210 +960,398 @@ def predict():
         heart = ai_risks["heart"]
         kidney = ai_risks["kidney"]
     else:
-        # Use Scientific Models (pkl)
-        diabetes = diabetes_model.predict_proba([[
-            features["age"], features["bmi"], features["bp"], features["glucose"]
-        ]])[0][1]*100
-
-        heart = heart_model.predict_proba([[
-            features["age"], features["bp"], features["chol"], features["max_heart_rate"]
-        ]])[0][1]*100
+        # Use Scientific Models (pkl), compiled into one stacked kernel
+        with metrics.timer("predict", "inference"):
+            risks = model_set.engine.predict_one(features)
+        diabetes = risks["diabetes"]
+        heart = risks["heart"]
+        kidney = risks["kidney"]
 
-        kidney = kidney_model.predict_proba([[
-            features["age"], features["bp"], features["glucose"], features["chol"]
-        ]])[0][1]*100
+    if local_answer:
+        advice = risk_advice(lang_code, diabetes, heart, kidney)
 
-    record = HealthRecord(
+    fields = dict(
         username=session.get("user", "Guest"),
         symptoms=message if message else "Q&A Analysis",
         diabetes=diabetes,
         heart=heart,
         kidney=kidney
     )
-
-    db.session.add(record)
-    db.session.commit()
+    with metrics.timer("predict", "db_commit"):
+        record_id = save_record(fields)
 
     # --- SMS ALERT LOGIC ---
     try:
-        if diabetes > 70 or heart > 70 or kidney > 70:
-            user_entry = User.query.filter_by(username=session.get("user", "")).first()
+        threshold = app.config["RISK_ALERT_THRESHOLD"]
+        if diabetes > threshold or heart > threshold or kidney > threshold:
+            with metrics.timer("predict", "user_lookup"):
+                user_entry = get_user(session.get("user"))
             if user_entry and user_entry.phone:
-                send_risk_sms(user_entry.phone, diabetes, heart, kidney, record.id, lang_code)
+                with metrics.timer("predict", "sms"):
+                    send_risk_sms(user_entry.phone, diabetes, heart, kidney, record_id, lang_code)
     except Exception as e:
         print(f"SMS Error: {e}")
     # -----------------------
 
-    return jsonify({
+    result = {
         "diabetes": int(diabetes),
         "heart": int(heart),
         "kidney": int(kidney),
         "estimates": features,
-        "recommendation": recommendation,
-        "future_risks": future_risks,
-        "precautions": precautions,
-        "causes": causes,
-        "reduction_steps": reduction_steps,
-        "diet_plan": diet_plan,
-        "record_id": record.id
+        "record_id": record_id,
+        "model_version": model_set.version
+    }
+    if advice_job:
+        # Advice fields arrive later via /predict/jobs/<job_id>
+        result["advice_job"] = advice_job.id
+    else:
+        result.update(advice)
+    return jsonify(result)
+
+@app.route("/predict/jobs/<job_id>")
+def advice_status(job_id):
+    job = advice_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job."}), 404
+    return jsonify(job.to_dict())
+
+@app.route("/predict/jobs/<job_id>/events")
+def advice_events(job_id):
+    if not app.config["ADVICE_STREAMING"]:
+        # Don't let a stream pin a sync worker; clients fall back to polling
+        return jsonify({"error": "Streaming is disabled; poll /predict/jobs/<job_id>."}), 404
+    job = advice_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job."}), 404
+
+    def stream():
+        # Server-Sent Events: keep-alive comments until the advice is ready, then one event
+        deadline = time.monotonic() + app.config["ADVICE_STREAM_TIMEOUT"]
+        while True:
+            finished = advice_jobs.wait(job_id, timeout=10)
+            if finished is not None:
+                yield f"event: advice\ndata: {json.dumps(finished.to_dict(), ensure_ascii=False)}\n\n"
+                return
+            if time.monotonic() > deadline:
+                yield "event: timeout\ndata: {}\n\n"
+                return
+            yield ": keep-alive\n\n"
+
+    return app.response_class(
+        stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.route("/predict/batch", methods=["POST"])
+def predict_batch():
+    data = request.json or {}
+    patients = data.get("patients")
+
+    if not isinstance(patients, list) or not patients:
+        return jsonify({"error": "Expected a non-empty 'patients' list."}), 400
+    if len(patients) > app.config["BATCH_MAX_SIZE"]:
+        return jsonify({"error": f"Batch too large (max {app.config['BATCH_MAX_SIZE']} patients)."}), 400
+
+    # Questionnaire answers are already 0/1 symptom flags, so batches skip the LLM
+    # and apply them straight to the feature defaults.
+    rows = []
+    for patient in patients:
+        if not isinstance(patient, dict):
+            return jsonify({"error": "Each patient must be a JSON object."}), 400
+        questionnaire = patient.get("questionnaire") or {}
+        if not isinstance(questionnaire, dict):
+            return jsonify({"error": "'questionnaire' must be an object of symptom flags."}), 400
+        features, _ = parse_features(patient)
+        adjust_features(features, questionnaire, patient)
+        rows.append(features)
+
+    model_set = use_models()
+    risks = model_set.engine.predict_rows(rows)
+
+    username = session.get("user", "Guest")
+    records = [
+        {
+            "username": username,
+            "symptoms": patient.get("message") or "Batch Screening",
+            "diabetes": float(d),
+            "heart": float(h),
+            "kidney": float(k)
+        }
+        for patient, d, h, k in zip(patients, risks["diabetes"], risks["heart"], risks["kidney"])
+    ]
+
+    # One transaction and a fixed number of statements, however big the batch: an executemany
+    # INSERT (no per-row RETURNING), then the new ids. SQLite gives each row max(id) + 1 and
+    # our write lock keeps other writers out until commit, so they are the last len(records) ids.
+    db.session.execute(db.insert(HealthRecord), records)
+    last_id = db.session.query(db.func.max(HealthRecord.id)).scalar()
+    record_ids = range(last_id - len(records) + 1, last_id + 1)
+    update_risk_summaries(records, app.config["RISK_EWMA_ALPHA"])
+    db.session.commit()
+
+    return jsonify({
+        "count": len(records),
+        "model_version": model_set.version,
+        "results": [
+            {
+                "diabetes": int(d),
+                "heart": int(h),
+                "kidney": int(k),
+                "estimates": features,
+                "record_id": record_id
+            }
+            for record_id, features, d, h, k in zip(record_ids, rows, risks["diabetes"], risks["heart"], risks["kidney"])
+        ]
+    })
+
+def whatif_axis(name, spec, max_points):
+    # {"from": 180, "to": 100, "steps": 9} or an explicit list of values -> 1-D float array.
+    # Sizes are checked before anything is allocated.
+    if isinstance(spec, dict):
+        steps = spec.get("steps", 10)
+        if not isinstance(steps, int) or isinstance(steps, bool):
+            raise ValueError(f"'{name}' steps must be an integer.")
+        if not 1 <= steps <= max_points:
+            raise ValueError(f"'{name}' steps must be between 1 and {max_points}.")
+        try:
+            start, stop = float(spec["from"]), float(spec["to"])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"'{name}' needs numeric 'from' and 'to'.")
+        values = np.linspace(start, stop, steps)
+    elif isinstance(spec, list) and spec:
+        if len(spec) > max_points:
+            raise ValueError(f"'{name}' has more than {max_points} values.")
+        try:
+            values = np.array(spec, dtype=float)
+        except (TypeError, ValueError):
+            raise ValueError(f"'{name}' values must be numbers.")
+        if values.ndim != 1:
+            raise ValueError(f"'{name}' must be a flat list of numbers.")
+    else:
+        raise ValueError(f"'{name}' must be a range object or a non-empty list.")
+    if not np.isfinite(values).all():
+        raise ValueError(f"'{name}' values must be finite.")
+    return values
+
+@app.route("/predict/whatif", methods=["POST"])
+def predict_whatif():
+    """Risk curves as some features move while the rest stay at the user's values.
+
+    Read-only: nothing is stored and the LLM isn't called, so clients can
+    redraw the curves as often as they like. Body: the usual feature fields
+    (and optional questionnaire) plus "vary", e.g.
+    {"glucose": 180, "bmi": 31, "vary": {"glucose": {"from": 180, "to": 100, "steps": 9}, "bmi": [31, 28, 25]}}.
+    Each risk comes back as nested lists with one level per entry of "axes"
+    (the "vary" keys, in request order).
+    """
+    data = request.json or {}
+    vary = data.get("vary")
+    if not isinstance(vary, dict) or not vary:
+        return jsonify({"error": "Expected a non-empty 'vary' object of feature ranges."}), 400
+    unknown = [name for name in vary if name not in FEATURE_KEYS]
+    if unknown:
+        return jsonify({"error": f"Unknown features {unknown}; use {FEATURE_KEYS}."}), 400
+
+    try:
+        axes = {name: whatif_axis(name, spec, app.config["WHATIF_MAX_POINTS"]) for name, spec in vary.items()}
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    # Python ints: a product of several large axes must not wrap around like int64
+    points = math.prod(len(values) for values in axes.values())
+    if points > app.config["WHATIF_MAX_POINTS"]:
+        return jsonify({"error": f"Grid too large ({points} points, max {app.config['WHATIF_MAX_POINTS']})."}), 400
+
+    q_data = data.get("questionnaire") or {}
+    if not isinstance(q_data, dict):
+        return jsonify({"error": "'questionnaire' must be an object of symptom flags."}), 400
+
+    features, _ = parse_features(data)
+    adjust_features(features, q_data, data)
+    model_set = use_models()
+    with metrics.timer("whatif", "inference"):
+        baseline = model_set.engine.predict_one(features)
+        risks = model_set.engine.sweep(features, axes)
+
+    return jsonify({
+        "model_version": model_set.version,
+        "points": points,
+        "features": features,
+        "baseline": {name: round(value, 2) for name, value in baseline.items()},
+        "axes": [{"feature": name, "values": values.round(2).tolist()} for name, values in axes.items()],
+        "risks": {name: grid.round(2).tolist() for name, grid in risks.items()}
     })
 
+# ---------------- CSV INGEST ----------------
+
+def run_ingest(path, username, progress, per_row_users, on_chunk=None):
+    # Runs on an ingest worker; the upload's temp file is removed whatever happens
+    try:
+        with app.app_context(), open(path, newline="", encoding="utf-8-sig") as f:
+            ingest_csv(
+                f, username, parse_features, models_loader.current(),
+                chunk_size=app.config["INGEST_CHUNK_SIZE"],
+                progress=progress,
+                alpha=app.config["RISK_EWMA_ALPHA"],
+                on_chunk=on_chunk,
+                per_row_users=per_row_users
+            )
+        print(f"Ingested {progress.source}: {progress.rows_written} rows "
+              f"({progress.rows_rejected} rejected, {progress.rows_per_second():.0f} rows/s)")
+        return progress.to_dict()
+    except Exception as e:
+        if progress.status == "running":
+            # Failed before ingest_csv took over (e.g. no models to load)
+            progress.status, progress.error, progress.finished_at = "error", str(e), time.time()
+        raise
+    finally:
+        os.remove(path)
+
+@app.route("/ingest", methods=["POST"])
+def ingest_upload():
+    if "user" not in session:
+        return jsonify({"error": "Login required."}), 401
+    upload = request.files.get("file")
+    if upload is None or not upload.filename:
+        return jsonify({"error": "Expected a CSV file in the 'file' field."}), 400
+
+    # Copy the upload to disk in small blocks and let a worker stream it from there
+    upload_dir = os.path.join(app.instance_path, "ingest")
+    os.makedirs(upload_dir, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=".csv", dir=upload_dir)
+    with os.fdopen(fd, "wb") as f:
+        upload.save(f)
+
+    progress = IngestProgress(upload.filename, max_errors=app.config["INGEST_MAX_ERRORS"])
+    # Like /history/export, only clinicians may write into other users' histories
+    per_row_users = session["user"] in app.config["CLINICIANS"]
+    job = ingest_jobs.create(progress=progress)
+    ingest_jobs.start(job, run_ingest, path, session["user"], progress, per_row_users,
+                      on_chunk=lambda p: ingest_jobs.publish(job))
+    return jsonify({"job_id": job.id, "status_url": f"/ingest/{job.id}"}), 202
+
+@app.route("/ingest/<job_id>")
+def ingest_status(job_id):
+    if "user" not in session:
+        return jsonify({"error": "Login required."}), 401
+    job = ingest_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job."}), 404
+    return jsonify({"job_id": job.id, **job.progress.to_dict()})
+
+@app.cli.command("ingest")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--user", "username", default="Camp", help="Username for rows without a username column.")
+@click.option("--chunk-size", type=int, default=None, help="Rows per transaction (default INGEST_CHUNK_SIZE).")
+def ingest_command(path, username, chunk_size):
+    """Score a CSV of camp measurements and store them as health records."""
+    init_db()
+    progress = IngestProgress(path, max_errors=app.config["INGEST_MAX_ERRORS"])
+
+    def report(p):
+        print(f"{p.rows_read} rows read, {p.rows_written} written, {p.rows_rejected} rejected "
+              f"({p.rows_per_second():.0f} rows/s)")
+
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        ingest_csv(
+            f, username, parse_features, models_loader.current(),
+            chunk_size=chunk_size or app.config["INGEST_CHUNK_SIZE"],
+            progress=progress,
+            alpha=app.config["RISK_EWMA_ALPHA"],
+            on_chunk=report,
+            per_row_users=True
+        )
+    for error in progress.errors:
+        print(f"  line {error['line']}: {error['error']}")
+    print(f"Done: {progress.rows_written} records in {progress.finished_at - progress.started_at:.1f}s.")
+
 # ---------------- SMS HELPER ----------------
 
-def send_risk_sms(to_number, diabetes, heart, kidney, record_id, lang_code="en-US"):
+def twilio_client():
     from twilio.rest import Client
-    
-    sid = app.config["TWILIO_ACCOUNT_SID"]
-    token = app.config["TWILIO_AUTH_TOKEN"]
-    from_number = app.config["TWILIO_PHONE_NUMBER"]
+    return Client(app.config["TWILIO_ACCOUNT_SID"], app.config["TWILIO_AUTH_TOKEN"])
+
+# Alerts go out from background workers that share one Twilio client
+sms_dispatcher = SmsDispatcher(
+    twilio_client,
+    from_number=app.config["TWILIO_PHONE_NUMBER"],
+    url_file=app.config["PUBLIC_URL_FILE"],
+    workers=app.config["SMS_WORKERS"],
+    retries=app.config["SMS_RETRIES"],
+    backoff=app.config["SMS_BACKOFF"],
+    coalesce_window=app.config["SMS_COALESCE_WINDOW"]
+)
 
-    if sid == "YOUR_TWILIO_SID":
+def send_risk_sms(to_number, diabetes, heart, kidney, record_id, lang_code="en-US"):
+    if app.config["TWILIO_ACCOUNT_SID"] == "YOUR_TWILIO_SID":
+        metrics.sms_alerts.inc(outcome="skipped")
         print("Twilio not configured. Skipping SMS.")
         return
 
-    try:
-        client = Client(sid, token)
-        
-        risks = []
-        if diabetes > 70: risks.append(f"Diabetes ({int(diabetes)}%)")
-        if heart > 70: risks.append(f"Heart ({int(heart)}%)")
-        if kidney > 70: risks.append(f"Kidney ({int(kidney)}%)")
-        
-        # Link to the public report (Dynamic URL)
-        try:
-            with open("public_url.txt", "r") as f:
-                base_url = f.read().strip()
-        except FileNotFoundError:
-            base_url = "http://localhost:5000"
-
-        report_link = f"{base_url}/report/{record_id}"
-        
-        if lang_code == "hi-IN":
-            msg_body = f"हीलिक्स एआई अलर्ट: उच्च स्वास्थ्य जोखिम का पता चला है: {', '.join(risks)}। रिपोर्ट देखें: {report_link}"
-        elif lang_code == "te-IN":
-            msg_body = f"హీలిక్స్ AI అలర్ట్: అధిక ఆరోగ్య ప్రమాదం గుర్తించబడింది: {', '.join(risks)}. రిపోర్ట్ చూడండి: {report_link}"
-        else:
-            msg_body = f"HEALIX AI ALERT: High health risk detected: {', '.join(risks)}. View Report: {report_link}"
-        
-        message = client.messages.create(
-            body=msg_body,
-            from_=from_number,
-            to=to_number
-        )
-        print(f"SMS sent to {to_number}: {message.sid}")
-    except Exception as e:
-        print(f"Failed to send SMS: {e}")
+    bundle = localization.get(lang_code)
+    risk_item = bundle["templates"]["sms_risk"]
+    risks = [
+        risk_item(name=bundle["risk_names"][name], value=int(value))
+        for name, value in (("diabetes", diabetes), ("heart", heart), ("kidney", kidney))
+        if value > app.config["RISK_ALERT_THRESHOLD"]
+    ]
+    
+    # Link to the public report (Dynamic URL)
+    with metrics.timer("send_risk_sms", "public_url"):
+        report_link = f"{sms_dispatcher.public_url()}/report/{record_id}"
+    
+    msg_body = bundle["templates"]["sms_alert"](risks=", ".join(risks), link=report_link)
+    
+    # Queued, not sent inline: retries and delivery happen off the request path
+    with metrics.timer("send_risk_sms", "enqueue"):
+        queued = sms_dispatcher.enqueue(to_number, msg_body)
+    metrics.sms_alerts.inc(outcome="queued" if queued else "coalesced")
 
 # ---------------- REPORT GENERATION ----------------
 
 @app.route("/download_report", methods=["POST"])
 def download_report():
-    from reportlab.lib.pagesizes import letter
-    from reportlab.pdfgen import canvas
-    from reportlab.lib import colors
     import io
 
-    data = request.json
-    buffer = io.BytesIO()
-    c = canvas.Canvas(buffer, pagesize=letter)
-    width, height = letter
-
-    # Title
-    c.setFont("Helvetica-Bold", 24)
-    c.setFillColor(colors.darkgreen)
-    c.drawString(50, height - 50, "HEALIX AI – Health Report")
-
-    # User Info
-    c.setFont("Helvetica", 12)
-    c.setFillColor(colors.black)
-    c.drawString(50, height - 100, f"User: {session.get('user', 'Guest')}")
-    c.drawString(50, height - 120, "Date: " + str(db.func.now()))
-
-    # Health Metrics
-    y = height - 160
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, y, "Health Metrics Used:")
-    y -= 25
-    c.setFont("Helvetica", 12)
-    
-    metrics = data.get("estimates", {})
-    c.drawString(70, y, f"Age: {metrics.get('age', 'N/A')}")
-    c.drawString(250, y, f"BMI: {metrics.get('bmi', 'N/A')}")
-    y -= 20
-    c.drawString(70, y, f"Glucose: {metrics.get('glucose', 'N/A')} mg/dL")
-    c.drawString(250, y, f"Blood Pressure: {metrics.get('bp', 'N/A')} mmHg")
-    y -= 20
-    c.drawString(70, y, f"Cholesterol: {metrics.get('chol', 'N/A')} mg/dL")
-    c.drawString(250, y, f"Max Heart Rate: {metrics.get('max_heart_rate', 'N/A')} bpm")
-
-    # Risk Analysis
-    y -= 50
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, y, "Risk Analysis Results:")
-    y -= 30
-
-    # Draw Boxes for Risks
-    def draw_risk_box(x, y, title, risk):
-        c.setStrokeColor(colors.grey)
-        c.setFillColor(colors.whitesmoke)
-        c.rect(x, y-40, 150, 50, fill=1)
-        c.setFillColor(colors.black)
-        c.setFont("Helvetica-Bold", 12)
-        c.drawCentredString(x + 75, y - 15, title)
-        c.setFillColor(colors.red if risk > 50 else colors.green)
-        c.setFont("Helvetica-Bold", 14)
-        c.drawCentredString(x + 75, y - 35, f"{risk}%")
-
-    draw_risk_box(50, y, "Diabetes Risk", data.get("diabetes", 0))
-    draw_risk_box(220, y, "Heart Risk", data.get("heart", 0))
-    draw_risk_box(390, y, "Kidney Risk", data.get("kidney", 0))
-
-    # AI Details (Causes, Reduction, Diet)
-    y -= 100
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, y, "Potential Causes:")
-    c.setFont("Helvetica", 11)
-    causes_text = data.get("causes", "N/A")
-    c.drawString(50, y-15, causes_text[:90])
-    if len(causes_text) > 90: c.drawString(50, y-30, causes_text[90:180])
-    
-    y -= 50
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, y, "How to Reduce Risk:")
-    c.setFont("Helvetica", 11)
-    reduction_text = data.get("reduction_steps", "N/A")
-    lines = reduction_text.split('\n')
-    for i, line in enumerate(lines[:3]):
-        c.drawString(50, y - 15 - (i*15), line[:90])
-    
-    y -= 65
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, y, "Recommended Dietary Plan:")
-    c.setFont("Helvetica", 11)
-    diet_text = data.get("diet_plan", "N/A")
-    c.drawString(50, y-15, diet_text[:90])
-    if len(diet_text) > 90: c.drawString(50, y-30, diet_text[90:180])
-
-    y -= 50
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, y, "General Recommendations:")
-    c.setFont("Helvetica", 11)
-    rec_text = data.get("recommendation", "N/A")
-    c.drawString(50, y-15, rec_text[:90])
-    if len(rec_text) > 90: c.drawString(50, y-30, rec_text[90:180])
+    with metrics.timer("download_report", "parse"):
+        data = request.json
+    with metrics.timer("download_report", "render_pdf"):
+        pdf = render_report_pdf(data, session.get("user", "Guest"), datetime.now().strftime("%Y-%m-%d %H:%M"),
+                                data.get("language", localization.DEFAULT_LANGUAGE))
+    return flask.send_file(io.BytesIO(pdf), as_attachment=True, download_name="healix_report.pdf", mimetype="application/pdf")
 
-    y -= 60
-    c.setFont("Helvetica-Oblique", 10)
-    c.setFillColor(colors.grey)
-    c.drawString(50, y, "Disclaimer: This is an AI-generated estimate. Please consult a doctor for medical advice.")
+@app.route("/report/<int:id>.pdf")
+def report_pdf(id):
+    record = HealthRecord.query.get_or_404(id)
+    data = {
+        "diabetes": round(record.diabetes or 0),
+        "heart": round(record.heart or 0),
+        "kidney": round(record.kidney or 0),
+        "symptoms": record.symptoms
+    }
+    # Ids restart when the database is recreated, so the key also hashes what the PDF shows
+    fingerprint = cache_key(data, record.username, str(record.created_at))[:16]
+    key = f"report-{id}-{fingerprint}-v{REPORT_TEMPLATE_VERSION}.pdf"
+    path = report_cache.get(key)
+    if path is None:
+        path = report_cache.put(key, render_report_pdf(data, record.username, str(record.created_at)))
 
-    c.save()
-    buffer.seek(0)
+    return flask.send_file(
+        path,
+        mimetype="application/pdf",
+        download_name=f"healix_report_{id}.pdf",
+        conditional=True,
+        etag=key,
+        last_modified=record.created_at,
+        max_age=app.config["REPORT_MAX_AGE"]
+    )
 
-    return flask.send_file(buffer, as_attachment=True, download_name="healix_report.pdf", mimetype="application/pdf")
 
+startup_timings["import"] = time.perf_counter() - _import_start
 
 if __name__ == "__main__":
+    warm_up()
     # Host on 0.0.0.0 and use PORT from environment if available (required for Render/Railway)
     port = int(os.environ.get("PORT", 5000))
     app.run(host='0.0.0.0', port=port, debug=False)
@@ -0,0 +1,62 @@
+"""ASGI entry point: one process holds hundreds of in-flight requests.
+
+    uvicorn asgi:application --host 0.0.0.0 --port 5000
+
+Under gunicorn's sync workers a request waiting on OpenAI pins a whole
+process. Here the event loop only parks the connection while the Flask app
+runs on one of at most ASGI_THREADS threads, so a slow LLM call costs one
+idle thread. SMS sends already happen on the dispatcher's workers, and DB
+writes are batched by the group-commit writer under the production profile.
+"""
+import asyncio
+import os
+
+from asgiref.sync import ThreadSensitiveContext
+from asgiref.wsgi import WsgiToAsgi
+
+# Hundreds of concurrent predictions need more LLM slots than the sync-worker defaults
+os.environ.setdefault("LLM_MAX_CONCURRENT", "64")
+os.environ.setdefault("LLM_MAX_WAITING", "512")
+# Waiting on a stream is cheap here, so the dashboard may use SSE for advice
+os.environ.setdefault("ADVICE_STREAMING", "1")
+
+from app import app, warm_up
+
+ASGI_THREADS = int(os.getenv("ASGI_THREADS", 256))
+
+class Application(WsgiToAsgi):
+    """Flask app as ASGI, with at most `threads` WSGI calls running at once.
+
+    WsgiToAsgi runs every WSGI call on one shared thread unless it is inside a
+    ThreadSensitiveContext, which gives the request a thread of its own. The
+    semaphore bounds those threads: requests beyond `threads` wait on the
+    event loop without holding one. Lifespan startup warms the models, DB and
+    OpenAI client before traffic.
+    """
+
+    def __init__(self, wsgi_application, threads=ASGI_THREADS):
+        super().__init__(wsgi_application)
+        self.threads = threads
+        self._slots = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+            return
+        if self._slots is None:
+            # Created on first use so it belongs to the server's event loop
+            self._slots = asyncio.Semaphore(self.threads)
+        async with self._slots, ThreadSensitiveContext():
+            await super().__call__(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await asyncio.get_running_loop().run_in_executor(None, warm_up)
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+application = Application(app)
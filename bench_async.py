@@ -0,0 +1,143 @@
+"""Sync gunicorn workers vs. the ASGI server under many slow LLM calls.
+
+Every request is a /predict with narrative text, so each one waits on the
+stubbed OpenAI call (--llm-latency). The sync deployment can only have
+--workers of them in flight; the ASGI one up to its thread pool size.
+
+    python bench_async.py [--concurrency 200] [--duration 10] [--llm-latency 1.0] [--workers 4] [--out results.json]
+
+Both servers run the production profile (WAL + group commit) on their own
+throwaway SQLite database. Prints requests/sec and p50/p95/p99 per mode as JSON.
+"""
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+from bench_routes import free_port, git_commit, summarize, wait_ready
+
+def make_asgi_app():
+    # uvicorn --factory entry point; asgi must be imported before app so its LLM limits apply
+    import asgi
+    from bench_routes import make_app
+    make_app()
+    return asgi.application
+
+def start_server(mode, args):
+    port = free_port()
+    workdir = tempfile.mkdtemp(prefix=f"healix-{mode}-")
+    env = dict(
+        os.environ,
+        HEALIX_PROFILE="production",
+        DATABASE_URL="sqlite:///" + os.path.join(workdir, "bench.db"),
+        REPORT_CACHE_DIR=os.path.join(workdir, "report_cache"),
+        PUBLIC_URL_FILE=os.path.join(workdir, "public_url.txt"),
+        BENCH_LLM_LATENCY=str(args.llm_latency),
+        BENCH_SMS_LATENCY="0"
+    )
+    if mode == "sync":
+        command = [
+            sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "-w", str(args.workers),
+            "-b", f"127.0.0.1:{port}", "bench_routes:make_app()"
+        ]
+    else:
+        env["ASGI_THREADS"] = str(args.threads)
+        command = [
+            sys.executable, "-m", "uvicorn", "--factory", "bench_async:make_asgi_app",
+            "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--backlog", "4096"
+        ]
+    proc = subprocess.Popen(command, env=env, stdout=sys.stderr)
+
+    def stop():
+        proc.terminate()
+        proc.wait(timeout=30)
+
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_ready(base_url, proc)
+    except Exception:
+        stop()
+        raise
+    return base_url, stop
+
+def drive(base_url, concurrency, duration):
+    # Each client keeps one request in flight; unique messages defeat the LLM cache and single-flight
+    counter = itertools.count()
+    samples, errors = [], []
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client():
+        session = requests.Session()
+        while time.monotonic() < stop_at:
+            payload = {
+                "message": f"I have been worried about my health and energy lately, note {next(counter)}",
+                "age": 52, "bmi": 29, "bp": 135, "glucose": 140
+            }
+            start = time.perf_counter()
+            try:
+                ok = session.post(f"{base_url}/predict", json=payload, timeout=120).ok
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                (samples if ok else errors).append(elapsed)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # Requests still in flight at the deadline finish late; rate over the real elapsed time
+    return summarize(samples, len(errors), time.monotonic() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="seconds per stubbed OpenAI call")
+    parser.add_argument("--workers", type=int, default=4, help="sync gunicorn workers")
+    parser.add_argument("--threads", type=int, default=256, help="ASGI thread pool size")
+    parser.add_argument("--modes", default="sync,asgi")
+    parser.add_argument("--out", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    results = {}
+    with contextlib.redirect_stdout(sys.stderr):
+        for mode in args.modes.split(","):
+            base_url, stop = start_server(mode, args)
+            try:
+                results[mode] = drive(base_url, args.concurrency, args.duration)
+            finally:
+                stop()
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "settings": {
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "llm_latency": args.llm_latency,
+            "sync_workers": args.workers,
+            "asgi_threads": args.threads
+        },
+        "results": results
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+
+if __name__ == "__main__":
+    main()
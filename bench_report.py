@@ -0,0 +1,47 @@
+"""Requests/sec for the public /report/<id> page: uncached, cached and revalidated (304).
+
+Runs in-process against a throwaway SQLite database:
+
+    python bench_report.py [requests]
+"""
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+warnings.filterwarnings("ignore")
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+
+from app import app, report_page_cache, init_db
+from database import db, HealthRecord
+
+def run(label, client, path, n, headers=None, before=None):
+    start = time.perf_counter()
+    for _ in range(n):
+        if before:
+            before()
+        response = client.get(path, headers=headers or {})
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {n / elapsed:>10.0f} req/s   ({response.status_code}, {len(response.data)} bytes)")
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    # The schema is created lazily on first request; the seed insert comes before that
+    init_db()
+    with app.app_context():
+        record = HealthRecord(username="bench", symptoms="Thirst and fatigue", diabetes=82.5, heart=41.0, kidney=12.3)
+        db.session.add(record)
+        db.session.commit()
+        path = f"/report/{record.id}"
+
+    client = app.test_client()
+    run("uncached", client, path, n, before=report_page_cache.clear)
+
+    etag = client.get(path).headers["ETag"]
+    run("cached", client, path, n)
+    run("revalidate", client, path, n, headers={"If-None-Match": etag})
+
+if __name__ == "__main__":
+    main()
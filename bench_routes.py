@@ -0,0 +1,348 @@
+"""Mixed-workload load test for the main routes, with latency percentiles as JSON.
+
+OpenAI and Twilio are replaced by deterministic stubs with fixed latency, so
+runs are comparable across commits (the dummy-key mock path picks random
+symptoms and would skew them). Each run uses a throwaway SQLite database.
+
+    python bench_routes.py [--duration 10] [--concurrency 8] [--mix predict=5,history=2,report=2,download_report=1]
+                           [--llm-latency 0.2] [--sms-latency 0.1] [--server inprocess|gunicorn] [--out results.json]
+
+The in-process server is werkzeug's threaded server; `--server gunicorn`
+starts `gunicorn -c gunicorn.conf.py "bench_routes:make_app()"` instead.
+Per route it reports requests, errors, requests/sec and p50/p95/p99/max in ms.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+import requests
+
+ROUTES = ("predict", "download_report", "history", "report")
+ROUTE_LABELS = {
+    "predict": "POST /predict",
+    "download_report": "POST /download_report",
+    "history": "GET /history",
+    "report": "GET /report/<id>"
+}
+
+MESSAGES = [
+    "I feel very thirsty and tired all the time",
+    "Chest pain when climbing stairs and short of breath",
+    "My legs are swollen and my urine looks foamy",
+    "Blurred vision and cuts that heal slowly",
+    "Dizzy spells and a racing heart at night",
+    "मुझे बहुत प्यास लग रही है और थकान महसूस हो रही है",
+    "నాకు ఛాతీ నొప్పి మరియు అలసటగా ఉంది"
+]
+
+# Fixed LLM answer: every symptom flag, advice field and AI risk the app reads
+STUB_LLM_RESPONSE = json.dumps({
+    "thirst": 1, "urination": 1, "fatigue": 1, "chest_pain": 0, "dizziness": 0,
+    "obesity": 1, "blurred_vision": 0, "slow_healing": 0, "numbness": 0,
+    "breath_shortness": 0, "swollen_legs": 0, "palpitations": 0,
+    "foamy_urine": 0, "itchy_skin": 0, "muscle_cramps": 0,
+    "recommendation": "Schedule a checkup and reduce sugar intake.",
+    "future_risks": "Type 2 diabetes if untreated.",
+    "precautions": "1. Walk daily.\n2. Cut sugary drinks.\n3. Check glucose monthly.",
+    "causes": "Diet and low activity.",
+    "reduction_steps": "1. Exercise.\n2. Diet changes.\n3. Follow-up tests.",
+    "diet_plan": "Whole grains, vegetables and lean protein.",
+    "diabetes_risk": 78, "heart_risk": 35, "kidney_risk": 20
+})
+
+# ---------------- STUBS ----------------
+
+class StubOpenAI:
+    # Just enough of openai.OpenAI for ask_ai(): chat.completions.create(...)
+    api_key = "bench-key"
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        message = SimpleNamespace(content=STUB_LLM_RESPONSE)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+class StubTwilio:
+    # Just enough of twilio.rest.Client for SmsDispatcher: messages.create(...)
+    def __init__(self, latency):
+        self.latency = latency
+        self.sent = 0
+        self.messages = self
+
+    def create(self, body, from_, to):
+        time.sleep(self.latency)
+        self.sent += 1
+        return SimpleNamespace(sid=f"SMbench{self.sent}")
+
+def install_stubs(app_module, llm_latency, sms_latency):
+    app_module.client = StubOpenAI(llm_latency)
+    app_module.app.config["TWILIO_ACCOUNT_SID"] = "bench"
+    dispatcher = app_module.sms_dispatcher
+    dispatcher.client_factory = lambda: StubTwilio(sms_latency)
+    dispatcher._client = None
+    # Every alert reaches the stub, so SMS cost is part of the measurement
+    dispatcher.coalesce_window = 0
+
+def make_app():
+    # gunicorn entry point: "bench_routes:make_app()"; settings come from BENCH_* env vars
+    import app as app_module
+    install_stubs(
+        app_module,
+        float(os.getenv("BENCH_LLM_LATENCY", 0.2)),
+        float(os.getenv("BENCH_SMS_LATENCY", 0.1))
+    )
+    return app_module.app
+
+# ---------------- SERVERS ----------------
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def wait_ready(base_url, proc, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server exited with status {proc.returncode} before becoming ready")
+        try:
+            if requests.get(f"{base_url}/readyz", timeout=2).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} not ready after {timeout}s")
+
+def start_inprocess(args):
+    from werkzeug.serving import make_server
+
+    import app as app_module
+    install_stubs(app_module, args.llm_latency, args.sms_latency)
+    app_module.warm_up()
+    server = make_server("127.0.0.1", 0, app_module.app, threaded=True)
+    threading.Thread(target=server.serve_forever, name="bench-server", daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", server.shutdown
+
+def start_gunicorn(args):
+    port = free_port()
+    env = dict(os.environ, BENCH_LLM_LATENCY=str(args.llm_latency), BENCH_SMS_LATENCY=str(args.sms_latency))
+    proc = subprocess.Popen([
+        sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+        "-w", str(args.workers), "--threads", str(args.threads),
+        "-b", f"127.0.0.1:{port}", "bench_routes:make_app()"
+    ], env=env)
+
+    def stop():
+        proc.terminate()
+        proc.wait(timeout=30)
+
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_ready(base_url, proc)
+    except Exception:
+        stop()
+        raise
+    return base_url, stop
+
+# ---------------- WORKLOAD ----------------
+
+def predict_payload(rng):
+    return {
+        "message": rng.choice(MESSAGES),
+        "language": rng.choice(["en-US", "hi-IN", "te-IN"]),
+        "age": rng.randint(25, 75),
+        "bmi": rng.randint(20, 38),
+        "bp": rng.randint(110, 170),
+        "glucose": rng.randint(80, 220),
+        "chol": rng.randint(160, 280),
+        "max_heart_rate": rng.randint(100, 180),
+        "questionnaire": {"thirst": rng.randint(0, 1), "fatigue": rng.randint(0, 1)}
+    }
+
+REPORT_PAYLOAD = {
+    "diabetes": 78, "heart": 35, "kidney": 20,
+    "symptoms": "Thirst and fatigue",
+    "recommendation": "Schedule a checkup and reduce sugar intake.",
+    "diet_plan": "Whole grains, vegetables and lean protein."
+}
+
+class Worker:
+    """One simulated user: its own login session, RNG and latency samples."""
+
+    def __init__(self, base_url, index, seed, weights):
+        self.base_url = base_url
+        self.rng = random.Random(seed + index)
+        self.routes = [r for r in ROUTES if weights.get(r)]
+        self.weights = [weights[r] for r in self.routes]
+        self.session = requests.Session()
+        self.username = f"bench{index}"
+        self.report_ids = []
+        self.samples = {r: [] for r in ROUTES}
+        self.errors = {r: 0 for r in ROUTES}
+
+    def login(self):
+        account = {"username": self.username, "password": "bench", "phone": f"+1555000{self.username[5:]:>04}"}
+        self.session.post(f"{self.base_url}/register", data=account, allow_redirects=False)
+        response = self.session.post(f"{self.base_url}/login", data=account, allow_redirects=False)
+        response.raise_for_status()
+        # Seed a record so /report/<id> and /history have something to render from the start
+        response = self.session.post(f"{self.base_url}/predict", json=predict_payload(self.rng))
+        response.raise_for_status()
+        self.report_ids.append(response.json()["record_id"])
+
+    def request(self, route):
+        if route == "predict":
+            response = self.session.post(f"{self.base_url}/predict", json=predict_payload(self.rng))
+            if response.ok:
+                self.report_ids.append(response.json()["record_id"])
+                del self.report_ids[:-100]
+            return response
+        if route == "download_report":
+            return self.session.post(f"{self.base_url}/download_report", json=REPORT_PAYLOAD)
+        if route == "history":
+            return self.session.get(f"{self.base_url}/history")
+        return self.session.get(f"{self.base_url}/report/{self.rng.choice(self.report_ids)}")
+
+    def run(self, warmup_until, stop_at):
+        while True:
+            route = self.rng.choices(self.routes, self.weights)[0]
+            start = time.perf_counter()
+            try:
+                ok = self.request(route).ok
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - start
+            now = time.monotonic()
+            if now >= stop_at:
+                return
+            if now < warmup_until:
+                continue
+            if ok:
+                self.samples[route].append(elapsed)
+            else:
+                self.errors[route] += 1
+
+def summarize(samples, errors, seconds):
+    import numpy as np
+
+    result = {"requests": len(samples) + errors, "errors": errors, "rps": round(len(samples) / seconds, 1)}
+    if samples:
+        ms = np.array(samples) * 1000
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        result.update(
+            p50_ms=round(float(p50), 2),
+            p95_ms=round(float(p95), 2),
+            p99_ms=round(float(p99), 2),
+            mean_ms=round(float(ms.mean()), 2),
+            max_ms=round(float(ms.max()), 2)
+        )
+    return result
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def parse_mix(text):
+    weights = {}
+    for part in text.split(","):
+        route, _, weight = part.partition("=")
+        if route.strip() not in ROUTES:
+            raise argparse.ArgumentTypeError(f"Unknown route {route!r}; expected one of {', '.join(ROUTES)}")
+        weights[route.strip()] = float(weight or 1)
+    return weights
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--duration", type=float, default=10, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=2, help="seconds of load before measuring")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("predict=5,history=2,report=2,download_report=1"))
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="seconds per stubbed OpenAI call")
+    parser.add_argument("--sms-latency", type=float, default=0.1, help="seconds per stubbed Twilio call")
+    parser.add_argument("--server", choices=["inprocess", "gunicorn"], default="inprocess")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn workers")
+    parser.add_argument("--threads", type=int, default=4, help="gunicorn threads per worker")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    # Throwaway database and report cache, shared with gunicorn workers through the environment
+    workdir = tempfile.mkdtemp(prefix="healix-bench-")
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(workdir, "bench.db")
+    os.environ["REPORT_CACHE_DIR"] = os.path.join(workdir, "report_cache")
+    os.environ["PUBLIC_URL_FILE"] = os.path.join(workdir, "public_url.txt")
+
+    import warnings
+    warnings.filterwarnings("ignore")
+
+    # The app's own prints go to stderr so stdout is only the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        start_server = start_gunicorn if args.server == "gunicorn" else start_inprocess
+        base_url, stop_server = start_server(args)
+        try:
+            workers = [Worker(base_url, i, args.seed, args.mix) for i in range(args.concurrency)]
+            for worker in workers:
+                worker.login()
+
+            warmup_until = time.monotonic() + args.warmup
+            stop_at = warmup_until + args.duration
+            threads = [threading.Thread(target=w.run, args=(warmup_until, stop_at)) for w in workers]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            stop_server()
+
+    routes = {}
+    for route in ROUTES:
+        if args.mix.get(route):
+            samples = [s for w in workers for s in w.samples[route]]
+            errors = sum(w.errors[route] for w in workers)
+            routes[ROUTE_LABELS[route]] = summarize(samples, errors, args.duration)
+
+    all_samples = [s for w in workers for r in ROUTES for s in w.samples[r]]
+    all_errors = sum(sum(w.errors.values()) for w in workers)
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "settings": {
+            "server": args.server,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "mix": args.mix,
+            "llm_latency": args.llm_latency,
+            "sms_latency": args.sms_latency,
+            "seed": args.seed,
+            **({"workers": args.workers, "threads": args.threads} if args.server == "gunicorn" else {})
+        },
+        "routes": routes,
+        "total": summarize(all_samples, all_errors, args.duration)
+    }
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    print(output)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Fingerprint and precompress everything in static/ into static/dist/.
+
+    python build_assets.py [--static static] [--quiet]
+
+Each file becomes dist/<name>.<hash>.<ext> plus .gz and .br copies (brotli
+only if the `brotli` package is installed), and dist/manifest.json maps
+the source name to the hashed one for asset_url(). The hash changes when
+the content does, so the app serves these URLs as immutable. Outputs that
+already exist are left alone, so rebuilding is cheap and safe to run from
+every worker; hashed files from older builds are kept for pages still
+cached in browsers.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DIST = "dist"
+MANIFEST = "manifest.json"
+
+# Text formats worth compressing; images and fonts are already compressed
+COMPRESSIBLE = (".css", ".js", ".svg", ".json", ".txt", ".html", ".map")
+
+def write_atomic(path, data):
+    # Concurrent builders never see (or serve) a half-written file
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def hashed_name(name, data):
+    root, ext = os.path.splitext(name)
+    return f"{root}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+
+def build(static_dir="static"):
+    """Build static_dir/dist and return the manifest {source name: "dist/<hashed name>"}."""
+    out_dir = os.path.join(static_dir, DIST)
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {}
+
+    for root, dirs, files in os.walk(static_dir):
+        if os.path.abspath(root) == os.path.abspath(static_dir):
+            dirs[:] = [d for d in dirs if d != DIST]
+        for filename in sorted(files):
+            source = os.path.join(root, filename)
+            name = os.path.relpath(source, static_dir).replace(os.sep, "/")
+            with open(source, "rb") as f:
+                data = f.read()
+
+            target_name = hashed_name(name, data)
+            target = os.path.join(out_dir, target_name)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            variants = {"": lambda: data}
+            if filename.endswith(COMPRESSIBLE):
+                # mtime=0 keeps the .gz byte-identical across builds
+                variants[".gz"] = lambda: gzip.compress(data, compresslevel=9, mtime=0)
+                if brotli is not None:
+                    variants[".br"] = lambda: brotli.compress(data, quality=11)
+            for suffix, compress in variants.items():
+                if not os.path.exists(target + suffix):
+                    write_atomic(target + suffix, compress())
+
+            manifest[name] = f"{DIST}/{target_name}"
+
+    write_atomic(os.path.join(out_dir, MANIFEST), json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))
+    return manifest
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--static", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "static"))
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args()
+
+    manifest = build(args.static)
+    if brotli is None:
+        print("brotli not installed: only gzip copies were written")
+    if not args.quiet:
+        for name, path in manifest.items():
+            target = os.path.join(args.static, path)
+            sizes = ", ".join(
+                f"{suffix or 'raw'} {os.path.getsize(target + suffix)}B"
+                for suffix in ("", ".gz", ".br") if os.path.exists(target + suffix)
+            )
+            print(f"{name} -> {path} ({sizes})")
+
+if __name__ == "__main__":
+    main()
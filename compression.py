@@ -0,0 +1,37 @@
+import gzip
+import re
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Text responses worth compressing; PDFs, images and precompressed assets are left alone
+COMPRESSIBLE = frozenset({
+    "text/html", "text/plain", "text/css", "text/csv", "text/javascript",
+    "application/json", "application/javascript", "application/x-ndjson", "image/svg+xml"
+})
+
+def negotiate(accept_encodings):
+    # Brotli when both sides support it, else gzip; None means send it as is
+    if brotli is not None and accept_encodings["br"]:
+        return "br"
+    if accept_encodings["gzip"]:
+        return "gzip"
+    return None
+
+def compress(data, encoding, gzip_level=6, brotli_quality=5):
+    if encoding == "br":
+        return brotli.compress(data, quality=brotli_quality)
+    # mtime=0: the same body always compresses to the same bytes
+    return gzip.compress(data, compresslevel=gzip_level, mtime=0)
+
+# Compressed bodies get '"<hash>-gzip"' / '"<hash>-br"' so each encoding keeps a strong ETag
+ENCODED_ETAG = re.compile(r'-(?:gzip|br)"')
+
+def encoded_etag(etag, encoding):
+    return f"{etag}-{encoding}"
+
+def strip_etag_encodings(if_none_match):
+    # Views compare If-None-Match against the plain hash of the uncompressed body
+    return ENCODED_ETAG.sub('"', if_none_match)
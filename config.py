@@ -2,11 +2,129 @@ import os
 
 class Config:
     SECRET_KEY = "healix_secret"
-    SQLALCHEMY_DATABASE_URI = "sqlite:///healix.db"
+    SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///healix.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # PRAGMAs applied to each SQLite connection (none in development)
+    SQLITE_PRAGMAS = {}
+
+    # Batch HealthRecord inserts from concurrent requests into one transaction
+    GROUP_COMMIT = False
+    GROUP_COMMIT_INTERVAL = float(os.getenv("GROUP_COMMIT_INTERVAL", 0.005))
+    GROUP_COMMIT_MAX_BATCH = int(os.getenv("GROUP_COMMIT_MAX_BATCH", 200))
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+    # Max patients accepted by /predict/batch in one request
+    BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", 500))
+
+    # CSV ingest (/ingest and `flask ingest`): rows scored and inserted per transaction, concurrent
+    # uploads processed, how long finished job status is kept, and rejected rows listed per job
+    INGEST_CHUNK_SIZE = int(os.getenv("INGEST_CHUNK_SIZE", 500))
+    INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", 1))
+    INGEST_JOB_TTL = int(os.getenv("INGEST_JOB_TTL", 3600))
+    INGEST_MAX_ERRORS = int(os.getenv("INGEST_MAX_ERRORS", 100))
+
+    # Max grid points (product of all axis lengths) scored by one /predict/whatif request
+    WHATIF_MAX_POINTS = int(os.getenv("WHATIF_MAX_POINTS", 10000))
+
+    # Records per page on /history and /history/records
+    HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", 50))
+    HISTORY_MAX_PAGE_SIZE = int(os.getenv("HISTORY_MAX_PAGE_SIZE", 200))
+
+    # /history/export: rows fetched and written per chunk, and usernames allowed to export
+    # other users' records and view /analytics (comma-separated)
+    EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 1000))
+    CLINICIANS = frozenset(u.strip() for u in os.getenv("CLINICIANS", "").split(",") if u.strip())
+
+    # Risk percentage above which /predict sends an SMS alert and analytics counts a user as high risk
+    RISK_ALERT_THRESHOLD = float(os.getenv("RISK_ALERT_THRESHOLD", 70))
+
+    # /analytics: seconds a computed summary is served before it's rebuilt, and weeks of weekly counts
+    ANALYTICS_REFRESH = int(os.getenv("ANALYTICS_REFRESH", 300))
+    ANALYTICS_WEEKS = int(os.getenv("ANALYTICS_WEEKS", 26))
+    # SQLite file the summary is shared through, so all workers serve the same one (defaults to instance/)
+    ANALYTICS_CACHE_PATH = os.getenv("ANALYTICS_CACHE_PATH")
+
+    # Weight of the newest record in the per-user risk EWMA on /history/summary
+    RISK_EWMA_ALPHA = float(os.getenv("RISK_EWMA_ALPHA", 0.3))
+
+    # LLM response cache (set LLM_CACHE_PATH to a .db file to keep it across restarts)
+    LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", 1024))
+    LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", 3600))
+    LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH")
+
+    # Outbound OpenAI calls: concurrent upstream requests, extra callers allowed to queue, and seconds
+    # a caller waits before /predict falls back to the model-only result
+    LLM_MAX_CONCURRENT = int(os.getenv("LLM_MAX_CONCURRENT", 4))
+    LLM_MAX_WAITING = int(os.getenv("LLM_MAX_WAITING", 16))
+    LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", 15))
+
+    # Read short symptom messages (en/hi/te) and questionnaire-only requests locally instead of
+    # calling the LLM; messages longer than SYMPTOM_MAX_WORDS or less explained than
+    # SYMPTOM_MIN_CONFIDENCE still go to the LLM
+    LOCAL_SYMPTOMS = os.getenv("LOCAL_SYMPTOMS", "1") == "1"
+    SYMPTOM_MIN_CONFIDENCE = float(os.getenv("SYMPTOM_MIN_CONFIDENCE", 0.75))
+    SYMPTOM_MAX_WORDS = int(os.getenv("SYMPTOM_MAX_WORDS", 25))
+
+    # Two-phase /predict: background advice workers and how long results are kept
+    ADVICE_WORKERS = int(os.getenv("ADVICE_WORKERS", 4))
+    ADVICE_JOB_TTL = int(os.getenv("ADVICE_JOB_TTL", 600))
+    ADVICE_STREAM_TIMEOUT = int(os.getenv("ADVICE_STREAM_TIMEOUT", 120))
+    # SSE on /predict/jobs/<id>/events holds a connection until the advice is ready. Under sync
+    # gunicorn workers that is a whole worker, so it's off by default and clients poll instead;
+    # asgi.py turns it on, where an open stream only costs a pool thread.
+    ADVICE_STREAMING = os.getenv("ADVICE_STREAMING", "0") == "1"
+
+    # Server-rendered PDFs for /report/<id>.pdf (defaults to instance/report_cache)
+    REPORT_CACHE_DIR = os.getenv("REPORT_CACHE_DIR")
+    REPORT_CACHE_MAX_BYTES = int(os.getenv("REPORT_CACHE_MAX_BYTES", 50 * 1024 * 1024))
+    REPORT_MAX_AGE = int(os.getenv("REPORT_MAX_AGE", 86400))
+
+    # Per-process cache of username -> profile (phone) for the SMS path and /settings; entries are
+    # dropped on writes in this worker and expire after USER_CACHE_TTL seconds in the others
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 4096))
+    USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", 300))
+
+    # gzip/brotli for text responses of at least COMPRESS_MIN_SIZE bytes (brotli needs the brotli package)
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", 1024))
+    COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", 6))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", 5))
+
+    # Browser cache lifetime for fingerprinted /assets/ files (see build_assets.py)
+    ASSET_MAX_AGE = int(os.getenv("ASSET_MAX_AGE", 365 * 24 * 3600))
+
+    # With several worker processes, each writes its metrics here and /metrics sums them all
+    # (gunicorn.conf.py sets this up); unset means /metrics shows the answering process only
+    METRICS_DIR = os.getenv("METRICS_DIR")
+    METRICS_SHARE_INTERVAL = float(os.getenv("METRICS_SHARE_INTERVAL", 5))
+
+    # Rendered public report pages kept in memory
+    REPORT_PAGE_CACHE_SIZE = int(os.getenv("REPORT_PAGE_CACHE_SIZE", 2048))
+
     # Twilio SMS Configuration
     TWILIO_ACCOUNT_SID = os.getenv("TWILIO_ACCOUNT_SID", "YOUR_TWILIO_SID")
     TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN", "YOUR_TWILIO_TOKEN")
     TWILIO_PHONE_NUMBER = os.getenv("TWILIO_PHONE_NUMBER", "+1234567890")
+
+    # Background SMS queue
+    SMS_WORKERS = int(os.getenv("SMS_WORKERS", 2))
+    SMS_RETRIES = int(os.getenv("SMS_RETRIES", 3))
+    SMS_BACKOFF = float(os.getenv("SMS_BACKOFF", 1.0))
+    SMS_COALESCE_WINDOW = int(os.getenv("SMS_COALESCE_WINDOW", 300))
+
+    # Written by the tunnel start scripts; used for report links in SMS
+    PUBLIC_URL_FILE = os.getenv("PUBLIC_URL_FILE", "public_url.txt")
+
+class ProductionConfig(Config):
+    # Enabled with HEALIX_PROFILE=production; tuned for several gunicorn workers sharing one SQLite file
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", 5000)),
+        "cache_size": -int(os.getenv("SQLITE_CACHE_KB", 20000)),
+        "temp_store": "MEMORY"
+    }
+    GROUP_COMMIT = os.getenv("GROUP_COMMIT", "1") == "1"
+
+def get_config():
+    return ProductionConfig if os.getenv("HEALIX_PROFILE") == "production" else Config
@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+
+# Set before app/config are imported: the tests must never touch a real database or cache,
+# even when the shell exports DATABASE_URL (the fixtures delete every user)
+TEST_DIR = tempfile.mkdtemp(prefix="healix-tests-")
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ["REPORT_CACHE_DIR"] = os.path.join(TEST_DIR, "report_cache")
+os.environ["LLM_CACHE_PATH"] = os.path.join(TEST_DIR, "llm_cache.db")
+os.environ["ANALYTICS_CACHE_PATH"] = os.path.join(TEST_DIR, "analytics_cache.db")
+
+def pytest_unconfigure(config):
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+@pytest.fixture
+def count_queries():
+    from sqlalchemy import event
+    import app as healix
+    from database import db
+
+    @contextmanager
+    def count():
+        # Every statement sent to the database while the block runs
+        statements = []
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        with healix.app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+    return count
+
+@pytest.fixture
+def client(monkeypatch):
+    """Test client with one registered user, "asha"; client.login() signs in and client.sent
+    collects the numbers SMS alerts went to."""
+    import app as healix
+    from database import db
+
+    healix.warm_up()
+    healix.user_cache.clear()
+    with healix.app.app_context():
+        db.session.query(healix.User).delete()
+        db.session.commit()
+    sent = []
+    monkeypatch.setitem(healix.app.config, "TWILIO_ACCOUNT_SID", "test")
+    monkeypatch.setattr(healix.sms_dispatcher, "enqueue", lambda to, body: sent.append(to) or True)
+    client = healix.app.test_client()
+    client.sent = sent
+    client.login = lambda phone="": client.post("/login", data={"username": "asha", "password": "pw", "phone": phone})
+    client.post("/register", data={"username": "asha", "password": "pw", "phone": "+911111111111"})
+    return client
+
+@pytest.fixture
+def high_risk():
+    # Questionnaire-only and maxed-out vitals: scored locally, always above the SMS threshold
+    return {"questionnaire": {"thirst": 1, "chest_pain": 1}, "age": 90, "bmi": 45, "bp": 200,
+            "glucose": 300, "chol": 320, "max_heart_rate": 200}
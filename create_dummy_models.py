@@ -3,12 +3,28 @@ import os
 import shutil
 from sklearn.linear_model import LogisticRegression
 from sklearn.datasets import make_classification
+import sys
+
+# Usage: python create_dummy_models.py [version]
+# Without a version the models are written straight into models/ (version "base").
+# With one they're built in a hidden staging dir and renamed to models/<version> in
+# one step, so a running app's model registry never sees a half-written set.
+VERSION = sys.argv[1] if len(sys.argv) > 1 else None
 
 # Create models directory if it doesn't exist
 MODELS_DIR = "models"
 if not os.path.exists(MODELS_DIR):
     os.makedirs(MODELS_DIR)
 
+FINAL_DIR = MODELS_DIR
+if VERSION:
+    FINAL_DIR = os.path.join(MODELS_DIR, VERSION)
+    if os.path.exists(FINAL_DIR):
+        sys.exit(f"Model version {VERSION} already exists in {FINAL_DIR}")
+    MODELS_DIR = os.path.join(MODELS_DIR, f".staging-{VERSION}")
+    shutil.rmtree(MODELS_DIR, ignore_errors=True)
+    os.makedirs(MODELS_DIR)
+
 # Generate dummy data and train simple models
 # Diabetes Model
 X_diabetes, y_diabetes = make_classification(n_samples=100, n_features=4, random_state=42)
@@ -28,4 +44,7 @@ kidney_model = LogisticRegression()
 kidney_model.fit(X_kidney, y_kidney)
 joblib.dump(kidney_model, os.path.join(MODELS_DIR, "kidney_model.pkl"))
 
-print("Dummy models created successfully in", MODELS_DIR)
+if VERSION:
+    os.rename(MODELS_DIR, FINAL_DIR)
+
+print("Dummy models created successfully in", FINAL_DIR)
@@ -1,4 +1,5 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 db = SQLAlchemy()
 
@@ -16,3 +17,101 @@ class HealthRecord(db.Model):
     heart = db.Column(db.Float)
     kidney = db.Column(db.Float)
     created_at = db.Column(db.DateTime, server_default=db.func.now())
+
+    __table_args__ = (
+        # Serves per-user history in date order and keyset pagination on (created_at, id)
+        db.Index("ix_health_record_username_created_at", "username", "created_at"),
+        # Date-range scans across all users (population analytics)
+        db.Index("ix_health_record_created_at", "created_at"),
+    )
+
+class JobState(db.Model):
+    # Background job status and results, shared by every worker process (see jobs.JobStore)
+    id = db.Column(db.String(32), primary_key=True)
+    queue = db.Column(db.String(20), nullable=False)
+    status = db.Column(db.String(10), nullable=False)
+    result = db.Column(db.Text)  # JSON
+    error = db.Column(db.Text)
+    progress = db.Column(db.Text)  # JSON
+    created_at = db.Column(db.Float, nullable=False)
+    finished_at = db.Column(db.Float, index=True)
+
+def ensure_indexes():
+    # create_all() only builds indexes together with new tables, so add any missing ones to existing databases
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+
+RISKS = ("diabetes", "heart", "kidney")
+
+class RiskSummary(db.Model):
+    # Per-user rollup of HealthRecord risks, updated on every insert so reads are O(1)
+    username = db.Column(db.String(100), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    diabetes_mean = db.Column(db.Float)
+    diabetes_last = db.Column(db.Float)
+    diabetes_min = db.Column(db.Float)
+    diabetes_max = db.Column(db.Float)
+    diabetes_ewma = db.Column(db.Float)
+    heart_mean = db.Column(db.Float)
+    heart_last = db.Column(db.Float)
+    heart_min = db.Column(db.Float)
+    heart_max = db.Column(db.Float)
+    heart_ewma = db.Column(db.Float)
+    kidney_mean = db.Column(db.Float)
+    kidney_last = db.Column(db.Float)
+    kidney_min = db.Column(db.Float)
+    kidney_max = db.Column(db.Float)
+    kidney_ewma = db.Column(db.Float)
+    updated_at = db.Column(db.DateTime, server_default=db.func.now())
+
+    def to_dict(self):
+        summary = {"username": self.username, "count": self.count}
+        for risk in RISKS:
+            summary[risk] = {stat: getattr(self, f"{risk}_{stat}") for stat in ("mean", "last", "min", "max", "ewma")}
+        return summary
+
+def update_risk_summaries(records, alpha=0.3):
+    """Fold new records (objects or dicts with username and the three risks) into RiskSummary.
+
+    Each record is one SQLite upsert whose SET clause does the running-mean,
+    min/max and EWMA arithmetic in SQL, so concurrent workers can't lose each
+    other's updates. Runs in the caller's transaction; the caller commits.
+    """
+    stmt = sqlite_insert(RiskSummary)
+    new = stmt.excluded
+    values = {"count": RiskSummary.count + 1, "updated_at": db.func.now()}
+    for risk in RISKS:
+        x = getattr(new, f"{risk}_last")
+        mean = getattr(RiskSummary, f"{risk}_mean")
+        values[f"{risk}_mean"] = mean + (x - mean) / (RiskSummary.count + 1)
+        values[f"{risk}_last"] = x
+        values[f"{risk}_min"] = db.func.min(getattr(RiskSummary, f"{risk}_min"), x)
+        values[f"{risk}_max"] = db.func.max(getattr(RiskSummary, f"{risk}_max"), x)
+        values[f"{risk}_ewma"] = alpha * x + (1 - alpha) * getattr(RiskSummary, f"{risk}_ewma")
+    stmt = stmt.on_conflict_do_update(index_elements=[RiskSummary.username], set_=values)
+
+    params = []
+    for record in records:
+        get = record.get if isinstance(record, dict) else lambda k: getattr(record, k)
+        row = {"username": get("username"), "count": 1}
+        for risk in RISKS:
+            x = float(get(risk) or 0)
+            for stat in ("mean", "last", "min", "max", "ewma"):
+                row[f"{risk}_{stat}"] = x
+        params.append(row)
+    if params:
+        db.session.execute(stmt, params)
+
+def rebuild_risk_summaries(alpha=0.3, chunk_size=1000):
+    # One-off backfill from existing HealthRecord rows, oldest first
+    RiskSummary.query.delete()
+    query = HealthRecord.query.order_by(HealthRecord.created_at, HealthRecord.id)
+    batch = []
+    for record in query.yield_per(chunk_size):
+        batch.append({"username": record.username, **{risk: getattr(record, risk) for risk in RISKS}})
+        if len(batch) >= chunk_size:
+            update_risk_summaries(batch, alpha)
+            batch = []
+    update_risk_summaries(batch, alpha)
+    db.session.commit()
@@ -0,0 +1,38 @@
+# Used by the Procfile: gunicorn -c gunicorn.conf.py app:app
+import os
+import shutil
+import tempfile
+
+# Each worker has its own metrics; they meet in this directory so /metrics covers all of them
+# (set before the app is imported, since Config reads it at import time)
+_own_metrics_dir = not os.getenv("METRICS_DIR")
+if _own_metrics_dir:
+    os.environ["METRICS_DIR"] = tempfile.mkdtemp(prefix="healix-metrics-")
+
+# Import the app in the master so workers fork with the models already in memory
+# and share those pages copy-on-write (MODEL_MMAP=1 maps the weight arrays from disk too).
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+def when_ready(server):
+    # Runs in the master after the app is imported and before any worker is forked
+    if preload_app:
+        import models_loader
+        model_set = models_loader.registry.load()
+        server.log.info(f"Preloaded model version {model_set.version}")
+
+def post_worker_init(worker):
+    # Warm each worker (models, DB schema, OpenAI client) before it accepts traffic,
+    # so /readyz only reports ready once the first request will be fast.
+    from app import warm_up
+    warm_up()
+
+def child_exit(server, worker):
+    # A dead worker's counts drop out; Prometheus's rate() reads that as a counter reset
+    try:
+        os.remove(os.path.join(os.environ["METRICS_DIR"], f"{worker.pid}.json"))
+    except OSError:
+        pass
+
+def on_exit(server):
+    if _own_metrics_dir:
+        shutil.rmtree(os.environ["METRICS_DIR"], ignore_errors=True)
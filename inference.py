@@ -0,0 +1,89 @@
+import numpy as np
+
+# Shared feature vector, in the order every row is built
+FEATURE_KEYS = ["age", "bmi", "bp", "glucose", "chol", "max_heart_rate"]
+
+# Columns each pickled model was trained on, in order
+MODEL_FEATURES = {
+    "diabetes": ["age", "bmi", "bp", "glucose"],
+    "heart": ["age", "bp", "chol", "max_heart_rate"],
+    "kidney": ["age", "bp", "glucose", "chol"]
+}
+
+def _linear_params(model, n_features):
+    # Only binary logistic regressions reduce to sigmoid(x.w + b); anything else falls back
+    from sklearn.linear_model import LogisticRegression
+    if not isinstance(model, LogisticRegression):
+        return None
+    coef = getattr(model, "coef_", None)
+    intercept = getattr(model, "intercept_", None)
+    if coef is None or intercept is None or len(getattr(model, "classes_", [])) != 2:
+        return None
+    if coef.shape != (1, n_features):
+        return None
+    return coef[0], intercept[0]
+
+class RiskEngine:
+    """Runs all risk models as one stacked matrix multiply plus sigmoid.
+
+    Weights are pulled out of the fitted estimators once, laid out against the
+    shared FEATURE_KEYS vector (zeros for columns a model doesn't use). Models
+    that can't be compiled are scored with their own predict_proba instead.
+    """
+
+    def __init__(self, models):
+        # Same sigmoid sklearn's LogisticRegression uses, so results match predict_proba
+        from scipy.special import expit
+        self._expit = expit
+        self.names = list(models)
+        self.weights = np.zeros((len(FEATURE_KEYS), len(self.names)))
+        self.bias = np.zeros(len(self.names))
+        self.fallback = {}
+
+        for i, name in enumerate(self.names):
+            cols = [FEATURE_KEYS.index(k) for k in MODEL_FEATURES[name]]
+            params = _linear_params(models[name], len(cols))
+            if params is None:
+                self.fallback[name] = (i, cols, models[name])
+                continue
+            coef, intercept = params
+            self.weights[cols, i] = coef
+            self.bias[i] = intercept
+
+    def predict(self, X):
+        # X: (n, len(FEATURE_KEYS)) -> (n, len(names)) probabilities of the positive class
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        probs = self._expit(X @ self.weights + self.bias)
+
+        for i, cols, model in self.fallback.values():
+            probs[:, i] = model.predict_proba(X[:, cols])[:, 1]
+        return probs
+
+    def predict_rows(self, rows):
+        # Feature dicts -> one array of risk percentages per model
+        X = np.array([[row[k] for k in FEATURE_KEYS] for row in rows], dtype=float)
+        probs = self.predict(X) * 100
+        return {name: probs[:, i] for i, name in enumerate(self.names)}
+
+    def predict_one(self, features):
+        probs = self.predict([features[k] for k in FEATURE_KEYS])[0] * 100
+        return {name: float(probs[i]) for i, name in enumerate(self.names)}
+
+    def sweep(self, features, axes):
+        """Risk percentages over every combination of `axes` values, the rest held at `features`.
+
+        `axes` maps feature names to 1-D value sequences. The grid is built
+        with np.meshgrid and scored in one predict() call; each returned array
+        has one dimension per axis, in `axes` order.
+        """
+        names = list(axes)
+        grids = np.meshgrid(*(np.asarray(axes[k], dtype=float) for k in names), indexing="ij")
+        shape = grids[0].shape
+        X = np.tile(np.array([features[k] for k in FEATURE_KEYS], dtype=float), (grids[0].size, 1))
+        for name, grid in zip(names, grids):
+            X[:, FEATURE_KEYS.index(name)] = grid.ravel()
+        probs = self.predict(X) * 100
+        return {name: probs[:, i].reshape(shape) for i, name in enumerate(self.names)}
@@ -0,0 +1,148 @@
+import csv
+import time
+
+from database import db, HealthRecord, update_risk_summaries
+
+# Plausible ranges for camp measurements; anything outside is a typo or unit mix-up
+FEATURE_RANGES = {
+    "age": (1, 120),
+    "bmi": (10, 80),
+    "bp": (50, 260),
+    "glucose": (20, 600),
+    "chol": (50, 600),
+    "max_heart_rate": (40, 250)
+}
+
+class IngestProgress:
+    """Counters for one file. Only the ingesting thread writes them; status requests read them."""
+
+    def __init__(self, source, max_errors=100):
+        self.source = source
+        self.max_errors = max_errors
+        self.status = "running"
+        self.rows_read = 0
+        self.rows_written = 0
+        self.rows_rejected = 0
+        self.chunks = 0
+        self.errors = []
+        self.error = None
+        self.model_version = None
+        self.started_at = time.time()
+        self.finished_at = None
+
+    def reject(self, line, reason):
+        self.rows_rejected += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "error": reason})
+
+    def rows_per_second(self):
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        return self.rows_read / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self):
+        return {
+            "source": self.source,
+            "status": self.status,
+            "rows_read": self.rows_read,
+            "rows_written": self.rows_written,
+            "rows_rejected": self.rows_rejected,
+            "chunks": self.chunks,
+            "rows_per_second": round(self.rows_per_second(), 1),
+            "model_version": self.model_version,
+            "errors": list(self.errors),
+            "error": self.error
+        }
+
+def clean_row(row):
+    # Measurements from one CSV row (headers already lowercased); ValueError says what's wrong
+    values = {}
+    for key, (low, high) in FEATURE_RANGES.items():
+        raw = (row.get(key) or "").strip()
+        if not raw:
+            continue
+        try:
+            value = float(raw)
+        except ValueError:
+            raise ValueError(f"{key} is not a number: {raw!r}")
+        if not low <= value <= high:
+            raise ValueError(f"{key} {value:g} outside {low}-{high}")
+        values[key] = value
+    if not values:
+        raise ValueError("no measurements")
+    return values
+
+def ingest_csv(lines, username, parse_features, model_set, chunk_size=500, progress=None,
+               alpha=0.3, on_chunk=None, per_row_users=False):
+    """Score a CSV of camp measurements and store one HealthRecord per valid row.
+
+    `lines` is any iterable of text lines (an open file), read one chunk of
+    `chunk_size` rows at a time, so memory doesn't grow with the file. Each
+    chunk is scored in one engine pass, bulk-inserted and committed with its
+    risk-summary updates. Missing measurements get the same defaults as
+    /predict (via `parse_features`); an optional `message` column replaces
+    the "Camp Screening" label. Rows are stored under `username` unless
+    `per_row_users` is set (clinicians, the CLI), in which case a non-empty
+    `username` column wins. Must run inside an app context.
+    """
+    progress = progress or IngestProgress("<stream>")
+    progress.model_version = model_set.version
+    reader = csv.DictReader(lines)
+    # Spreadsheet headers come in any case ("Age", "BMI ")
+    reader.fieldnames = [(name or "").strip().lower() for name in reader.fieldnames or []]
+    if not set(reader.fieldnames) & set(FEATURE_RANGES):
+        progress.status = "error"
+        progress.error = "CSV needs at least one of the columns: " + ", ".join(FEATURE_RANGES)
+        progress.finished_at = time.time()
+        raise ValueError(progress.error)
+
+    def flush(batch):
+        if not batch:
+            return
+        risks = model_set.engine.predict_rows([features for features, _ in batch])
+        records = [
+            {
+                "username": meta["username"],
+                "symptoms": meta["symptoms"],
+                "diabetes": float(d),
+                "heart": float(h),
+                "kidney": float(k)
+            }
+            for (_, meta), d, h, k in zip(batch, risks["diabetes"], risks["heart"], risks["kidney"])
+        ]
+        # executemany INSERT without RETURNING: one statement per chunk
+        db.session.execute(db.insert(HealthRecord), records)
+        update_risk_summaries(records, alpha)
+        db.session.commit()
+        progress.rows_written += len(records)
+        progress.chunks += 1
+        if on_chunk:
+            on_chunk(progress)
+
+    batch = []
+    try:
+        for row in reader:
+            progress.rows_read += 1
+            try:
+                values = clean_row(row)
+            except ValueError as e:
+                # line_num counts the header, so it matches the spreadsheet's row number
+                progress.reject(reader.line_num, str(e))
+                continue
+            features, _ = parse_features(values)
+            batch.append((features, {
+                "username": ((row.get("username") or "").strip() if per_row_users else "") or username,
+                "symptoms": (row.get("message") or "").strip() or "Camp Screening"
+            }))
+            if len(batch) >= chunk_size:
+                flush(batch)
+                batch = []
+        flush(batch)
+        progress.status = "done"
+    except Exception as e:
+        db.session.rollback()
+        progress.status = "error"
+        progress.error = f"line {reader.line_num}: {e}"
+        raise
+    finally:
+        progress.finished_at = time.time()
+    return progress
@@ -0,0 +1,183 @@
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+class Job:
+    def __init__(self, job_id=None):
+        self.id = job_id or uuid.uuid4().hex
+        self.status = "pending"
+        self.result = None
+        self.error = None
+        # Optional object with to_dict(), saved with the job (e.g. an ingest's IngestProgress)
+        self.progress = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self._done = threading.Event()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error
+        }
+
+class SavedProgress:
+    """Progress of a job as last saved by the worker running it."""
+
+    def __init__(self, values):
+        self._values = values
+
+    def to_dict(self):
+        return dict(self._values)
+
+class JobStore:
+    """Job state in a table of the app database, so whichever worker a poll lands on can answer it.
+
+    The worker running a job saves it when it is submitted, when it finishes and
+    whenever the job publishes progress; other workers only read.
+    """
+
+    def __init__(self, app, db, model, queue):
+        self.app = app
+        self.db = db
+        self.model = model
+        self.queue = queue
+
+    def save(self, job):
+        values = {
+            "status": job.status,
+            "result": json.dumps(job.result, ensure_ascii=False),
+            "error": job.error,
+            "progress": json.dumps(job.progress.to_dict(), ensure_ascii=False) if job.progress else None,
+            "finished_at": job.finished_at
+        }
+        stmt = sqlite_insert(self.model).values(id=job.id, queue=self.queue, created_at=job.created_at, **values)
+        stmt = stmt.on_conflict_do_update(index_elements=[self.model.id], set_=values)
+        with self.app.app_context():
+            self.db.session.execute(stmt)
+            self.db.session.commit()
+
+    def load(self, job_id):
+        with self.app.app_context():
+            row = self.db.session.get(self.model, job_id)
+            if row is None or row.queue != self.queue:
+                return None
+            job = Job(row.id)
+            job.status = row.status
+            job.result = json.loads(row.result) if row.result else None
+            job.error = row.error
+            job.progress = SavedProgress(json.loads(row.progress)) if row.progress else None
+            job.created_at = row.created_at
+            job.finished_at = row.finished_at
+        if job.status != "pending":
+            job._done.set()
+        return job
+
+    def purge(self, cutoff):
+        # Finished jobs past their TTL, and jobs whose worker died long ago without finishing them
+        model = self.model
+        with self.app.app_context():
+            self.db.session.query(model).filter(
+                model.queue == self.queue,
+                (model.finished_at < cutoff) | (model.finished_at.is_(None) & (model.created_at < cutoff - 86400))
+            ).delete(synchronize_session=False)
+            self.db.session.commit()
+
+class JobQueue:
+    """Runs callables on a small thread pool and keeps their results for `ttl` seconds.
+
+    Without a `store`, jobs live in this process only and clients must poll the
+    worker that accepted the request. With a JobStore, any worker can report on
+    any job, which is what a multi-worker gunicorn needs.
+    """
+
+    def __init__(self, max_workers=4, ttl=600, store=None):
+        self.ttl = ttl
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        job = self.create()
+        self.start(job, fn, *args, **kwargs)
+        return job
+
+    def create(self, progress=None):
+        # A job that isn't running yet, for callers that need its id (or progress) wired up first
+        job = Job()
+        job.progress = progress
+        with self._lock:
+            self._purge()
+            self._jobs[job.id] = job
+        if self.store is not None:
+            self.store.purge(time.time() - self.ttl)
+            self.store.save(job)
+        return job
+
+    def start(self, job, fn, *args, **kwargs):
+        self._executor.submit(self._run, job, fn, args, kwargs)
+
+    def publish(self, job):
+        # Save a running job's progress so other workers can report it
+        if self.store is not None:
+            self.store.save(job)
+
+    def _run(self, job, fn, args, kwargs):
+        try:
+            job.result = fn(*args, **kwargs)
+            job.status = "done"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "error"
+        finally:
+            job.finished_at = time.time()
+            if self.store is not None:
+                try:
+                    self.store.save(job)
+                except Exception as e:
+                    print(f"Job {job.id}: could not save result: {e}")
+            job._done.set()
+
+    def _purge(self):
+        cutoff = time.time() - self.ttl
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished_at and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None and self.store is not None:
+            job = self.store.load(job_id)
+        return job
+
+    def wait(self, job_id, timeout, interval=0.5):
+        """Return the finished job, or None if it is unknown or still running after `timeout` seconds."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job if job.wait(timeout) else None
+        # Running on another worker: re-read the store until it finishes
+        deadline = time.monotonic() + timeout
+        while self.store is not None:
+            job = self.store.load(job_id)
+            if job is None or job.status != "pending":
+                return job
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(interval, remaining))
+        return None
+
+    def pending(self):
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.status == "pending")
@@ -0,0 +1,85 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+class GatewayBusy(Exception):
+    """All upstream slots and wait-queue places are taken; the caller should fall back now."""
+
+class GatewayTimeout(Exception):
+    """The upstream call (including time spent queued) took longer than the call timeout."""
+
+class LLMGateway:
+    """Funnels chat completions through a bounded pool with single-flight deduplication.
+
+    Concurrent calls with the same key share one upstream request. At most
+    `max_concurrent` requests run at once and `max_waiting` more may queue;
+    beyond that complete() raises GatewayBusy immediately. Each caller waits
+    at most `timeout` seconds in total (queue + call) before GatewayTimeout;
+    the same timeout is passed to the client so the upstream request is
+    abandoned too, and queued calls whose caller already gave up are skipped.
+    """
+
+    def __init__(self, client_factory, max_concurrent=4, max_waiting=16, timeout=15.0):
+        self.client_factory = client_factory
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="llm")
+        self._inflight = {}
+        # Re-entrant: add_done_callback runs _finished inline if the call already finished
+        self._lock = threading.RLock()
+
+        self.calls = 0
+        self.deduplicated = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    def complete(self, key, **request):
+        # Returns the first choice's message content for request (model=, messages=, ...)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.deduplicated += 1
+            else:
+                if len(self._inflight) >= self.max_concurrent + self.max_waiting:
+                    self.rejected += 1
+                    raise GatewayBusy(f"{len(self._inflight)} LLM calls already running or queued")
+                deadline = time.monotonic() + self.timeout
+                future = self._executor.submit(self._call, request, deadline)
+                self._inflight[key] = future
+                future.add_done_callback(lambda f, key=key: self._finished(key, f))
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            with self._lock:
+                self.timeouts += 1
+            raise GatewayTimeout(f"LLM call exceeded {self.timeout}s") from None
+
+    def _call(self, request, deadline):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise GatewayTimeout("Dropped from the queue after its caller timed out")
+        with self._lock:
+            self.calls += 1
+        response = self.client_factory().chat.completions.create(timeout=remaining, **request)
+        return response.choices[0].message.content
+
+    def _finished(self, key, future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            if future.exception() is not None:
+                self.errors += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "inflight": len(self._inflight),
+                "calls": self.calls,
+                "deduplicated": self.deduplicated,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "errors": self.errors
+            }
@@ -0,0 +1,140 @@
+from types import MappingProxyType
+
+DEFAULT_LANGUAGE = "en-US"
+
+# Every user-facing server string, per language. Only DEFAULT_LANGUAGE has to be
+# complete: other languages override what they translate and inherit the rest.
+# Adding a language means adding an entry here.
+CATALOG = {
+    "en-US": {
+        "name": "English",
+        # Advice shown when the LLM isn't consulted (or fails)
+        "default_advice": {
+            "recommendation": "Maintain a healthy lifestyle.",
+            "future_risks": "Based on risk levels, untreated conditions may worsen.",
+            "precautions": "Maintain a balanced diet and exercise regularly.",
+            "causes": "Further diagnosis required for specific causes.",
+            "reduction_steps": "Standard health optimization requested.",
+            "diet_plan": "Universal healthy diet recommended."
+        },
+        # Dummy-key mock of the LLM, by overall risk level
+        "mock_advice": {
+            "low": {
+                "recommendation": "Your risk levels are low. Maintain a balanced diet and regular exercise.",
+                "reduction_steps": "1. Stay active.\n2. Eat greens.\n3. Annual wellness check.",
+                "future_risks": "Complications depend on lifestyle choices.",
+                "precautions": "Monitor vitals regularly.",
+                "causes": "May include environmental and genetic factors.",
+                "diet_plan": "Specific diet based on your risk profile."
+            },
+            "high": {
+                "recommendation": "High risk detected. Consult a doctor immediately for a detailed screening.",
+                "reduction_steps": "1. Immediate consultation.\n2. Diagnostic tests.\n3. Medication review.",
+                "future_risks": "Complications depend on lifestyle choices.",
+                "precautions": "Monitor vitals regularly.",
+                "causes": "May include environmental and genetic factors.",
+                "diet_plan": "Specific diet based on your risk profile."
+            }
+        },
+        "risk_names": {"diabetes": "Diabetes", "heart": "Heart", "kidney": "Kidney"},
+        # str.format templates, pre-bound in each bundle's "templates"
+        "templates": {
+            "sms_risk": "{name} ({value}%)",
+            "sms_alert": "HEALIX AI ALERT: High health risk detected: {risks}. View Report: {link}",
+            "pdf_title": "HEALIX AI – Health Report",
+            "pdf_user": "User: {username}",
+            "pdf_date": "Date: {date}",
+            "pdf_input": "Input: {symptoms}",
+            "pdf_metrics_heading": "Health Metrics Used:",
+            "pdf_age": "Age: {value}",
+            "pdf_bmi": "BMI: {value}",
+            "pdf_glucose": "Glucose: {value} mg/dL",
+            "pdf_bp": "Blood Pressure: {value} mmHg",
+            "pdf_chol": "Cholesterol: {value} mg/dL",
+            "pdf_max_heart_rate": "Max Heart Rate: {value} bpm",
+            "pdf_risk_heading": "Risk Analysis Results:",
+            "pdf_diabetes_risk": "Diabetes Risk",
+            "pdf_heart_risk": "Heart Risk",
+            "pdf_kidney_risk": "Kidney Risk",
+            "pdf_causes": "Potential Causes:",
+            "pdf_reduction_steps": "How to Reduce Risk:",
+            "pdf_diet_plan": "Recommended Dietary Plan:",
+            "pdf_recommendation": "General Recommendations:",
+            "pdf_disclaimer": "Disclaimer: This is an AI-generated estimate. Please consult a doctor for medical advice.",
+            "pdf_missing": "N/A"
+        }
+    },
+    "hi-IN": {
+        "name": "Hindi",
+        "default_advice": {
+            "future_risks": "जोखिम के स्तरों के आधार पर, अनुपचारित स्थितियां खराब हो सकती हैं।",
+            "precautions": "संतुलित आहार बनाए रखें और नियमित व्यायाम करें।",
+            "causes": "विशिष्ट कारणों के लिए और निदान की आवश्यकता है।",
+            "reduction_steps": "मानक स्वास्थ्य अनुकूलन का अनुरोध किया गया।",
+            "diet_plan": "सार्वभौमिक स्वास्थ्य आहार की सिफारिश की गई।"
+        },
+        "mock_advice": {
+            "low": {
+                "recommendation": "आपका जोखिम स्तर कम है। संतुलित आहार और नियमित व्यायाम बनाए रखें।",
+                "reduction_steps": "1. सक्रिय रहें।\n2. हरी सब्जियां खाएं।\n3. वार्षिक स्वास्थ्य जांच।"
+            },
+            "high": {
+                "recommendation": "उच्च जोखिम का पता चला। विस्तृत जांच के लिए तुरंत डॉक्टर से सलाह लें।",
+                "reduction_steps": "1. तत्काल परामर्श।\n2. नैदानिक परीक्षण।\n3. दवा की समीक्षा।"
+            }
+        },
+        # PDF labels stay English: the built-in Helvetica font has no Devanagari glyphs
+        "templates": {
+            "sms_alert": "हीलिक्स एआई अलर्ट: उच्च स्वास्थ्य जोखिम का पता चला है: {risks}। रिपोर्ट देखें: {link}"
+        }
+    },
+    "te-IN": {
+        "name": "Telugu",
+        "default_advice": {
+            "future_risks": "ప్రమాద స్థాయిల ఆధారంగా, చికిత్స చేయని పరిస్థితులు అధ్వాన్నంగా మారవచ్చు.",
+            "precautions": "సమతుల్య ఆహారం తీసుకోండి మరియు క్రమం తప్పకుండా వ్యాయామం చేయండి.",
+            "causes": "నిర్దిష్ట కారణాల కోసం మరిన్ని పరీక్షలు అవసరం.",
+            "reduction_steps": "ప్రామాణిక ఆరోగ్య ఆప్టిమైజేషన్ అభ్యర్థించబడింది.",
+            "diet_plan": "సార్వత్రిక ఆరోగ్యకరమైన ఆహారం సిఫార్సు చేయబడింది."
+        },
+        "mock_advice": {
+            "low": {
+                "recommendation": "మీ ప్రమాద స్థాయిలు తక్కువగా ఉన్నాయి. సమతుల్య ఆహారం మరియు క్రమం తప్పకుండా వ్యాయామం చేయండి.",
+                "reduction_steps": "1. యాక్టివ్ గా ఉండండి.\n2. ఆకుకూరలు తినండి.\n3. వార్షిక ఆరోగ్య పరీక్ష."
+            },
+            "high": {
+                "recommendation": "అధిక ప్రమాదం గుర్తించబడింది. వివరణాత్మక స్క్రీనింగ్ కోసం వెంటనే వైద్యుడిని సంప్రదించండి.",
+                "reduction_steps": "1. తక్షణ సంప్రదింపు.\n2. రోగనిర్ధారణ పరీక్షలు.\n3. మందుల సమీక్ష."
+            }
+        },
+        # PDF labels stay English: the built-in Helvetica font has no Telugu glyphs
+        "templates": {
+            "sms_alert": "హీలిక్స్ AI అలర్ట్: అధిక ఆరోగ్య ప్రమాదం గుర్తించబడింది: {risks}. రిపోర్ట్ చూడండి: {link}"
+        }
+    }
+}
+
+def _resolve(base, override):
+    merged = dict(base)
+    for key, value in override.items():
+        merged[key] = _resolve(base[key], value) if isinstance(value, dict) else value
+    return merged
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    return value
+
+def _build(code):
+    resolved = _resolve(CATALOG[DEFAULT_LANGUAGE], CATALOG[code])
+    # Bind each template's str.format once so callers just call it with values
+    resolved["templates"] = {name: template.format for name, template in resolved["templates"].items()}
+    resolved["code"] = code
+    return _freeze(resolved)
+
+# Read-only bundles, built once at import and shared by every request
+BUNDLES = MappingProxyType({code: _build(code) for code in CATALOG})
+
+def get(lang_code):
+    # Bundle for lang_code; unknown codes get DEFAULT_LANGUAGE
+    return BUNDLES.get(lang_code) or BUNDLES[DEFAULT_LANGUAGE]
@@ -0,0 +1,271 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+
+# Latency buckets in seconds: sub-millisecond model/DB stages up to multi-second LLM calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _labels_text(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(labels.get(n, "") for n in self.labelnames), 0)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+    @staticmethod
+    def merge(values, other):
+        for key, value in other.items():
+            values[key] = values.get(key, 0) + value
+        return values
+
+    def render(self, values=None):
+        # values: merged snapshots from several workers; this process's own by default
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        items = sorted((self.snapshot() if values is None else values).items())
+        for key, value in items:
+            lines.append(f"{self.name}{_labels_text(self.labelnames, key)} {_number(value)}")
+        return lines
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense (bucket counts, sum, count)."""
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        self._observe(tuple(labels.get(n, "") for n in self.labelnames), value)
+
+    def _observe(self, key, value):
+        # Non-cumulative counts per bucket (last slot is +Inf); summed up at render time
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def time(self, **labels):
+        return Timer(self, tuple(labels.get(n, "") for n in self.labelnames))
+
+    def count(self, **labels):
+        series = self._series.get(tuple(labels.get(n, "") for n in self.labelnames))
+        return series[2] if series else 0
+
+    def total(self, **labels):
+        series = self._series.get(tuple(labels.get(n, "") for n in self.labelnames))
+        return series[1] if series else 0.0
+
+    def snapshot(self):
+        with self._lock:
+            return {key: (list(s[0]), s[1], s[2]) for key, s in self._series.items()}
+
+    @staticmethod
+    def merge(series, other):
+        for key, (counts, total, count) in other.items():
+            if key in series:
+                mine = series[key]
+                series[key] = ([a + b for a, b in zip(mine[0], counts)], mine[1] + total, mine[2] + count)
+            else:
+                series[key] = (list(counts), total, count)
+        return series
+
+    def render(self, series=None):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        items = sorted((self.snapshot() if series is None else series).items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_labels_text(self.labelnames, key, ('le', _number(bound)))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels_text(self.labelnames, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels_text(self.labelnames, key)} {count}")
+        return lines
+
+class Timer:
+    # Plain class rather than @contextmanager, with the label key built up front: a few microseconds per use
+    __slots__ = ("histogram", "key", "start")
+
+    def __init__(self, histogram, key):
+        self.histogram = histogram
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram._observe(self.key, time.perf_counter() - self.start)
+        return False
+
+class Registry:
+    """Metrics exported on /metrics.
+
+    Collectors are callables returning (name, type, help, [(labels, value), ...])
+    tuples; they read counters other modules already keep (cache and SMS stats)
+    at scrape time, so the hot path doesn't pay for them twice.
+
+    Every value lives in the process that recorded it. Under a multi-worker
+    gunicorn, call share(directory) in each worker: workers then write a JSON
+    snapshot there every few seconds, and a scrape, whichever worker answers it,
+    sums the counters and histograms of all of them. Collector samples can't be
+    summed in general (ratios, maxima), so they are exported per worker with a
+    "pid" label.
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+        self.shared_dir = None
+
+    def counter(self, name, help, labelnames=()):
+        metric = Counter(name, help, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, help, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, fn):
+        self._collectors.append(fn)
+        return fn
+
+    def share(self, directory, interval=5.0):
+        # Call after fork, once per worker; the thread writing snapshots doesn't survive fork()
+        self.shared_dir = directory
+        os.makedirs(directory, exist_ok=True)
+        self.write_snapshot()
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.write_snapshot()
+                except Exception as e:
+                    print(f"Metrics snapshot failed: {e}")
+
+        threading.Thread(target=run, name="metrics-share", daemon=True).start()
+
+    def snapshot(self):
+        return {
+            "metrics": {m.name: [[list(key), value] for key, value in m.snapshot().items()] for m in self._metrics},
+            "collected": [list(sample) for collect in self._collectors for sample in collect()]
+        }
+
+    def write_snapshot(self):
+        fd, tmp = tempfile.mkstemp(dir=self.shared_dir, prefix=".tmp-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp, os.path.join(self.shared_dir, f"{os.getpid()}.json"))
+
+    def _snapshots(self):
+        # {pid: snapshot}; None stands for this process when nothing is shared
+        if self.shared_dir is None:
+            return {None: self.snapshot()}
+        self.write_snapshot()
+        snapshots = {}
+        for entry in os.scandir(self.shared_dir):
+            name, ext = os.path.splitext(entry.name)
+            if ext != ".json" or not name.isdigit():
+                continue
+            try:
+                with open(entry.path) as f:
+                    snapshots[name] = json.load(f)
+            except (OSError, ValueError):
+                pass  # the worker exited (or is mid-replace) since scandir
+        return snapshots
+
+    def render(self):
+        snapshots = self._snapshots()
+        lines = []
+        for metric in self._metrics:
+            merged = {}
+            for snapshot in snapshots.values():
+                values = snapshot["metrics"].get(metric.name, [])
+                metric.merge(merged, {tuple(key): value for key, value in values})
+            lines.extend(metric.render(merged))
+
+        collected = {}
+        for pid, snapshot in sorted(snapshots.items(), key=lambda item: item[0] or ""):
+            for name, kind, help, samples in snapshot["collected"]:
+                entry = collected.setdefault(name, (kind, help, []))
+                for labels, value in samples:
+                    entry[2].append((dict(labels, pid=pid) if pid else labels, value))
+        for name, (kind, help, samples) in collected.items():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_labels_text(tuple(labels), tuple(labels.values()))} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+# Prometheus text exposition format, version 0.0.4
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+stage_seconds = registry.histogram(
+    "healix_stage_seconds", "Time spent in each stage of a request.", ("route", "stage")
+)
+request_seconds = registry.histogram(
+    "healix_request_seconds", "Total request handling time by endpoint.", ("endpoint", "method", "status")
+)
+llm_requests = registry.counter(
+    "healix_llm_requests_total", "Symptom analyses by source (openai, cache, mock).", ("source",)
+)
+llm_errors = registry.counter(
+    "healix_llm_errors_total", "LLM calls that raised, by route.", ("route",)
+)
+symptom_sources = registry.counter(
+    "healix_symptom_requests_total", "Symptom-bearing /predict requests by who read the symptoms (local, llm).", ("source",)
+)
+sms_alerts = registry.counter(
+    "healix_sms_alerts_total", "High-risk SMS alerts by outcome at enqueue time (queued, coalesced, skipped).", ("outcome",)
+)
+compression_bytes = registry.counter(
+    "healix_compression_bytes_total", "Response body bytes before (in) and after (out) compression.", ("encoding", "direction")
+)
+compression_seconds = registry.histogram(
+    "healix_compression_seconds", "CPU time spent compressing one response body.", ("encoding",)
+)
+
+def timer(route, stage):
+    # with timer("predict", "llm"): ...
+    return Timer(stage_seconds, (route, stage))
@@ -1,10 +1,166 @@
 import joblib
 import os
+import re
+import threading
+import time
 
 # Define paths relative to this file
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 MODELS_DIR = os.path.join(BASE_DIR, "models")
 
-diabetes_model = joblib.load(os.path.join(MODELS_DIR, "diabetes_model.pkl"))
-heart_model = joblib.load(os.path.join(MODELS_DIR, "heart_model.pkl"))
-kidney_model = joblib.load(os.path.join(MODELS_DIR, "kidney_model.pkl"))
+MODEL_NAMES = ("diabetes", "heart", "kidney")
+
+# Version name for the unversioned .pkl files directly under models/
+BASE_VERSION = "base"
+
+class ModelSet:
+    # One immutable, fully loaded version; requests keep using the set they started with
+    def __init__(self, version, models, engine, load_seconds):
+        self.version = version
+        self.models = models
+        self.engine = engine
+        self.load_seconds = load_seconds
+        self.loaded_at = time.time()
+
+def _version_key(name):
+    # Natural sort so "v10" > "v9" and "2024-06-01" sorts by date
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", name)]
+
+class ModelRegistry:
+    """Tracks versioned model files and hot-swaps the active set when they change.
+
+    A version is a subdirectory of models/ holding all three `<name>_model.pkl`
+    files (the loose files in models/ itself are version "base"). The highest
+    version wins unless `pinned`. At most every `check_interval` seconds,
+    current() compares file mtimes/sizes; on a change the new version loads in
+    a background thread and replaces the active set in one reference swap, so
+    in-flight requests finish on the set they already hold.
+    """
+
+    def __init__(self, models_dir=MODELS_DIR, check_interval=2.0, mmap=False, pinned=None):
+        self.models_dir = models_dir
+        self.check_interval = check_interval
+        self.mmap = mmap
+        self.pinned = pinned
+        self._active = None
+        self._signature = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self._reloading = False
+
+    def versions(self):
+        found = {}
+        if all(os.path.exists(os.path.join(self.models_dir, f"{n}_model.pkl")) for n in MODEL_NAMES):
+            found[BASE_VERSION] = self.models_dir
+        for entry in os.scandir(self.models_dir):
+            if entry.is_dir() and not entry.name.startswith((".", "_")):
+                if all(os.path.exists(os.path.join(entry.path, f"{n}_model.pkl")) for n in MODEL_NAMES):
+                    found[entry.name] = entry.path
+        return found
+
+    def _pick(self):
+        versions = self.versions()
+        if self.pinned:
+            if self.pinned not in versions:
+                raise FileNotFoundError(f"Model version {self.pinned!r} not found in {self.models_dir}")
+            return self.pinned, versions[self.pinned]
+        named = sorted((v for v in versions if v != BASE_VERSION), key=_version_key)
+        version = named[-1] if named else BASE_VERSION
+        if version not in versions:
+            raise FileNotFoundError(f"No complete model set in {self.models_dir}")
+        return version, versions[version]
+
+    def _signature_of(self, path):
+        stats = [os.stat(os.path.join(path, f"{n}_model.pkl")) for n in MODEL_NAMES]
+        return tuple((s.st_mtime_ns, s.st_size) for s in stats)
+
+    def _load(self, version, path):
+        from inference import RiskEngine
+        start = time.perf_counter()
+        # mmap_mode="r" maps the pickled numpy arrays read-only, so forked workers share the pages
+        models = {
+            name: joblib.load(os.path.join(path, f"{name}_model.pkl"), mmap_mode="r" if self.mmap else None)
+            for name in MODEL_NAMES
+        }
+        # Compiled once per version; scores all three models in a single pass
+        engine = RiskEngine(models)
+        return ModelSet(version, models, engine, time.perf_counter() - start)
+
+    def load(self):
+        # Synchronously load the newest version (startup / warm-up)
+        with self._lock:
+            version, path = self._pick()
+            signature = (version, self._signature_of(path))
+            if self._active is None or signature != self._signature:
+                self._active = self._load(version, path)
+                self._signature = signature
+            self._next_check = time.monotonic() + self.check_interval
+            return self._active
+
+    def current(self):
+        active = self._active
+        if active is None:
+            return self.load()
+        if self.check_interval and time.monotonic() >= self._next_check:
+            self._next_check = time.monotonic() + self.check_interval
+            self._check_for_update()
+        return active
+
+    def _check_for_update(self):
+        try:
+            version, path = self._pick()
+            signature = (version, self._signature_of(path))
+        except (OSError, FileNotFoundError):
+            return
+        if signature == self._signature:
+            return
+        with self._lock:
+            if self._reloading:
+                return
+            self._reloading = True
+        threading.Thread(target=self._reload, args=(version, path, signature), name="model-reload", daemon=True).start()
+
+    def _reload(self, version, path, signature):
+        try:
+            model_set = self._load(version, path)
+        except Exception as e:
+            # Half-copied or bad files: keep serving the current version
+            print(f"Model reload of {version} failed: {e}")
+        else:
+            with self._lock:
+                self._active = model_set
+                self._signature = signature
+            print(f"Model version {version} active (loaded in {model_set.load_seconds * 1000:.0f}ms)")
+        finally:
+            self._reloading = False
+
+    def loaded(self):
+        return self._active is not None
+
+registry = ModelRegistry(
+    check_interval=float(os.getenv("MODEL_CHECK_INTERVAL", 2.0)),
+    mmap=os.getenv("MODEL_MMAP", "0") == "1",
+    pinned=os.getenv("MODEL_VERSION") or None
+)
+
+def load_models():
+    return registry.load().engine
+
+def current():
+    return registry.current()
+
+def get_engine():
+    return registry.current().engine
+
+def loaded():
+    return registry.loaded()
+
+def __getattr__(name):
+    # Keeps `from models_loader import diabetes_model` working, loading on first access
+    if name in ("diabetes_model", "heart_model", "kidney_model"):
+        return registry.current().models[name[:-len("_model")]]
+    if name == "risk_engine":
+        return get_engine()
+    if name == "load_seconds":
+        return registry.current().load_seconds if registry.loaded() else None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
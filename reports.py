@@ -0,0 +1,112 @@
+import io
+
+import localization
+
+# Bump whenever the layout below changes so cached PDFs are re-rendered
+REPORT_TEMPLATE_VERSION = "1"
+
+def render_report_pdf(data, username, date_text, lang_code=localization.DEFAULT_LANGUAGE):
+    # data: the /predict response shape (risks, estimates, advice fields); missing fields show N/A
+    t = localization.get(lang_code)["templates"]
+    missing = t["pdf_missing"]()
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+    from reportlab.lib import colors
+
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    width, height = letter
+
+    # Title
+    c.setFont("Helvetica-Bold", 24)
+    c.setFillColor(colors.darkgreen)
+    c.drawString(50, height - 50, t["pdf_title"]())
+
+    # User Info
+    c.setFont("Helvetica", 12)
+    c.setFillColor(colors.black)
+    c.drawString(50, height - 100, t["pdf_user"](username=username))
+    c.drawString(50, height - 120, t["pdf_date"](date=date_text))
+    if data.get("symptoms"):
+        c.drawString(50, height - 140, t["pdf_input"](symptoms=data["symptoms"][:80]))
+
+    # Health Metrics
+    y = height - 160
+    c.setFont("Helvetica-Bold", 14)
+    c.drawString(50, y, t["pdf_metrics_heading"]())
+    y -= 25
+    c.setFont("Helvetica", 12)
+    
+    metrics = data.get("estimates", {})
+    c.drawString(70, y, t["pdf_age"](value=metrics.get("age", missing)))
+    c.drawString(250, y, t["pdf_bmi"](value=metrics.get("bmi", missing)))
+    y -= 20
+    c.drawString(70, y, t["pdf_glucose"](value=metrics.get("glucose", missing)))
+    c.drawString(250, y, t["pdf_bp"](value=metrics.get("bp", missing)))
+    y -= 20
+    c.drawString(70, y, t["pdf_chol"](value=metrics.get("chol", missing)))
+    c.drawString(250, y, t["pdf_max_heart_rate"](value=metrics.get("max_heart_rate", missing)))
+
+    # Risk Analysis
+    y -= 50
+    c.setFont("Helvetica-Bold", 14)
+    c.drawString(50, y, t["pdf_risk_heading"]())
+    y -= 30
+
+    # Draw Boxes for Risks
+    def draw_risk_box(x, y, title, risk):
+        c.setStrokeColor(colors.grey)
+        c.setFillColor(colors.whitesmoke)
+        c.rect(x, y-40, 150, 50, fill=1)
+        c.setFillColor(colors.black)
+        c.setFont("Helvetica-Bold", 12)
+        c.drawCentredString(x + 75, y - 15, title)
+        c.setFillColor(colors.red if risk > 50 else colors.green)
+        c.setFont("Helvetica-Bold", 14)
+        c.drawCentredString(x + 75, y - 35, f"{risk}%")
+
+    draw_risk_box(50, y, t["pdf_diabetes_risk"](), data.get("diabetes", 0))
+    draw_risk_box(220, y, t["pdf_heart_risk"](), data.get("heart", 0))
+    draw_risk_box(390, y, t["pdf_kidney_risk"](), data.get("kidney", 0))
+
+    # AI Details (Causes, Reduction, Diet)
+    y -= 100
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(50, y, t["pdf_causes"]())
+    c.setFont("Helvetica", 11)
+    causes_text = data.get("causes", missing)
+    c.drawString(50, y-15, causes_text[:90])
+    if len(causes_text) > 90: c.drawString(50, y-30, causes_text[90:180])
+    
+    y -= 50
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(50, y, t["pdf_reduction_steps"]())
+    c.setFont("Helvetica", 11)
+    reduction_text = data.get("reduction_steps", missing)
+    lines = reduction_text.split('\n')
+    for i, line in enumerate(lines[:3]):
+        c.drawString(50, y - 15 - (i*15), line[:90])
+    
+    y -= 65
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(50, y, t["pdf_diet_plan"]())
+    c.setFont("Helvetica", 11)
+    diet_text = data.get("diet_plan", missing)
+    c.drawString(50, y-15, diet_text[:90])
+    if len(diet_text) > 90: c.drawString(50, y-30, diet_text[90:180])
+
+    y -= 50
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(50, y, t["pdf_recommendation"]())
+    c.setFont("Helvetica", 11)
+    rec_text = data.get("recommendation", missing)
+    c.drawString(50, y-15, rec_text[:90])
+    if len(rec_text) > 90: c.drawString(50, y-30, rec_text[90:180])
+
+    y -= 60
+    c.setFont("Helvetica-Oblique", 10)
+    c.setFillColor(colors.grey)
+    c.drawString(50, y, t["pdf_disclaimer"]())
+
+    c.save()
+    return buffer.getvalue()
@@ -0,0 +1,153 @@
+import os
+import queue
+import threading
+import time
+
+class SmsDispatcher:
+    """Sends SMS alerts from a background worker pool instead of inside the request.
+
+    One client from `client_factory` is built on first use and shared by all
+    workers; it only needs Twilio's `client.messages.create(body=, from_=, to=)`.
+    Alerts to a phone that already has one queued replace the queued body, and
+    alerts to a phone messaged within `coalesce_window` seconds are dropped.
+    """
+
+    def __init__(self, client_factory, from_number, url_file="public_url.txt",
+                 default_url="http://localhost:5000", workers=2, retries=3,
+                 backoff=1.0, coalesce_window=300):
+        self.client_factory = client_factory
+        self.from_number = from_number
+        self.url_file = url_file
+        self.default_url = default_url
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.coalesce_window = coalesce_window
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._client = None
+        self._threads = []
+        self._pending = {}
+        self._last_sent = {}
+        self._url = None
+        self._url_mtime = None
+
+        self.enqueued = 0
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.coalesced = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    # ---- public URL for report links ----
+
+    def public_url(self):
+        # Re-read the tunnel URL file only when its mtime changes
+        try:
+            mtime = os.stat(self.url_file).st_mtime
+        except OSError:
+            return self.default_url
+        if mtime != self._url_mtime:
+            try:
+                with open(self.url_file, "r") as f:
+                    self._url = f.read().strip() or self.default_url
+            except OSError:
+                return self.default_url
+            self._url_mtime = mtime
+        return self._url
+
+    # ---- queueing ----
+
+    def start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                t = threading.Thread(target=self._work, name=f"sms-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def enqueue(self, to_number, body):
+        self.start()
+        now = time.monotonic()
+        with self._lock:
+            job = self._pending.get(to_number)
+            if job is not None:
+                job["body"] = body
+                self.coalesced += 1
+                return False
+            if len(self._last_sent) > 1000:
+                self._last_sent = {k: t for k, t in self._last_sent.items() if now - t < self.coalesce_window}
+            last = self._last_sent.get(to_number)
+            if last is not None and now - last < self.coalesce_window:
+                self.coalesced += 1
+                return False
+            job = {"to": to_number, "body": body, "queued_at": now}
+            self._pending[to_number] = job
+            self.enqueued += 1
+        self._queue.put(job)
+        return True
+
+    def join(self):
+        # Block until every queued alert has been sent or given up on
+        self._queue.join()
+
+    def _get_client(self):
+        with self._lock:
+            if self._client is None:
+                self._client = self.client_factory()
+            return self._client
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            try:
+                self._deliver(job)
+            finally:
+                self._queue.task_done()
+
+    def _deliver(self, job):
+        with self._lock:
+            self._pending.pop(job["to"], None)
+
+        for attempt in range(self.retries + 1):
+            try:
+                message = self._get_client().messages.create(
+                    body=job["body"],
+                    from_=self.from_number,
+                    to=job["to"]
+                )
+            except Exception as e:
+                if attempt == self.retries:
+                    with self._lock:
+                        self.failed += 1
+                    print(f"Failed to send SMS: {e}")
+                    return
+                with self._lock:
+                    self.retried += 1
+                time.sleep(self.backoff * (2 ** attempt))
+                continue
+
+            latency = time.monotonic() - job["queued_at"]
+            with self._lock:
+                self.sent += 1
+                self.latency_total += latency
+                self.latency_max = max(self.latency_max, latency)
+                self._last_sent[job["to"]] = time.monotonic()
+            print(f"SMS sent to {job['to']}: {getattr(message, 'sid', '')}")
+            return
+
+    def stats(self):
+        with self._lock:
+            return {
+                "depth": self._queue.qsize(),
+                "enqueued": self.enqueued,
+                "sent": self.sent,
+                "failed": self.failed,
+                "retried": self.retried,
+                "coalesced": self.coalesced,
+                "latency_avg": self.latency_total / self.sent if self.sent else 0.0,
+                "latency_max": self.latency_max
+            }
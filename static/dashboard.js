@@ -0,0 +1,409 @@
+// --- Voice Assistant ---
+
+function speak(text, lang = "en-US") {
+    if (!window.speechSynthesis) return;
+
+    // Cancel any current speaking
+    window.speechSynthesis.cancel();
+
+    const msg = new SpeechSynthesisUtterance(text);
+    const voices = window.speechSynthesis.getVoices();
+
+    // Try to find a specific female voice or fallback
+    const femaleVoice = voices.find(voice =>
+        voice.lang === lang &&
+        (
+            voice.name.toLowerCase().includes("zira") ||
+            voice.name.toLowerCase().includes("female") ||
+            voice.name.toLowerCase().includes("google") ||
+            voice.name.toLowerCase().includes("samantha") ||
+            voice.name.toLowerCase().includes("woman")
+        )
+    );
+
+    msg.voice = femaleVoice || voices.find(v => v.lang === lang) || voices[0];
+    msg.rate = 0.9;
+    msg.pitch = 1.1;
+    msg.volume = 1;
+
+    window.speechSynthesis.speak(msg);
+}
+
+function startListening() {
+    if (!('webkitSpeechRecognition' in window)) {
+        alert("Voice recognition not supported in this browser. Try Chrome.");
+        return;
+    }
+
+    // Auto-switch to chat mode to show transcript
+    setMode('chat');
+
+    const selectedLang = document.getElementById("language-select").value;
+    const recognition = new webkitSpeechRecognition();
+    recognition.lang = selectedLang;
+    recognition.interimResults = false;
+    recognition.maxAlternatives = 1;
+
+    recognition.start();
+
+    // Visual cue logic could go here (e.g., animate mic)
+
+    recognition.onresult = function (event) {
+        const transcript = event.results[0][0].transcript;
+        const symptomsBox = document.getElementById("symptoms");
+
+        // Append or replace? Let's append with a space if not empty
+        if (symptomsBox.value.length > 0) {
+            symptomsBox.value += " " + transcript;
+        } else {
+            symptomsBox.value = transcript;
+        }
+
+        // Voice Command Parsing
+        if (transcript.toLowerCase().includes("analyze") || transcript.toLowerCase().includes("predict")) {
+            speak("Analyzing now.");
+            analyze();
+        } else {
+            speak("I heard: " + transcript);
+        }
+    };
+
+    recognition.onerror = function (event) {
+        console.error("Speech recognition error", event.error);
+        speak("I didn't catch that. Please try again.");
+    };
+}
+
+// Welcome Message & Localization
+window.onload = function () {
+    const langSelect = document.getElementById("language-select");
+    const translations = {
+        "en-US": {
+            welcome: "Welcome to Healix AI. I am your personal health assistant of the generation.",
+            labels: {
+                thirst: "Frequent Thirst?",
+                urination: "Frequent Urination?",
+                fatigue: "Feeling Tired?",
+                blurred_vision: "Blurred Vision?",
+                slow_healing: "Slow Healing Sores?",
+                numbness: "Hand/Foot Numbness?",
+                chest_pain: "Chest Pain?",
+                breath_shortness: "Shortness of Breath?",
+                swollen_legs: "Swollen Legs/Feet?",
+                palpitations: "Heart Palpitations?",
+                foamy_urine: "Foamy Urine?",
+                itchy_skin: "Persistent Itchy Skin?",
+                muscle_cramps: "Frequent Muscle Cramps?",
+                dizziness: "Dizziness?",
+                obesity: "Overweight?"
+            }
+        },
+        "hi-IN": {
+            welcome: "हीलिक्स एआई में आपका स्वागत है। मैं आपकी पीढ़ी का निजी स्वास्थ्य सहायक हूं।",
+            labels: {
+                thirst: "क्या आपको बार-बार प्यास लगती है?",
+                urination: "क्या आपको बार-बार पेशाब आता है?",
+                fatigue: "क्या आप थकान महसूस कर रहे हैं?",
+                blurred_vision: "क्या आपको धुंधला दिखाई देता है?",
+                slow_healing: "क्या घाव भरने में समय लगता है?",
+                numbness: "हाथ-पैर में सुन्नपन?",
+                chest_pain: "सीने में दर्द?",
+                breath_shortness: "सांस लेने में तकलीफ?",
+                swollen_legs: "पैरों में सूजन?",
+                palpitations: "दिल की धड़कन तेज होना?",
+                foamy_urine: "झागदार पेशाब?",
+                itchy_skin: "लगातार खुजली वाली त्वचा?",
+                muscle_cramps: "बार-बार मांसपेशियों में ऐंठन?",
+                dizziness: "चक्कर आना?",
+                obesity: "अधिक वजन?"
+            }
+        },
+        "te-IN": {
+            welcome: "హీలిక్స్ AIకి స్వాగతం. నేను మీ వ్యక్తిగత ఆరోగ్య సహాయకుడిని.",
+            labels: {
+                thirst: "మీకు తరచుగా దాహం వేస్తుందా?",
+                urination: "తరచుగా మూత్ర విసర్జన అవుతుందా?",
+                fatigue: "అలసటగా ఉందా?",
+                blurred_vision: "చూపు మసకగా ఉందా?",
+                slow_healing: "గాయాలు నెమ్మదిగా నయమవుతున్నాయా?",
+                numbness: "చేతులు/కాళ్లు తిమ్మిర్లు ఎక్కుతున్నాయా?",
+                chest_pain: "ఛాతీ నొప్పి ఉందా?",
+                breath_shortness: "శ్వాస తీసుకోవడంలో ఇబ్బందిగా ఉందా?",
+                swollen_legs: "కాళ్ల వాపులు ఉన్నాయా?",
+                palpitations: "గుండె దడగా ఉందా?",
+                foamy_urine: "మూత్రంలో నురుగు వస్తుందా?",
+                itchy_skin: "నిరంతర చర్మ దురద ఉందా?",
+                muscle_cramps: "తరచుగా కండరాల తిమ్మిర్లు వస్తున్నాయా?",
+                dizziness: "తల తిరుగుతున్నట్లు ఉందా?",
+                obesity: "అధిక బరువు ఉన్నారా?"
+            }
+        }
+    };
+
+    function applyTranslations() {
+        const lang = langSelect.value;
+        const t = translations[lang];
+        // Update Symptom Labels
+        document.querySelectorAll(".q-item").forEach(item => {
+            const key = item.dataset.q;
+            const labelSpan = item.querySelector(".q-label");
+            if (labelSpan && t.labels[key]) {
+                labelSpan.textContent = t.labels[key];
+            }
+        });
+        speak(t.welcome, lang);
+    }
+
+    langSelect.onchange = applyTranslations;
+
+    // Initial welcome
+    setTimeout(() => {
+        applyTranslations();
+    }, 1000);
+};
+
+// --- Main App Logic ---
+
+function setMode(mode) {
+    const inputSec = document.getElementById("input-section");
+    const chatSec = document.getElementById("chat-section");
+    const btnInput = document.getElementById("btn-inputs");
+    const btnChat = document.getElementById("btn-chat");
+
+    if (mode === 'inputs') {
+        inputSec.style.display = 'grid';
+        chatSec.style.display = 'none';
+        btnInput.classList.add('active');
+        btnChat.classList.remove('active');
+    } else {
+        inputSec.style.display = 'none';
+        chatSec.style.display = 'block';
+        btnInput.classList.remove('active');
+        btnChat.classList.add('active');
+    }
+}
+
+async function analyze() {
+    const msg = document.getElementById("symptoms").value;
+    // Collect Inputs
+    const payload = {
+        message: msg,
+        language: document.getElementById("language-select").value,
+        age: document.getElementById("age").value,
+        bmi: document.getElementById("bmi").value,
+        bp: document.getElementById("bp").value,
+        glucose: document.getElementById("glucose").value,
+        chol: document.getElementById("chol").value,
+        max_heart_rate: document.getElementById("max_heart_rate").value,
+        questionnaire: getQuestionnaireData(),
+        async: true
+    };
+
+    const res = await fetch("/predict", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify(payload)
+    });
+
+    const data = await res.json();
+
+    if (data.error) {
+        alert("Error: " + data.error);
+        speak("There was an error processing your request.");
+        return;
+    }
+
+    renderResult(data);
+
+    if (data.advice_job) {
+        // Risk scores are already on screen; the AI advice follows in the background
+        const advice = await waitForAdvice(data.advice_job);
+        // Whatever came back is final, even {} for an unknown, expired or failed job:
+        // show it, or the default advice, instead of the loading text
+        delete data.advice_job;
+        Object.assign(data, advice);
+        renderResult(data);
+    }
+
+    // Speak the result summary
+    let summary = `Your analysis is ready. Diabetes risk is ${data.diabetes} percent. Heart risk is ${data.heart} percent. Kidney risk is ${data.kidney} percent. ${data.recommendation}`;
+    speak(summary);
+}
+
+// The server says whether SSE is cheap for it (ASGI); under sync workers we poll
+const adviceStreaming = document.currentScript.dataset.adviceStream === "1";
+
+function waitForAdvice(jobId) {
+    return new Promise(resolve => {
+        if (adviceStreaming && window.EventSource) {
+            const events = new EventSource(`/predict/jobs/${jobId}/events`);
+            events.addEventListener("advice", e => {
+                events.close();
+                resolve(JSON.parse(e.data).result || {});
+            });
+            events.addEventListener("timeout", () => { events.close(); resolve({}); });
+            events.onerror = () => { events.close(); pollAdvice(jobId).then(resolve); };
+        } else {
+            pollAdvice(jobId).then(resolve);
+        }
+    });
+}
+
+async function pollAdvice(jobId) {
+    for (let i = 0; i < 60; i++) {
+        const res = await fetch(`/predict/jobs/${jobId}`);
+        if (!res.ok) return {};
+        const job = await res.json();
+        if (job.status !== "pending") return job.result || {};
+        await new Promise(r => setTimeout(r, 1000));
+    }
+    return {};
+}
+
+let lastResult = null;
+
+function renderResult(data) {
+    lastResult = data;
+    const pending = data.advice_job && data.recommendation === undefined;
+    const loading = "Preparing personalized advice...";
+
+    const resultDiv = document.getElementById("result");
+    resultDiv.style.display = "block";
+    resultDiv.innerHTML = `
+<div class="risk-cards">
+    <div class="card diabetes">
+        <h3>Diabetes Risk</h3>
+        <div class="percentage">${data.diabetes}%</div>
+        <div class="status">${getRiskLabel(data.diabetes)}</div>
+    </div>
+    <div class="card heart">
+        <h3>Heart Disease Risk</h3>
+        <div class="percentage">${data.heart}%</div>
+        <div class="status">${getRiskLabel(data.heart)}</div>
+    </div>
+    <div class="card kidney">
+        <h3>Kidney Disease Risk</h3>
+        <div class="percentage">${data.kidney}%</div>
+        <div class="status">${getRiskLabel(data.kidney)}</div>
+    </div>
+</div>
+
+<div class="advice-box">
+    <div style="font-size:24px;">💡</div>
+    <div class="advice-content">
+        <h4>AI Recommendations:</h4>
+        <p>${pending ? loading : (data.recommendation || "Maintain a healthy lifestyle.")}</p>
+    </div>
+</div>
+
+<!-- Future Risks Section -->
+<div class="advice-box" style="border-left: 4px solid #ef4444; background: rgba(239, 68, 68, 0.1); margin-top: 10px;">
+    <div style="font-size:24px;">⚠️</div>
+    <div class="advice-content">
+        <h4 style="color: #ef4444;">Possible Future Complications:</h4>
+        <p>${pending ? loading : (data.future_risks || "No major risks identified.")}</p>
+    </div>
+</div>
+
+<!-- Causes Section -->
+<div class="advice-box" style="border-left: 4px solid var(--accent); background: rgba(0, 243, 255, 0.1); margin-top: 10px;">
+    <div style="font-size:24px;">🔍</div>
+    <div class="advice-content">
+        <h4 style="color: var(--accent);">Potential Causes:</h4>
+        <p>${pending ? loading : (data.causes || "Lifestyle or biological factors.")}</p>
+    </div>
+</div>
+
+<!-- Reduction Steps Section -->
+<div class="advice-box" style="border-left: 4px solid #f59e0b; background: rgba(245, 158, 11, 0.1); margin-top: 10px;">
+    <div style="font-size:24px;">📉</div>
+    <div class="advice-content">
+        <h4 style="color: #f59e0b;">Steps to Reduce Risk:</h4>
+        <p style="white-space: pre-line;">${pending ? loading : (data.reduction_steps || "Consult a doctor for management.")}</p>
+    </div>
+</div>
+
+<!-- Diet Plan Section -->
+<div class="advice-box" style="border-left: 4px solid #8b5cf6; background: rgba(139, 92, 246, 0.1); margin-top: 10px;">
+    <div style="font-size:24px;">🥗</div>
+    <div class="advice-content">
+        <h4 style="color: #8b5cf6;">Recommended Dietary Plan:</h4>
+        <p>${pending ? loading : (data.diet_plan || "Balanced nutrition based on risk levels.")}</p>
+    </div>
+</div>
+
+<!-- Precautions Section -->
+<div class="advice-box" style="border-left: 4px solid #10b981; background: rgba(16, 185, 129, 0.1); margin-top: 10px;">
+    <div style="font-size:24px;">🛡️</div>
+    <div class="advice-content">
+        <h4 style="color: #10b981;">Recommended Precautions:</h4>
+        <p style="white-space: pre-line;">${pending ? loading : (data.precautions || "None.")}</p>
+    </div>
+</div>
+
+<div style="display:flex; gap:10px; margin-top:20px;">
+    <button onclick='downloadReport(lastResult)' class="download-btn">
+        <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M21 15v4a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2v-4"/><polyline points="7 10 12 15 17 10"/><line x1="12" y1="15" x2="12" y2="3"/></svg>
+        Download PDF
+    </button>
+    <button onclick='shareReport(${data.record_id})' class="download-btn" style="border-color:var(--accent); color:var(--accent);">
+        <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M4 12v8a2 2 0 0 0 2 2h12a2 2 0 0 0 2-2v-8"/><polyline points="16 6 12 2 8 6"/><line x1="12" y1="2" x2="12" y2="15"/></svg>
+        Share Link
+    </button>
+</div>
+`;
+}
+
+// Questionnaire Logic
+const qAnswers = {};
+function toggleQ(btn, val) {
+    const parent = btn.parentElement;
+    const qKey = btn.closest('.q-item').dataset.q;
+
+    // Reset buttons in this group
+    parent.querySelectorAll('button').forEach(b => b.classList.remove('active'));
+    btn.classList.add('active');
+
+    qAnswers[qKey] = val;
+}
+
+function getQuestionnaireData() {
+    return qAnswers;
+}
+
+function shareReport(id) {
+    const url = window.location.origin + "/report/" + id;
+    navigator.clipboard.writeText(url).then(() => {
+        alert("Link copied to clipboard: " + url);
+        speak("Link copied to clipboard.");
+    });
+}
+
+function getRiskLabel(percentage) {
+    if (percentage < 30) return "Low Risk";
+    if (percentage < 70) return "Moderate Risk";
+    return "High Risk";
+}
+
+async function downloadReport(data) {
+    const res = await fetch("/download_report", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify(data)
+    });
+
+    if (res.ok) {
+        const blob = await res.blob();
+        const url = window.URL.createObjectURL(blob);
+        const a = document.createElement('a');
+        a.href = url;
+        a.download = "healix_report.pdf";
+        document.body.appendChild(a);
+        a.click();
+        a.remove();
+        speak("Report downloaded successfully.");
+    } else {
+        alert("Failed to generate report.");
+        speak("Failed to generate report.");
+    }
+}
@@ -0,0 +1,99 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from sqlalchemy import event
+
+def configure_sqlite(app, db):
+    # Apply app.config["SQLITE_PRAGMAS"] to every new SQLite connection
+    pragmas = app.config.get("SQLITE_PRAGMAS")
+    if not pragmas:
+        return
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+class GroupCommitWriter:
+    """Collects inserts from concurrent requests and commits them together.
+
+    A single writer thread waits up to `interval` seconds after the first
+    pending row (or until `max_batch` rows are queued) and then inserts the
+    whole batch in one transaction. Callers block on insert() until their
+    row is committed and get its primary key back. `on_flush(records)` runs
+    inside that transaction, for bookkeeping that must commit with the rows.
+    """
+
+    def __init__(self, app, db, model, interval=0.005, max_batch=200, on_flush=None):
+        self.app = app
+        self.db = db
+        self.model = model
+        self.interval = interval
+        self.max_batch = max_batch
+        self.on_flush = on_flush
+        self.batches = 0
+        self.rows = 0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+                self._thread.start()
+
+    def submit(self, fields):
+        self.start()
+        future = Future()
+        self._queue.put((fields, future))
+        return future
+
+    def insert(self, fields, timeout=30):
+        return self.submit(fields).result(timeout=timeout)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._flush(batch)
+
+    def _flush(self, batch):
+        with self.app.app_context():
+            try:
+                records = [self.model(**fields) for fields, _ in batch]
+                self.db.session.add_all(records)
+                if self.on_flush is not None:
+                    self.on_flush(records)
+                # Read ids before commit expires the objects, or each one costs a SELECT
+                self.db.session.flush()
+                ids = [record.id for record in records]
+                self.db.session.commit()
+            except Exception as e:
+                self.db.session.rollback()
+                for _, future in batch:
+                    future.set_exception(e)
+                return
+            for (_, future), record_id in zip(batch, ids):
+                future.set_result(record_id)
+        self.batches += 1
+        self.rows += len(batch)
+
+    def stats(self):
+        return {"batches": self.batches, "rows": self.rows, "pending": self._queue.qsize()}
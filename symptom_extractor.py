@@ -0,0 +1,155 @@
+import re
+
+# The 15 binary flags the LLM prompt asks for, in the same order
+SYMPTOMS = (
+    "thirst", "urination", "fatigue", "chest_pain", "dizziness", "obesity", "blurred_vision",
+    "slow_healing", "numbness", "breath_shortness", "swollen_legs", "palpitations",
+    "foamy_urine", "itchy_skin", "muscle_cramps"
+)
+
+# English phrases are matched on word boundaries; Hindi and Telugu ones as substrings,
+# since suffixes attach to the word ("దాహంగా", "थकान")
+PHRASES = {
+    "en-US": {
+        "thirst": ["very thirsty", "thirsty", "thirst", "dry mouth"],
+        "urination": ["frequent urination", "urinating a lot", "urinate often", "peeing a lot", "urination", "urinating", "peeing"],
+        "fatigue": ["fatigued", "fatigue", "tired", "exhausted", "weakness", "weak", "low energy"],
+        "chest_pain": ["chest pain", "chest pains", "pain in my chest", "chest tightness", "tight chest", "chest hurts"],
+        "dizziness": ["dizzy", "dizziness", "lightheaded", "light headed", "giddy", "vertigo"],
+        "obesity": ["overweight", "obese", "obesity", "gained weight", "weight gain"],
+        "blurred_vision": ["blurred vision", "blurry vision", "vision is blurry", "blurry eyesight", "blurred", "blurry"],
+        "slow_healing": ["slow healing", "wounds heal slowly", "cuts heal slowly", "heal slowly", "sores not healing", "slow to heal"],
+        "numbness": ["numbness", "numb", "tingling", "pins and needles"],
+        "breath_shortness": ["shortness of breath", "short of breath", "breathless", "breathlessness", "hard to breathe", "difficulty breathing", "out of breath"],
+        "swollen_legs": ["swollen legs", "swollen feet", "swollen ankles", "leg swelling", "swelling in my legs", "legs are swollen", "feet are swollen", "swelling in my feet", "swelling in my ankles"],
+        "palpitations": ["palpitations", "racing heart", "heart racing", "heart is racing", "pounding heart", "fast heartbeat", "irregular heartbeat"],
+        "foamy_urine": ["foamy urine", "frothy urine", "bubbly urine", "urine is foamy", "urine looks foamy"],
+        "itchy_skin": ["itchy skin", "itching", "itchy", "skin itches"],
+        "muscle_cramps": ["muscle cramps", "muscle cramp", "cramps", "cramping", "leg cramps"]
+    },
+    "hi-IN": {
+        "thirst": ["प्यास"],
+        "urination": ["बार-बार पेशाब", "बार बार पेशाब", "ज्यादा पेशाब", "ज़्यादा पेशाब", "पेशाब"],
+        "fatigue": ["थकान", "थकावट", "थका", "थकी", "कमजोरी", "कमज़ोरी"],
+        "chest_pain": ["सीने में दर्द", "छाती में दर्द", "सीने का दर्द", "छाती का दर्द"],
+        "dizziness": ["चक्कर"],
+        "obesity": ["मोटापा", "वजन बढ़", "वज़न बढ़"],
+        "blurred_vision": ["धुंधला दिख", "धुंधली दृष्टि", "धुंधला"],
+        "slow_healing": ["घाव धीरे", "घाव जल्दी नहीं भर", "घाव नहीं भर"],
+        "numbness": ["सुन्न", "झुनझुनी"],
+        "breath_shortness": ["सांस फूल", "साँस फूल", "सांस लेने में तकलीफ", "साँस लेने में तकलीफ", "सांस की तकलीफ"],
+        "swollen_legs": ["पैरों में सूजन", "पैर में सूजन", "टखनों में सूजन", "पैर सूज"],
+        "palpitations": ["धड़कन तेज", "दिल की धड़कन", "घबराहट"],
+        "foamy_urine": ["झागदार पेशाब", "पेशाब में झाग"],
+        "itchy_skin": ["खुजली"],
+        "muscle_cramps": ["ऐंठन", "मांसपेशियों में दर्द"]
+    },
+    "te-IN": {
+        "thirst": ["దాహం", "దాహము"],
+        "urination": ["తరచుగా మూత్రం", "మూత్రవిసర్జన", "మూత్రం"],
+        "fatigue": ["అలసట", "అలసిపో", "నీరసం", "బలహీనత"],
+        "chest_pain": ["ఛాతీ నొప్పి", "ఛాతి నొప్పి", "గుండె నొప్పి"],
+        "dizziness": ["తల తిరుగు", "కళ్లు తిరుగు", "మైకం"],
+        "obesity": ["ఊబకాయం", "అధిక బరువు", "బరువు పెరి"],
+        "blurred_vision": ["మసకగా కనిపి", "చూపు మసక", "మసక"],
+        "slow_healing": ["గాయాలు నెమ్మదిగా", "పుండ్లు మానడం లేదు", "గాయం మానడం లేదు"],
+        "numbness": ["తిమ్మిరి", "స్పర్శ లేదు"],
+        "breath_shortness": ["ఊపిరి ఆడటం లేదు", "ఆయాసం", "శ్వాస తీసుకోవడంలో ఇబ్బంది", "ఊపిరి"],
+        "swollen_legs": ["కాళ్ల వాపు", "కాళ్ళ వాపు", "పాదాల వాపు", "కాళ్లు వాచి"],
+        "palpitations": ["గుండె దడ", "దడ"],
+        "foamy_urine": ["నురుగు మూత్రం", "మూత్రంలో నురుగు"],
+        "itchy_skin": ["దురద"],
+        "muscle_cramps": ["కండరాల నొప్పులు", "కండరాల తిమ్మిర్లు", "పట్టేయడం"]
+    }
+}
+
+# English negation comes before the symptom ("no chest pain"), Hindi/Telugu after ("प्यास नहीं", "దాహం లేదు").
+# Its scope is a few words and ends at punctuation or "and"/"but", so "no chest pain and very thirsty"
+# and "no idea why I am so thirsty" keep thirst. "or" stays inside it: "not dizzy or tired" is neither.
+CONJUNCTIONS = r"(?:and|but|और|लेकिन|మరియు|కానీ)"
+NEGATION_BEFORE = re.compile(
+    r"\b(?:no|not|never|without|don't|dont|didn't|haven't|hasn't|isn't|nor)\b"
+    rf"(?:\s+(?!{CONJUNCTIONS}\b)[^\s,.;!?]+){{0,3}}\s*$"
+)
+NEGATION_AFTER = re.compile(rf"^(?:(?!{CONJUNCTIONS})[^,.;!?।]){{0,12}}?(?:नहीं|नही|లేదు|లేవు|కాదు)")
+NEGATION_WORDS = frozenset("no not never without don't dont didn't haven't hasn't isn't nor नहीं नही లేదు లేవు కాదు".split())
+
+# Filler words that don't change which flags apply ("I am feeling very ...")
+FILLER = frozenset("""
+i im i'm am is are was be been do does have has had having feel feels feeling felt get getting got very really so
+a an the and or also too my me of in on at with some lot lots bit little all time lately recently often
+always since days weeks day week today these this that it its from much quite kind sort but
+मुझे मैं मेरे मेरी मेरा है हैं था थी हो रही रहा रहे बहुत और भी लग लगती लगता लगा महसूस कर करता करती हूँ हूं में को से की का के आज कल लेकिन पर आते आता आती
+నాకు నేను నా చాలా మరియు ఉంది ఉన్నాయి ఉన్నది గా కూడా అనిపిస్తుంది అవుతుంది వస్తుంది ఈ రోజు కొంచెం ఎక్కువగా కానీ
+""".split())
+
+TOKEN = re.compile(r"[^\s,.;:!?।]+")
+
+def _compile():
+    # One alternation over every phrase of every symptom, longest first, so "पेशाब में झाग"
+    # (foamy_urine) wins over "पेशाब" (urination) no matter which symptom comes first
+    alternatives = []
+    symptom_of = {}
+    for lang, table in PHRASES.items():
+        for symptom, phrases in table.items():
+            for phrase in phrases:
+                symptom_of[phrase] = symptom
+                pattern = re.escape(phrase).replace(r"\ ", r"\s+")
+                alternatives.append((len(phrase), rf"\b{pattern}\b" if lang == "en-US" else pattern))
+    alternatives.sort(key=lambda alternative: alternative[0], reverse=True)
+    return re.compile("|".join(pattern for _, pattern in alternatives), re.IGNORECASE), symptom_of
+
+MATCHER, SYMPTOM_OF = _compile()
+
+class Extraction:
+    def __init__(self, flags, mentioned, confidence, words):
+        self.flags = flags
+        self.mentioned = mentioned
+        self.confidence = confidence
+        self.words = words
+
+    def is_confident(self, min_confidence, max_words):
+        # Short symptom lists only; longer narratives still go to the LLM for advice
+        return self.words <= max_words and self.confidence >= min_confidence
+
+def extract(message, questionnaire=None):
+    """Turn a short symptom message (en/hi/te) plus questionnaire answers into the 15 flags.
+
+    `mentioned` holds the symptoms the text talked about (negated ones map to 0).
+    `confidence` is the share of words explained by a symptom phrase, a negation
+    or filler; a questionnaire-only request is fully explained (1.0).
+    Questionnaire answers override whatever the text says.
+    """
+    text = (message or "").strip().lower()
+    flags = dict.fromkeys(SYMPTOMS, 0)
+    mentioned = set()
+    covered = []
+
+    for match in MATCHER.finditer(text):
+        symptom = SYMPTOM_OF[" ".join(match.group().split())]
+        start, end = match.span()
+        negated = NEGATION_BEFORE.search(text, 0, start)
+        after = NEGATION_AFTER.match(text[end:])
+        if after:
+            covered.append((end, end + after.end()))
+        flags[symptom] = 0 if (negated or after) else 1
+        mentioned.add(symptom)
+        covered.append((start, end))
+
+    words = explained = 0
+    for token in TOKEN.finditer(text):
+        words += 1
+        word = token.group()
+        if word in FILLER or word in NEGATION_WORDS or any(s < token.end() and token.start() < e for s, e in covered):
+            explained += 1
+
+    for symptom, value in (questionnaire or {}).items():
+        if symptom in flags:
+            flags[symptom] = 1 if value in (1, "1", True, "yes", "Yes") else 0
+            mentioned.add(symptom)
+
+    if words:
+        confidence = explained / words if mentioned else 0.0
+    else:
+        confidence = 1.0 if questionnaire else 0.0
+    return Extraction(flags, mentioned, confidence, words)
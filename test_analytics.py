@@ -0,0 +1,60 @@
+import math
+
+import numpy as np
+import pytest
+
+import analytics
+import app as healix
+from database import HealthRecord, db
+
+def load_records(values):
+    with healix.app.app_context():
+        HealthRecord.query.delete()
+        db.session.execute(db.insert(HealthRecord), [
+            {"username": f"u{i % 7}", "symptoms": "test", "diabetes": v, "heart": 100 - v, "kidney": 50.0}
+            for i, v in enumerate(values)
+        ])
+        db.session.commit()
+
+def distribution(risk):
+    with healix.app.app_context():
+        return analytics.risk_distribution(risk)
+
+@pytest.mark.parametrize("values", [
+    [float(v) for v in range(1, 101)],
+    list(np.random.default_rng(7).uniform(0, 100, 1000).round(3)),
+    [12.5] * 9 + [88.8],
+    [0.0, 100.0],
+])
+def test_percentiles_match_numpy(client, values):
+    load_records(values)
+    result = distribution("diabetes")
+    assert result["count"] == len(values)
+    assert result["mean"] == pytest.approx(np.mean(values), abs=0.01)
+    for p in analytics.PERCENTILES:
+        # Smallest recorded value with at least p% of records at or below it, floored to 0.1 points
+        expected = math.floor(np.percentile(values, p, method="inverted_cdf") * 10) / 10
+        assert result["percentiles"][f"p{p}"] == pytest.approx(expected), p
+
+def test_histogram_puts_100_in_the_last_bin(client):
+    load_records([0.0, 9.99, 10.0, 55.0, 100.0])
+    counts = [b["count"] for b in distribution("diabetes")["histogram"]]
+    assert counts == [2, 1, 0, 0, 0, 1, 0, 0, 0, 1]
+
+def test_empty_table(client):
+    load_records([])
+    result = distribution("heart")
+    assert result["count"] == 0 and result["mean"] is None and result["percentiles"] == {}
+
+def test_summary_is_shared_between_workers(client, monkeypatch):
+    load_records([10.0, 90.0])
+    healix.analytics_cache.clear()
+    with healix.app.app_context():
+        first = healix.population_analytics()
+    # Another worker: empty memory, same SQLite file
+    from cache import LRUCache
+    other = LRUCache(maxsize=4, ttl=60, path=healix.analytics_cache.path)
+    monkeypatch.setattr(healix, "analytics_cache", other)
+    monkeypatch.setattr(analytics, "population_summary", lambda *a, **k: pytest.fail("rebuilt"))
+    with healix.app.app_context():
+        assert healix.population_analytics() == first
@@ -0,0 +1,42 @@
+import asyncio
+import threading
+import time
+
+from asgi import Application
+
+def test_requests_run_in_parallel_up_to_the_thread_limit():
+    lock = threading.Lock()
+    state = {"active": 0, "max_active": 0}
+
+    def slow_wsgi(environ, start_response):
+        with lock:
+            state["active"] += 1
+            state["max_active"] = max(state["max_active"], state["active"])
+        time.sleep(0.2)
+        with lock:
+            state["active"] -= 1
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return [b"ok"]
+
+    application = Application(slow_wsgi, threads=4)
+
+    async def request():
+        scope = {"type": "http", "method": "GET", "path": "/", "query_string": b"", "headers": [],
+                 "http_version": "1.1", "scheme": "http", "server": ("test", 80), "root_path": ""}
+        sent = []
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+        async def send(message):
+            sent.append(message)
+        await application(scope, receive, send)
+        return sent[0]["status"]
+
+    async def main():
+        return await asyncio.gather(*(request() for _ in range(8)))
+
+    start = time.perf_counter()
+    assert asyncio.run(main()) == [200] * 8
+    elapsed = time.perf_counter() - start
+    # 8 requests, 4 at a time: two rounds of 0.2s, not eight in a row on one shared thread
+    assert state["max_active"] == 4
+    assert elapsed < 0.8
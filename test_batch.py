@@ -0,0 +1,12 @@
+def test_batch_statements_do_not_grow_with_patients(client, count_queries):
+    patients = [{"age": 40 + i, "glucose": 100 + i} for i in range(50)]
+    with count_queries() as statements:
+        response = client.post("/predict/batch", json={"patients": patients})
+    assert response.status_code == 200
+    assert len({r["record_id"] for r in response.get_json()["results"]}) == 50
+    # One executemany INSERT, one id lookup, one executemany summary upsert
+    assert len(statements) == 3, statements
+
+def test_batch_rejects_non_object_questionnaire(client):
+    response = client.post("/predict/batch", json={"patients": [{"age": 40, "questionnaire": ["thirst"]}]})
+    assert response.status_code == 400
@@ -0,0 +1,82 @@
+import os
+import threading
+import time
+
+from cache import LRUCache
+
+def test_sqlite_connection_is_opened_per_process(tmp_path, monkeypatch):
+    cache = LRUCache(path=str(tmp_path / "cache.db"))
+    assert cache._conn is None  # nothing opened at import time, i.e. in the gunicorn master
+    cache.set("a", 1)
+    parent = cache._conn
+
+    # After fork the child's pid differs: it must open its own connection
+    child_pid = os.getpid() + 1
+    monkeypatch.setattr(os, "getpid", lambda: child_pid)
+    cache._data.clear()
+    assert cache.get("a") == 1
+    assert cache._conn is not parent
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(maxsize=3)
+    for key in "abc":
+        cache.set(key, key.upper())
+    assert cache.get("a") == "A"  # a is now the most recent
+    cache.set("d", "D")
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in "acd"] == ["A", "C", "D"]
+    assert len(cache) == 3
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    cache = LRUCache(ttl=10)
+    cache.set("a", 1)
+    now[0] += 9
+    assert cache.get("a") == 1
+    now[0] += 2
+    assert cache.get("a", "gone") == "gone"
+    assert len(cache) == 0
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+def test_sqlite_entries_survive_reopening(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.db")
+    cache = LRUCache(path=path, ttl=60)
+    cache.set("kept", {"advice": "Drink water."})
+    cache.set("dropped", 1)
+    cache.pop("dropped")
+
+    reopened = LRUCache(path=path, ttl=60)
+    assert reopened.get("kept") == {"advice": "Drink water."}
+    assert reopened.get("dropped") is None
+
+    # Expired rows are not served after a restart either
+    later = time.time() + 61
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert LRUCache(path=path, ttl=60).get("kept") is None
+
+def test_concurrent_access(tmp_path):
+    cache = LRUCache(maxsize=50, path=str(tmp_path / "cache.db"))
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(200):
+                key = f"{n}-{i % 80}"
+                cache.set(key, i)
+                value = cache.get(key)
+                assert value is None or isinstance(value, int)
+                if i % 7 == 0:
+                    cache.pop(key)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert len(cache) <= 50
+    stats = cache.stats()
+    assert stats["hits"] + stats["misses"] == 8 * 200
@@ -0,0 +1,14 @@
+def test_compressed_report_keeps_strong_etag(client, high_risk):
+    client.login()
+    record_id = client.post("/predict", json=high_risk).get_json()["record_id"]
+    response = client.get(f"/report/{record_id}", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    etag = response.headers["ETag"]
+    assert etag.endswith('-gzip"') and not etag.startswith("W/")
+    again = client.get(f"/report/{record_id}", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    # The uncompressed body has its own validator
+    plain = client.get(f"/report/{record_id}", headers={"If-None-Match": etag})
+    assert plain.status_code == 304
+    assert plain.headers["ETag"] == etag.replace("-gzip", "")
@@ -0,0 +1,6 @@
+def test_csv_export_escapes_formulas(client, high_risk):
+    client.login()
+    client.post("/predict", json=dict(high_risk, message="=HYPERLINK(\"http://evil\")"))
+    body = client.get("/history/export?format=csv").get_data(as_text=True)
+    assert "'=HYPERLINK" in body
+    assert ",=HYPERLINK" not in body
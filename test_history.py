@@ -0,0 +1,70 @@
+import base64
+
+import pytest
+from sqlalchemy import text
+
+import app as healix
+from database import HealthRecord, db
+
+def add_records(username, timestamps):
+    # Raw SQL keeps created_at in the text format CURRENT_TIMESTAMP writes, as /predict's rows have
+    with healix.app.app_context():
+        for created in timestamps:
+            db.session.execute(text(
+                "INSERT INTO health_record (username, symptoms, diabetes, heart, kidney, created_at) "
+                "VALUES (:username, 'test', 10, 20, 30, :created)"
+            ), {"username": username, "created": created})
+        db.session.commit()
+        return [r.id for r in HealthRecord.query.filter_by(username=username)
+                .order_by(HealthRecord.created_at.desc(), HealthRecord.id.desc())]
+
+@pytest.fixture
+def history_client(client):
+    with healix.app.app_context():
+        HealthRecord.query.filter_by(username="asha").delete()
+        db.session.commit()
+    client.login()
+    return client
+
+def all_pages(client, limit):
+    ids, cursor, pages = [], None, 0
+    while True:
+        url = f"/history/records?limit={limit}" + (f"&cursor={cursor}" if cursor else "")
+        body = client.get(url).get_json()
+        ids += [r["id"] for r in body["records"]]
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids, pages
+
+def test_shared_timestamps_page_without_gaps_or_duplicates(history_client):
+    expected = add_records("asha", ["2025-01-01 10:00:00"] * 7 + ["2025-01-02 09:00:00"] * 3 + ["2024-12-31 23:59:59"])
+    ids, pages = all_pages(history_client, limit=3)
+    assert ids == expected
+    assert pages == 4
+
+def test_last_page_has_no_cursor(history_client):
+    expected = add_records("asha", ["2025-01-01 10:00:00"] * 4)
+    ids, pages = all_pages(history_client, limit=2)
+    assert ids == expected
+    # Exactly two full pages: the second must not point at an empty third
+    assert pages == 2
+
+def test_other_users_records_are_not_paged(history_client):
+    add_records("someone-else", ["2025-01-01 10:00:00"] * 3)
+    assert all_pages(history_client, limit=2) == ([], 1)
+
+def cursor_of(raw):
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+@pytest.mark.parametrize("cursor", [
+    "not-base64!!",
+    cursor_of("no separator"),
+    cursor_of("2025-01-01 10:00:00|abc"),
+    cursor_of("2025-01-01 10:00:00|99999999999999999999999"),
+    cursor_of("2025-01-01 10:00:00|-1"),
+    base64.urlsafe_b64encode(b"\xff\xfe|1").decode(),
+])
+def test_malformed_cursor_is_400(history_client, cursor):
+    assert history_client.get(f"/history/records?cursor={cursor}").status_code == 400
+    assert history_client.get(f"/history?cursor={cursor}").status_code == 400
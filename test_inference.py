@@ -0,0 +1,69 @@
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+from inference import FEATURE_KEYS, MODEL_FEATURES, RiskEngine
+from models_loader import diabetes_model, heart_model, kidney_model
+
+def sample_features(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.uniform(18, 90, n),    # age
+        rng.uniform(15, 45, n),    # bmi
+        rng.uniform(80, 200, n),   # bp
+        rng.uniform(60, 300, n),   # glucose
+        rng.uniform(100, 350, n),  # chol
+        rng.uniform(60, 220, n)    # max_heart_rate
+    ])
+
+def sklearn_probs(models, X):
+    cols = {k: i for i, k in enumerate(FEATURE_KEYS)}
+    return np.column_stack([
+        models[name].predict_proba(X[:, [cols[k] for k in MODEL_FEATURES[name]]])[:, 1]
+        for name in models
+    ])
+
+def test_parity_with_predict_proba():
+    models = {"diabetes": diabetes_model, "heart": heart_model, "kidney": kidney_model}
+    engine = RiskEngine(models)
+    X = sample_features()
+
+    assert not engine.fallback
+    np.testing.assert_allclose(engine.predict(X), sklearn_probs(models, X), rtol=1e-12, atol=1e-15)
+
+def test_predict_one_matches_rows():
+    engine = RiskEngine({"diabetes": diabetes_model, "heart": heart_model, "kidney": kidney_model})
+    features = dict(zip(FEATURE_KEYS, [52, 31, 145, 160, 240, 120]))
+
+    one = engine.predict_one(features)
+    rows = engine.predict_rows([features])
+    for name in one:
+        assert one[name] == rows[name][0]
+
+def test_falls_back_for_uncompilable_models():
+    X_train, y_train = make_classification(n_samples=100, n_features=4, random_state=1)
+    tree = DecisionTreeClassifier(random_state=0).fit(X_train, y_train)
+    logistic = LogisticRegression().fit(X_train, y_train)
+
+    models = {"diabetes": tree, "heart": logistic, "kidney": logistic}
+    engine = RiskEngine(models)
+    X = sample_features(50, seed=3)
+
+    assert list(engine.fallback) == ["diabetes"]
+    np.testing.assert_allclose(engine.predict(X), sklearn_probs(models, X), rtol=1e-12, atol=1e-15)
+
+def test_sweep_matches_rows():
+    engine = RiskEngine({"diabetes": diabetes_model, "heart": heart_model, "kidney": kidney_model})
+    features = dict(zip(FEATURE_KEYS, [52, 31, 145, 160, 240, 120]))
+    axes = {"glucose": [180, 140, 100], "bmi": [0.1, 0.5], "age": [-1.0, 0.0, 1.0, 2.0]}
+
+    risks = engine.sweep(features, axes)
+    rows = [
+        {**features, "glucose": g, "bmi": b, "age": a}
+        for g in axes["glucose"] for b in axes["bmi"] for a in axes["age"]
+    ]
+    expected = engine.predict_rows(rows)
+    for name in engine.names:
+        assert risks[name].shape == (3, 2, 4)
+        np.testing.assert_allclose(risks[name].ravel(), expected[name])
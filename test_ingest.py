@@ -0,0 +1,26 @@
+import io
+
+import app as healix
+from database import JobState, db
+from jobs import JobQueue, JobStore
+
+CSV = "age,bmi,bp,glucose,chol,max_heart_rate\n" + "50,28,130,140,200,150\n" * 20 + "500,28,130,140,200,150\n"
+
+def test_ingest_status_from_another_worker(client, monkeypatch):
+    client.login()
+    monkeypatch.setitem(healix.app.config, "INGEST_CHUNK_SIZE", 5)
+    response = client.post("/ingest", data={"file": (io.BytesIO(CSV.encode()), "camp.csv")})
+    assert response.status_code == 202
+    job_id = response.get_json()["job_id"]
+    assert healix.ingest_jobs.wait(job_id, timeout=10) is not None
+
+    # The status poll lands on a worker that never saw the upload
+    monkeypatch.setattr(healix, "ingest_jobs", JobQueue(store=JobStore(healix.app, db, JobState, "ingest")))
+    status = client.get(f"/ingest/{job_id}").get_json()
+    assert status["status"] == "done"
+    assert status["rows_written"] == 20
+    assert status["rows_rejected"] == 1
+    assert status["chunks"] == 4
+
+def test_ingest_status_needs_login(client):
+    assert client.get("/ingest/0123456789abcdef0123456789abcdef").status_code == 401
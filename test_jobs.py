@@ -0,0 +1,46 @@
+import app as healix
+from database import JobState, db
+from jobs import JobQueue, JobStore
+
+def other_worker(queue="advice"):
+    # A second process's queue: nothing in memory, only the shared table
+    return JobQueue(max_workers=1, store=JobStore(healix.app, db, JobState, queue))
+
+def test_unknown_job_is_404(client):
+    response = client.get("/predict/jobs/0123456789abcdef0123456789abcdef")
+    assert response.status_code == 404
+
+def test_finished_job_is_visible_to_other_workers(client):
+    worker = other_worker()
+    job = healix.advice_jobs.submit(lambda: {"recommendation": "Walk daily."})
+    assert healix.advice_jobs.wait(job.id, timeout=5) is job
+
+    seen = worker.get(job.id)
+    assert seen.to_dict() == {"job_id": job.id, "status": "done", "result": {"recommendation": "Walk daily."}, "error": None}
+    assert worker.wait(job.id, timeout=0).status == "done"
+    # Queues don't answer for each other's jobs
+    assert other_worker("ingest").get(job.id) is None
+
+def test_other_worker_sees_pending_then_done(client):
+    import threading
+    release = threading.Event()
+    job = healix.advice_jobs.submit(lambda: release.wait(5) and "ok")
+    worker = other_worker()
+    assert worker.get(job.id).status == "pending"
+    assert worker.wait(job.id, timeout=0.2) is None
+    release.set()
+    assert worker.wait(job.id, timeout=5).result == "ok"
+
+def test_failed_job_reports_error(client):
+    job = healix.advice_jobs.submit(lambda: 1 / 0)
+    healix.advice_jobs.wait(job.id, timeout=5)
+    data = other_worker().get(job.id).to_dict()
+    assert data["status"] == "error" and data["result"] is None
+
+def test_poll_lands_on_another_worker(client, monkeypatch):
+    job = healix.advice_jobs.submit(lambda: {"recommendation": "Sleep well."})
+    healix.advice_jobs.wait(job.id, timeout=5)
+    monkeypatch.setattr(healix, "advice_jobs", other_worker())
+    response = client.get(f"/predict/jobs/{job.id}")
+    assert response.status_code == 200
+    assert response.get_json()["result"] == {"recommendation": "Sleep well."}
@@ -0,0 +1,168 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from openai import OpenAI
+
+from llm_gateway import GatewayBusy, GatewayTimeout, LLMGateway
+
+class FakeOpenAIServer:
+    """Local HTTP server speaking just enough of POST /v1/chat/completions."""
+
+    def __init__(self, delay=0.0, content=None):
+        self.delay = delay
+        self.content = content or json.dumps({"thirst": 1, "recommendation": "Drink water."})
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+        fake = self
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                with fake._lock:
+                    fake.calls += 1
+                    fake.active += 1
+                    fake.max_active = max(fake.max_active, fake.active)
+                time.sleep(fake.delay)
+                with fake._lock:
+                    fake.active -= 1
+                body = json.dumps({
+                    "id": "chatcmpl-test", "object": "chat.completion", "created": 0, "model": "gpt-4o-mini",
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": fake.content}}]
+                }).encode()
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except OSError:
+                    pass  # client gave up (timeout tests)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = OpenAI(api_key="test-key", base_url=f"http://127.0.0.1:{self.server.server_port}/v1", max_retries=0)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def fake_openai():
+    servers = []
+    def start(**kwargs):
+        server = FakeOpenAIServer(**kwargs)
+        servers.append(server)
+        return server
+    yield start
+    for server in servers:
+        server.close()
+
+def request(text):
+    return dict(model="gpt-4o-mini", messages=[{"role": "user", "content": text}])
+
+def run_concurrently(fn, n):
+    results, errors = [None] * n, []
+    def worker(i):
+        try:
+            results[i] = fn(i)
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+def test_identical_prompts_share_one_upstream_call(fake_openai):
+    server = fake_openai(delay=0.3)
+    gateway = LLMGateway(lambda: server.client, max_concurrent=4)
+
+    results, errors = run_concurrently(lambda i: gateway.complete("same", **request("thirsty")), 8)
+
+    assert errors == []
+    assert set(results) == {server.content}
+    assert server.calls == 1
+    assert gateway.stats()["deduplicated"] == 7
+    assert gateway.stats()["inflight"] == 0
+
+def test_concurrency_is_capped(fake_openai):
+    server = fake_openai(delay=0.1)
+    gateway = LLMGateway(lambda: server.client, max_concurrent=2, max_waiting=10)
+
+    results, errors = run_concurrently(lambda i: gateway.complete(f"key{i}", **request(f"prompt {i}")), 6)
+
+    assert errors == []
+    assert server.calls == 6
+    assert server.max_active <= 2
+
+def test_full_queue_rejects_immediately(fake_openai):
+    server = fake_openai(delay=0.5)
+    gateway = LLMGateway(lambda: server.client, max_concurrent=1, max_waiting=0)
+    first = threading.Thread(target=gateway.complete, args=("slow",), kwargs=request("slow"))
+    first.start()
+    time.sleep(0.1)
+
+    start = time.perf_counter()
+    with pytest.raises(GatewayBusy):
+        gateway.complete("other", **request("other"))
+    assert time.perf_counter() - start < 0.05
+    first.join()
+    assert gateway.stats()["rejected"] == 1
+
+def test_slow_upstream_times_out(fake_openai):
+    server = fake_openai(delay=1.0)
+    gateway = LLMGateway(lambda: server.client, max_concurrent=1, timeout=0.2)
+
+    start = time.perf_counter()
+    with pytest.raises(GatewayTimeout):
+        gateway.complete("slow", **request("slow"))
+    assert time.perf_counter() - start < 0.5
+    assert gateway.stats()["timeouts"] == 1
+
+def test_predict_falls_back_to_models_when_llm_is_slow(fake_openai, monkeypatch):
+    import app as healix
+
+    server = fake_openai(delay=1.0)
+    monkeypatch.setattr(healix, "client", server.client)
+    monkeypatch.setattr(healix, "llm_gateway", LLMGateway(lambda: server.client, max_concurrent=1, timeout=0.2))
+    healix.llm_cache.clear()
+    healix.warm_up()
+
+    start = time.perf_counter()
+    # Narrative text the local extractor can't read, so the request has to go through the gateway
+    response = healix.app.test_client().post("/predict", json={
+        "message": "Since my father's diagnosis last spring I worry constantly about my own health",
+        "age": 50, "bmi": 30, "glucose": 150
+    })
+    elapsed = time.perf_counter() - start
+
+    assert response.status_code == 200
+    assert elapsed < 0.9
+    body = response.get_json()
+    # Model-only result with the default advice
+    assert body["recommendation"] == "Maintain a healthy lifestyle."
+    assert 0 <= body["diabetes"] <= 100
+    assert server.calls == 1
+    assert healix.llm_gateway.stats()["timeouts"] == 1
+
+def test_local_answer_advice_follows_risk(monkeypatch):
+    import app as healix
+
+    healix.warm_up()
+    engine = healix.models_loader.current().engine
+    client = healix.app.test_client()
+    for risk, expected in ((95.0, "High risk detected."), (5.0, "Your risk levels are low.")):
+        monkeypatch.setattr(engine, "predict_one", lambda features: {"diabetes": risk, "heart": 1.0, "kidney": 1.0})
+        body = client.post("/predict", json={"message": "very thirsty and tired", "age": 50}).get_json()
+        assert body["recommendation"].startswith(expected)
@@ -0,0 +1,46 @@
+import json
+import os
+
+from metrics import Registry
+
+def make_registry(hits, latency):
+    registry = Registry()
+    requests = registry.counter("requests_total", "Requests.", ("endpoint",))
+    seconds = registry.histogram("request_seconds", "Latency.", buckets=(0.1, 1.0))
+    requests.inc(hits, endpoint="predict")
+    seconds.observe(latency)
+    registry.collector(lambda: [("queue_depth", "gauge", "Queued.", [({}, hits)])])
+    return registry
+
+def test_single_process_render():
+    text = make_registry(3, 0.05).render()
+    assert 'requests_total{endpoint="predict"} 3' in text
+    assert 'request_seconds_bucket{le="0.1"} 1' in text
+    assert "queue_depth 3" in text
+
+def test_shared_registries_sum_across_workers(tmp_path):
+    this_worker = make_registry(3, 0.05)
+    other_worker = make_registry(4, 0.5)
+    # What the other worker's snapshot thread would have written
+    with open(tmp_path / "99999.json", "w") as f:
+        json.dump(other_worker.snapshot(), f)
+
+    this_worker.share(str(tmp_path), interval=3600)
+    text = this_worker.render()
+    assert 'requests_total{endpoint="predict"} 7' in text
+    assert 'request_seconds_bucket{le="0.1"} 1' in text
+    assert 'request_seconds_bucket{le="1.0"} 2' in text
+    assert "request_seconds_count 2" in text
+    assert "request_seconds_sum 0.55" in text
+    # Gauges can't be summed blindly: one series per worker
+    assert f'queue_depth{{pid="{os.getpid()}"}} 3' in text
+    assert 'queue_depth{pid="99999"} 4' in text
+    assert text.count("# TYPE queue_depth gauge") == 1
+
+def test_exited_worker_drops_out(tmp_path):
+    registry = make_registry(3, 0.05)
+    registry.share(str(tmp_path), interval=3600)
+    (tmp_path / "99999.json").write_text(json.dumps(make_registry(4, 0.5).snapshot()))
+    assert 'requests_total{endpoint="predict"} 7' in registry.render()
+    os.remove(tmp_path / "99999.json")
+    assert 'requests_total{endpoint="predict"} 3' in registry.render()
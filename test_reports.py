@@ -0,0 +1,25 @@
+def test_pdf_revalidation_checks_the_record(client, high_risk):
+    client.login()
+    record_id = client.post("/predict", json=high_risk).get_json()["record_id"]
+    etag = client.get(f"/report/{record_id}.pdf").headers["ETag"]
+    again = client.get(f"/report/{record_id}.pdf", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    assert "max-age" in again.headers["Cache-Control"]
+    missing = etag.replace(f"report-{record_id}-", "report-999999-")
+    assert client.get("/report/999999.pdf", headers={"If-None-Match": missing}).status_code == 404
+
+def test_pdf_cache_key_follows_record_content(client, high_risk):
+    import app as healix
+    from database import db
+
+    client.login()
+    record_id = client.post("/predict", json=high_risk).get_json()["record_id"]
+    etag = client.get(f"/report/{record_id}.pdf").headers["ETag"]
+    # Same id, different patient: what a recreated database hands out
+    with healix.app.app_context():
+        db.session.get(healix.HealthRecord, record_id).username = "someone-else"
+        db.session.commit()
+    response = client.get(f"/report/{record_id}.pdf", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
@@ -0,0 +1,34 @@
+import pytest
+
+import app as healix
+from database import RISKS, HealthRecord, RiskSummary, db
+
+def expected_summary(values, alpha):
+    ewma = values[0]
+    for x in values[1:]:
+        ewma = alpha * x + (1 - alpha) * ewma
+    return {"mean": sum(values) / len(values), "last": values[-1], "min": min(values), "max": max(values), "ewma": ewma}
+
+def test_summary_folds_predict_and_batch_records(client, high_risk):
+    with healix.app.app_context():
+        HealthRecord.query.filter_by(username="asha").delete()
+        RiskSummary.query.filter_by(username="asha").delete()
+        db.session.commit()
+    client.login()
+
+    client.post("/predict", json=high_risk)
+    client.post("/predict", json={"age": 30, "bmi": 22, "bp": 115, "glucose": 90, "chol": 170, "max_heart_rate": 175})
+    patients = [{"age": 40 + 15 * i, "glucose": 95 + 40 * i, "bp": 120 + 10 * i} for i in range(3)]
+    assert client.post("/predict/batch", json={"patients": patients}).status_code == 200
+
+    with healix.app.app_context():
+        records = HealthRecord.query.filter_by(username="asha").order_by(HealthRecord.id).all()
+        stored = {risk: [getattr(r, risk) for r in records] for risk in RISKS}
+    assert len(records) == 5
+
+    summary = client.get("/history/summary").get_json()
+    assert summary["count"] == 5
+    alpha = healix.app.config["RISK_EWMA_ALPHA"]
+    for risk in RISKS:
+        for stat, value in expected_summary(stored[risk], alpha).items():
+            assert summary[risk][stat] == pytest.approx(value), (risk, stat)
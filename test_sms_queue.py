@@ -0,0 +1,101 @@
+import os
+import threading
+import time
+import types
+
+from sms_queue import SmsDispatcher
+
+class FakeSmsSink:
+    """Stands in for twilio.rest.Client; records messages and can fail the first N sends."""
+
+    def __init__(self, fail_first=0, delay=0.0):
+        self.sent = []
+        self.fail_first = fail_first
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+        self.messages = self
+
+    def create(self, body, from_, to):
+        with self._lock:
+            self.calls += 1
+            if self.calls <= self.fail_first:
+                raise RuntimeError("carrier unavailable")
+        time.sleep(self.delay)
+        with self._lock:
+            self.sent.append({"body": body, "from": from_, "to": to})
+        return types.SimpleNamespace(sid=f"SM{len(self.sent)}")
+
+def make_dispatcher(sink, **kwargs):
+    factory_calls = []
+    def factory():
+        factory_calls.append(1)
+        return sink
+    options = dict(from_number="+10000000000", workers=2, retries=3, backoff=0.001, coalesce_window=60)
+    options.update(kwargs)
+    return SmsDispatcher(factory, **options), factory_calls
+
+def test_sends_in_background_with_one_client():
+    sink = FakeSmsSink()
+    dispatcher, factory_calls = make_dispatcher(sink)
+
+    for i in range(5):
+        assert dispatcher.enqueue(f"+9100000000{i}", f"alert {i}")
+    dispatcher.join()
+
+    assert sorted(m["body"] for m in sink.sent) == [f"alert {i}" for i in range(5)]
+    assert len(factory_calls) == 1
+    stats = dispatcher.stats()
+    assert stats["sent"] == 5 and stats["depth"] == 0 and stats["failed"] == 0
+
+def test_retries_with_backoff_then_succeeds():
+    sink = FakeSmsSink(fail_first=2)
+    dispatcher, _ = make_dispatcher(sink, workers=1)
+
+    dispatcher.enqueue("+911111111111", "alert")
+    dispatcher.join()
+
+    assert len(sink.sent) == 1
+    assert dispatcher.stats()["retried"] == 2
+
+def test_gives_up_after_retries():
+    sink = FakeSmsSink(fail_first=100)
+    dispatcher, _ = make_dispatcher(sink, workers=1, retries=2)
+
+    dispatcher.enqueue("+911111111111", "alert")
+    dispatcher.join()
+
+    assert sink.sent == []
+    assert dispatcher.stats()["failed"] == 1
+    assert sink.calls == 3
+
+def test_coalesces_alerts_to_same_phone():
+    sink = FakeSmsSink(delay=0.05)
+    dispatcher, _ = make_dispatcher(sink, workers=1)
+
+    # The first alert occupies the worker; the next two collapse into one queued message
+    dispatcher.enqueue("+912222222222", "first")
+    dispatcher.enqueue("+913333333333", "other")
+    assert dispatcher.enqueue("+913333333333", "latest") is False
+    dispatcher.join()
+
+    # Within the window, a sent phone isn't messaged again
+    assert dispatcher.enqueue("+912222222222", "again") is False
+
+    assert [m["body"] for m in sink.sent] == ["first", "latest"]
+    assert dispatcher.stats()["coalesced"] == 2
+
+def test_public_url_reloads_only_when_file_changes(tmp_path):
+    url_file = tmp_path / "public_url.txt"
+    url_file.write_text("https://one.example\n")
+    dispatcher, _ = make_dispatcher(FakeSmsSink(), url_file=str(url_file))
+
+    assert dispatcher.public_url() == "https://one.example"
+
+    url_file.write_text("https://two.example")
+    stamp = os.stat(url_file).st_mtime + 5
+    os.utime(url_file, (stamp, stamp))
+    assert dispatcher.public_url() == "https://two.example"
+
+    url_file.unlink()
+    assert dispatcher.public_url() == "http://localhost:5000"
@@ -0,0 +1,88 @@
+import threading
+import time
+
+from flask import Flask
+from sqlalchemy import event
+
+from config import ProductionConfig
+from database import db, HealthRecord
+from storage import GroupCommitWriter, configure_sqlite
+
+THREADS = 16
+PER_THREAD = 40
+
+def make_app(tmp_path, pragmas):
+    app = Flask(__name__)
+    app.config.from_object(ProductionConfig)
+    tmp_path.mkdir(exist_ok=True)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'stress.db'}"
+    app.config["SQLITE_PRAGMAS"] = pragmas
+    db.init_app(app)
+    configure_sqlite(app, db)
+    with app.app_context():
+        db.create_all()
+    return app
+
+def hammer(insert_one):
+    # Run THREADS concurrent writers; returns (rows/sec, errors)
+    errors = []
+    def worker(n):
+        for i in range(PER_THREAD):
+            try:
+                insert_one(dict(username=f"user{n}", symptoms=f"stress {i}", diabetes=10.0, heart=20.0, kidney=30.0))
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(THREADS)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return THREADS * PER_THREAD / (time.perf_counter() - start), errors
+
+def test_production_pragmas_applied(tmp_path):
+    app = make_app(tmp_path, ProductionConfig.SQLITE_PRAGMAS)
+    with app.app_context():
+        assert db.session.execute(db.text("PRAGMA journal_mode")).scalar() == "wal"
+        assert db.session.execute(db.text("PRAGMA synchronous")).scalar() == 1
+        assert db.session.execute(db.text("PRAGMA busy_timeout")).scalar() == ProductionConfig.SQLITE_PRAGMAS["busy_timeout"]
+
+def test_group_commit_stress(tmp_path):
+    # Baseline: default journaling, one commit per request (what /predict does in development)
+    dev_app = make_app(tmp_path / "dev", {})
+    def commit_per_request(fields):
+        with dev_app.app_context():
+            db.session.add(HealthRecord(**fields))
+            db.session.commit()
+
+    # Production profile: WAL + tuned pragmas, inserts funneled through the group-commit writer
+    prod_app = make_app(tmp_path / "prod", ProductionConfig.SQLITE_PRAGMAS)
+    writer = GroupCommitWriter(prod_app, db, HealthRecord, interval=0.005)
+    ids = []
+    def grouped(fields):
+        ids.append(writer.insert(fields))
+
+    single_rate, single_errors = hammer(commit_per_request)
+    group_rate, group_errors = hammer(grouped)
+    print(f"\ncommit per request: {single_rate:.0f} rows/s   production + group commit: {group_rate:.0f} rows/s "
+          f"({writer.batches} transactions for {writer.rows} rows)")
+
+    assert group_errors == []
+    assert len(set(ids)) == THREADS * PER_THREAD
+    assert writer.batches < writer.rows
+    with prod_app.app_context():
+        assert HealthRecord.query.count() == THREADS * PER_THREAD
+
+def test_group_commit_does_not_reload_rows(tmp_path):
+    app = make_app(tmp_path, ProductionConfig.SQLITE_PRAGMAS)
+    writer = GroupCommitWriter(app, db, HealthRecord, interval=0.05)
+    statements = []
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+
+    futures = [writer.submit(dict(username="u", symptoms=str(i), diabetes=1.0, heart=2.0, kidney=3.0)) for i in range(20)]
+    ids = [future.result(timeout=10) for future in futures]
+
+    assert len(set(ids)) == 20
+    assert not [s for s in statements if s.lstrip().upper().startswith("SELECT")]
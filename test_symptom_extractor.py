@@ -0,0 +1,88 @@
+from symptom_extractor import SYMPTOMS, extract
+
+def positives(extraction):
+    return {s for s in extraction.mentioned if extraction.flags[s]}
+
+def negatives(extraction):
+    return {s for s in extraction.mentioned if not extraction.flags[s]}
+
+def test_english_phrases():
+    e = extract("I am very thirsty, tired and dizzy")
+    assert positives(e) == {"thirst", "fatigue", "dizziness"}
+    assert set(e.flags) == set(SYMPTOMS)
+    assert e.confidence == 1.0
+
+def test_hindi_phrases():
+    e = extract("मुझे बहुत प्यास लगती है और थकान रहती है")
+    assert positives(e) == {"thirst", "fatigue"}
+
+def test_telugu_phrases():
+    e = extract("నాకు దాహం మరియు ఛాతీ నొప్పి ఉంది")
+    assert positives(e) == {"thirst", "chest_pain"}
+
+def test_negation_before():
+    e = extract("no chest pain")
+    assert negatives(e) == {"chest_pain"}
+    assert negatives(extract("I don't have any chest pain")) == {"chest_pain"}
+
+def test_negation_stops_at_and():
+    e = extract("no chest pain and very thirsty")
+    assert negatives(e) == {"chest_pain"}
+    assert positives(e) == {"thirst"}
+
+def test_negation_stops_at_but():
+    e = extract("no chest pain, but very thirsty")
+    assert positives(e) == {"thirst"}
+
+def test_negation_covers_or():
+    assert negatives(extract("not dizzy or tired")) == {"dizziness", "fatigue"}
+
+def test_negation_scope_is_a_few_words():
+    e = extract("I have no idea why I am so thirsty")
+    assert positives(e) == {"thirst"}
+
+def test_negation_after_hindi_and_telugu():
+    assert negatives(extract("मुझे प्यास नहीं है")) == {"thirst"}
+    assert negatives(extract("దాహం లేదు")) == {"thirst"}
+    # Only the symptom next to the negation is negated
+    e = extract("प्यास और थकान नहीं")
+    assert positives(e) == {"thirst"}
+    assert negatives(e) == {"fatigue"}
+
+def test_questionnaire_overrides_text():
+    e = extract("very thirsty", {"thirst": 0, "fatigue": 1})
+    assert e.flags["thirst"] == 0
+    assert e.flags["fatigue"] == 1
+
+def test_questionnaire_only_is_confident():
+    e = extract("", {"thirst": 1})
+    assert e.confidence == 1.0
+    assert e.is_confident(0.75, 25)
+
+def test_narrative_is_not_confident():
+    e = extract("I have been worried about my health and energy lately after my father's diagnosis")
+    assert not e.is_confident(0.75, 25)
+
+def test_long_message_is_not_confident():
+    e = extract(" ".join(["thirsty"] * 30))
+    assert e.confidence == 1.0
+    assert not e.is_confident(0.75, 25)
+
+def test_no_symptoms_is_not_confident():
+    e = extract("hello there")
+    assert e.confidence == 0.0
+    assert not e.is_confident(0.75, 25)
+
+def test_longest_phrase_wins_across_symptoms():
+    # "पेशाब"/"మూత్రం" alone mean urination, but the longer foamy-urine phrase must win
+    hindi = extract("पेशाब में झाग आता है")
+    assert positives(hindi) == {"foamy_urine"}
+    telugu = extract("మూత్రంలో నురుగు వస్తుంది")
+    assert positives(telugu) == {"foamy_urine"}
+    assert positives(extract("foamy urine and frequent urination")) == {"foamy_urine", "urination"}
+
+def test_face_swelling_is_not_swollen_legs():
+    e = extract("swelling in my face")
+    assert "swollen_legs" not in e.mentioned
+    assert not e.is_confident(0.75, 25)
+    assert positives(extract("swelling in my ankles")) == {"swollen_legs"}
@@ -0,0 +1,54 @@
+import app as healix
+
+def user_selects(statements):
+    return [s for s in statements if s.lstrip().upper().startswith("SELECT") and "FROM user" in s]
+
+def test_login_reads_user_once_and_primes_cache(client, count_queries):
+    with count_queries() as statements:
+        assert client.login().status_code == 302
+    assert len(user_selects(statements)) == 1
+    assert len(statements) == 1
+
+def test_login_with_new_phone_writes_once(client, count_queries):
+    with count_queries() as statements:
+        client.login(phone="+912222222222")
+    assert len(user_selects(statements)) == 1
+    assert sum(s.lstrip().upper().startswith("UPDATE") for s in statements) == 1
+    assert healix.user_cache.get("asha").phone == "+912222222222"
+
+def test_predict_alert_uses_cached_phone(client, count_queries, high_risk):
+    client.login()
+    with count_queries() as statements:
+        response = client.post("/predict", json=high_risk)
+    assert response.status_code == 200
+    assert client.sent == ["+911111111111"]
+    assert user_selects(statements) == []
+    # INSERT health_record + risk summary upsert
+    assert len(statements) == 2
+
+def test_predict_after_cache_expiry_queries_user_once(client, count_queries, high_risk):
+    client.login()
+    healix.user_cache.clear()
+    with count_queries() as statements:
+        client.post("/predict", json=high_risk)
+        client.post("/predict", json=high_risk)
+    assert len(user_selects(statements)) == 1
+
+def test_settings_page_needs_no_queries_once_cached(client, count_queries):
+    client.login()
+    with count_queries() as statements:
+        response = client.get("/settings")
+    assert response.status_code == 200
+    assert b"+911111111111" in response.data
+    assert statements == []
+
+def test_settings_update_invalidates_cache(client, count_queries, high_risk):
+    client.login()
+    with count_queries() as statements:
+        response = client.post("/settings", data={"phone": "+913333333333", "password": ""})
+    assert b"+913333333333" in response.data
+    assert user_selects(statements) == []
+    assert len(statements) == 1
+
+    client.post("/predict", json=high_risk)
+    assert client.sent == ["+913333333333"]
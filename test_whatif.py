@@ -0,0 +1,27 @@
+import json
+
+import pytest
+
+def test_whatif_sweeps_in_request_order(client):
+    # json.dumps keeps key order; the test client's json= would sort the "vary" keys
+    body = json.dumps({
+        "glucose": 180, "questionnaire": {"thirst": 1},
+        "vary": {"glucose": {"from": 180, "to": 100, "steps": 5}, "bmi": [31, 28]}
+    })
+    response = client.post("/predict/whatif", data=body, content_type="application/json")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [axis["feature"] for axis in body["axes"]] == ["glucose", "bmi"]
+    assert body["points"] == 10
+    assert len(body["risks"]["diabetes"]) == 5 and len(body["risks"]["diabetes"][0]) == 2
+
+@pytest.mark.parametrize("body", [
+    {"vary": {"glucose": [100]}, "questionnaire": ["thirst"]},
+    {"vary": {"glucose": [100]}, "questionnaire": "thirst"},
+    {"vary": {"glucose": {"from": 100, "to": 200, "steps": 10 ** 12}}},
+    {"vary": {"glucose": {"from": 100, "to": 200, "steps": 2.5}}},
+    {"vary": {"glucose": [[100, 120]]}},
+    {"vary": {"height": [1, 2]}},
+])
+def test_whatif_rejects_bad_input(client, body):
+    assert client.post("/predict/whatif", json=body).status_code == 400